@@ -7,7 +7,9 @@ import sys
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from google_calendar import build_calendar_service
 
 SCOPES = ['https://www.googleapis.com/auth/calendar.readonly']
 
@@ -42,7 +44,7 @@ def authenticate():
             token.write(creds.to_json())
     
     # Test the authentication
-    service = build('calendar', 'v3', credentials=creds)
+    service = build_calendar_service(creds)
     print("✅ Authentication successful!")
     
     # Test getting calendar list
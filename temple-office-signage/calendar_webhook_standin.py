@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+"""
+Local stand-in for Google Calendar push notifications.
+Sends the same webhook pings Google would, so the push path can be tested
+without a public URL. Start the signage server with CALENDAR_WEBHOOK_URL=local.
+"""
+
+import argparse
+import sys
+import requests
+
+def get_channels(server):
+    response = requests.get(f"{server}/api/calendar/channels", timeout=10)
+    response.raise_for_status()
+    return response.json()
+
+def send_notification(server, channel, state, message_number):
+    headers = {
+        'X-Goog-Channel-ID': channel['channel_id'],
+        'X-Goog-Channel-Token': channel['token'] or '',
+        'X-Goog-Resource-ID': channel['resource_id'] or '',
+        'X-Goog-Resource-State': state,
+        'X-Goog-Message-Number': str(message_number),
+    }
+    response = requests.post(f"{server}/api/calendar/notify", headers=headers, timeout=10)
+    return response.status_code, response.text.strip()
+
+def main():
+    parser = argparse.ArgumentParser(description="Send test Calendar push notifications")
+    parser.add_argument('--server', default='http://localhost:8080', help='Signage server URL')
+    parser.add_argument('--calendar', default=None, help='Calendar ID (default: every watched calendar)')
+    parser.add_argument('--state', default='exists', choices=['sync', 'exists', 'not_exists'],
+                        help='X-Goog-Resource-State to send')
+    parser.add_argument('--count', type=int, default=1, help='Notifications to send per channel')
+    args = parser.parse_args()
+
+    status = get_channels(args.server)
+    if status.get('error'):
+        print(f"❌ {status['error']} - start the server with CALENDAR_WEBHOOK_URL=local")
+        return 1
+
+    channels = status['channels']
+    if args.calendar:
+        channels = [c for c in channels if c['calendar_id'] == args.calendar]
+        if not channels and status['mode'] == 'local':
+            # Open a channel for this calendar on the server
+            response = requests.post(f"{args.server}/api/calendar/channels",
+                                     json={'calendar_id': args.calendar}, timeout=10)
+            response.raise_for_status()
+            channels = [c for c in response.json()['channels'] if c['calendar_id'] == args.calendar]
+
+    if not channels:
+        print("❌ No matching watch channels")
+        return 1
+
+    for channel in channels:
+        if not channel['token']:
+            print(f"⚠️ Skipping {channel['calendar_id']} - channel token is only exposed in local mode")
+            continue
+        for message_number in range(1, args.count + 1):
+            code, body = send_notification(args.server, channel, args.state, message_number)
+            print(f"📨 {channel['calendar_id']} [{args.state} #{message_number}] -> {code} {body}")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+"""
+Generate a synthetic iCalendar file for load-testing the calendar views.
+Point CALENDAR_ICS_FEEDS at the output to run the board offline with
+thousands of events (timed, all-day, multi-day and weekly recurring).
+"""
+
+import argparse
+import random
+import sys
+from datetime import date, datetime, timedelta
+
+TITLES = ['Staff Meeting', 'Site Visit', 'Vendor Call', 'Training', 'Maintenance Window',
+          'Project Review', 'Safety Briefing', 'Lunch & Learn', 'Customer Demo', 'Planning']
+LOCATIONS = ['Conference Room A', 'Training Room B', 'Main Conference Room', 'Server Room', '']
+
+def fold(line):
+    """Fold a content line at 75 characters as RFC 5545 requires"""
+    parts = [line[:75]]
+    line = line[75:]
+    while line:
+        parts.append(' ' + line[:74])
+        line = line[74:]
+    return '\r\n'.join(parts)
+
+def make_event(index, start_day, days, rng):
+    day = start_day + timedelta(days=rng.randrange(days))
+    lines = [
+        'BEGIN:VEVENT',
+        f'UID:fixture-{index}@temple-office-signage',
+        f'SUMMARY:{rng.choice(TITLES)} #{index}',
+    ]
+    location = rng.choice(LOCATIONS)
+    if location:
+        lines.append(f'LOCATION:{location}')
+
+    kind = rng.random()
+    if kind < 0.15:
+        # All-day, sometimes spanning several days
+        length = rng.choice([1, 1, 1, 2, 3, 5])
+        lines.append(f'DTSTART;VALUE=DATE:{day:%Y%m%d}')
+        lines.append(f'DTEND;VALUE=DATE:{day + timedelta(days=length):%Y%m%d}')
+    else:
+        start = datetime.combine(day, datetime.min.time()) + timedelta(hours=rng.randint(7, 17),
+                                                                        minutes=rng.choice([0, 15, 30, 45]))
+        end = start + timedelta(minutes=rng.choice([15, 30, 60, 90, 120]))
+        lines.append(f'DTSTART;TZID=America/Chicago:{start:%Y%m%dT%H%M%S}')
+        lines.append(f'DTEND;TZID=America/Chicago:{end:%Y%m%dT%H%M%S}')
+        if kind > 0.97:
+            lines.append(f'RRULE:FREQ=WEEKLY;COUNT={rng.randint(4, 12)}')
+
+    lines.append(fold(f'DESCRIPTION:Synthetic event {index} for load testing\\, generated by make_ics_fixture.py'))
+    lines.append('END:VEVENT')
+    return '\r\n'.join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic .ics calendar for load testing")
+    parser.add_argument('--events', type=int, default=10000, help='Number of events to generate')
+    parser.add_argument('--days', type=int, default=92, help='Spread events over this many days')
+    parser.add_argument('--start', default=None, help='First day (YYYY-MM-DD, default: first of this month)')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed (same seed, same file)')
+    parser.add_argument('--output', default='fixture.ics', help='Output file')
+    args = parser.parse_args()
+
+    start_day = date.fromisoformat(args.start) if args.start else date.today().replace(day=1)
+    rng = random.Random(args.seed)
+
+    with open(args.output, 'w', newline='') as ics:
+        ics.write('BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//Temple Office Signage//Fixture//EN\r\n')
+        ics.write('X-WR-CALNAME:Load Test Fixture\r\n')
+        for index in range(args.events):
+            ics.write(make_event(index, start_day, args.days, rng) + '\r\n')
+        ics.write('END:VCALENDAR\r\n')
+
+    print(f"📅 Wrote {args.events} events to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+
+# Normalized calendar event model
+# Event times are parsed once at ingest into tz-aware datetimes; every view
+# reads these objects instead of re-parsing ISO strings per render.
+
+from bisect import bisect_left
+from datetime import datetime, time, timedelta
+
+# One CalendarInfo per source calendar, shared by all of its events
+_calendar_registry = {}
+
+
+class CalendarInfo:
+    """Display metadata for a source calendar"""
+    __slots__ = ('id', 'name', 'bg_color', 'fg_color')
+
+    def __init__(self, calendar_id, name, bg_color, fg_color):
+        self.id = calendar_id
+        self.name = name
+        self.bg_color = bg_color
+        self.fg_color = fg_color
+
+
+def intern_calendar(calendar_id, name='Unknown Calendar', bg_color='#4285f4', fg_color='#ffffff'):
+    """Return the shared CalendarInfo for this calendar"""
+    key = (calendar_id, name, bg_color, fg_color)
+    info = _calendar_registry.get(key)
+    if info is None:
+        info = _calendar_registry[key] = CalendarInfo(calendar_id, name, bg_color, fg_color)
+    return info
+
+
+NO_CALENDAR = intern_calendar('', 'Unknown Calendar')
+
+
+def original_start_key(event):
+    """Occurrence key for a recurring instance's originalStartTime.
+
+    Timed occurrences are keyed by an aware datetime (which compares equal
+    across timezones), all-day occurrences by their date.
+    """
+    original = event['originalStartTime']
+    if 'dateTime' in original:
+        return datetime.fromisoformat(original['dateTime'].replace('Z', '+00:00'))
+    return datetime.fromisoformat(original['date']).date()
+
+
+class CalendarEvent:
+    """A calendar event with parsed times.
+
+    start and end are tz-aware datetimes in the display timezone; end is
+    exclusive, as in the Calendar API (an all-day event on the 5th ends at
+    midnight on the 6th). Notices such as "No Events Scheduled" have no times.
+    """
+    __slots__ = (
+        'id', 'title', 'description', 'location', 'start', 'end', 'all_day',
+        'calendar', 'status', 'recurring_event_id', 'ical_uid', 'original_start',
+        'time_label', 'date_label', 'duration_label'
+    )
+
+    def __init__(self, event_id, title, start, end, all_day, calendar=NO_CALENDAR,
+                 description='', location='', status='confirmed', recurring_event_id=None,
+                 ical_uid=None, original_start=None):
+        self.id = event_id
+        self.title = title
+        self.description = description
+        self.location = location
+        self.start = start
+        self.end = end
+        self.all_day = all_day
+        self.calendar = calendar
+        self.status = status
+        self.recurring_event_id = recurring_event_id
+        # Shared by every copy of a meeting, whichever calendar it was fetched from
+        self.ical_uid = ical_uid or event_id
+        self.original_start = original_start  # Which occurrence of a recurring event
+        self.time_label = ''
+        self.date_label = ''
+        self.duration_label = ''
+
+    @classmethod
+    def from_api(cls, event, calendar, timezone):
+        """Build an event from a Calendar API resource (times parsed once, here)"""
+        start = event['start'].get('dateTime', event['start'].get('date'))
+        end = event['end'].get('dateTime', event['end'].get('date'))
+        all_day = 'T' not in start
+
+        if all_day:
+            start_dt = timezone.localize(datetime.fromisoformat(start))
+            end_dt = timezone.localize(datetime.fromisoformat(end))
+        else:
+            start_dt = datetime.fromisoformat(start.replace('Z', '+00:00')).astimezone(timezone)
+            end_dt = datetime.fromisoformat(end.replace('Z', '+00:00')).astimezone(timezone)
+
+        return cls(
+            event.get('id'),
+            event.get('summary', 'No Title'),
+            start_dt,
+            end_dt,
+            all_day,
+            calendar=calendar,
+            description=event.get('description', ''),
+            location=event.get('location', ''),
+            status=event.get('status', 'confirmed'),
+            recurring_event_id=event.get('recurringEventId'),
+            ical_uid=event.get('iCalUID'),
+            original_start=original_start_key(event) if 'originalStartTime' in event else None
+        )
+
+    @classmethod
+    def notice(cls, title, description='', location='', time_label='', date_label='', duration_label=''):
+        """An undated placeholder shown instead of real events (errors, empty calendar)"""
+        event = cls(None, title, None, None, False, description=description, location=location)
+        event.time_label = time_label
+        event.date_label = date_label
+        event.duration_label = duration_label
+        return event
+
+    @property
+    def instance_key(self):
+        """Identifies the same meeting (or occurrence) across calendars"""
+        return (self.ical_uid, self.original_start)
+
+    @property
+    def dated(self):
+        return self.start is not None
+
+    @property
+    def start_date(self):
+        return self.start.date() if self.start else None
+
+    @property
+    def end_date(self):
+        """Last day the event occupies (inclusive)"""
+        if self.start is None:
+            return None
+        if self.end is None or self.end <= self.start:
+            return self.start.date()
+        if self.all_day:
+            return (self.end - timedelta(days=1)).date()
+        # A meeting ending exactly at midnight doesn't occupy the next day
+        return (self.end - timedelta(microseconds=1)).date()
+
+    @property
+    def span_days(self):
+        if self.start is None:
+            return 0
+        return (self.end_date - self.start_date).days + 1
+
+    @property
+    def calendar_name(self):
+        return self.calendar.name
+
+    @property
+    def bg_color(self):
+        return self.calendar.bg_color
+
+    @property
+    def fg_color(self):
+        return self.calendar.fg_color
+
+    def to_dict(self, date_label=None):
+        """JSON-friendly view for the debug API (date_label overrides the absolute date)"""
+        return {
+            'id': self.id,
+            'title': self.title,
+            'description': self.description,
+            'location': self.location,
+            'start': self.start.isoformat() if self.start else None,
+            'end': self.end.isoformat() if self.end else None,
+            'all_day': self.all_day,
+            'time': self.time_label,
+            'date': date_label or self.date_label,
+            'duration': self.duration_label,
+            'calendar_name': self.calendar.name,
+            'calendar_id': self.calendar.id,
+            'calendar_bg_color': self.calendar.bg_color,
+            'calendar_fg_color': self.calendar.fg_color
+        }
+
+    def __repr__(self):
+        return f"CalendarEvent({self.title!r}, {self.start!r})"
+
+
+def merge_events(sources):
+    """Merge events from several calendars into one list ordered by start.
+
+    sources is a list of (rank, events) pairs, one per calendar. The same
+    meeting seen through several calendars is kept once: the copy from the
+    calendar with the lowest rank wins, whatever order the calendars came in.
+    """
+    merged = {}
+    for rank, events in sorted(sources, key=lambda source: source[0]):
+        for event in events:
+            merged.setdefault(event.instance_key, event)
+    return sorted(merged.values(), key=lambda event: event.start)
+
+
+class EventIndex:
+    """Dated events ordered by start, for quick per-day/per-slot overlap queries"""
+
+    # Events longer than this are few; they are checked one by one instead
+    LONG_EVENT = timedelta(days=1)
+
+    def __init__(self, events, timezone):
+        self.timezone = timezone
+        self.events = sorted((event for event in events if event.dated),
+                             key=lambda event: event.start)
+        self._starts = [event.start for event in self.events]
+        self._long_events = [event for event in self.events
+                             if event.end - event.start > self.LONG_EVENT]
+
+    def __len__(self):
+        return len(self.events)
+
+    def overlapping(self, start, end):
+        """Events that overlap [start, end), ordered by start"""
+        # Anything short that overlaps must start within a day before the slot
+        lo = bisect_left(self._starts, start - self.LONG_EVENT)
+        hi = bisect_left(self._starts, end)
+        found = [event for event in self.events[lo:hi]
+                 if event.end > start or event.start >= start]
+        early = [event for event in self._long_events
+                 if event.start < start - self.LONG_EVENT and event.end > start]
+        return early + found if early else found
+
+    def starting(self, start, end):
+        """Events that start in [start, end), ordered by start"""
+        return self.events[bisect_left(self._starts, start):bisect_left(self._starts, end)]
+
+    def day_bounds(self, day):
+        """Local midnight at the start and end of a date"""
+        return (self.timezone.localize(datetime.combine(day, time.min)),
+                self.timezone.localize(datetime.combine(day + timedelta(days=1), time.min)))
+
+    def on_day(self, day):
+        """Events occupying any part of a date"""
+        return self.overlapping(*self.day_bounds(day))
+
+    def starting_on(self, day):
+        """Events that start on a date"""
+        return self.starting(*self.day_bounds(day))
+
+
+class DayEntry:
+    """One event's place on one day of the grid"""
+
+    __slots__ = ('event', 'is_start', 'is_end', 'span_days')
+
+    def __init__(self, event, is_start, is_end, span_days):
+        self.event = event
+        self.is_start = is_start
+        self.is_end = is_end
+        self.span_days = span_days
+
+    @property
+    def is_multi_day(self):
+        return self.span_days > 1
+
+
+class DayIndex:
+    """Date -> events occupying that date, built once per calendar data version.
+
+    Multi-day events are entered on every day they cover (clipped to
+    [first_day, last_day) when given), so month grids only look up the days
+    they show instead of walking every event.
+    """
+
+    def __init__(self, events, first_day=None, last_day=None):
+        self.first_day = first_day
+        self.last_day = last_day
+        self.days = {}
+        for event in sorted((event for event in events if event.dated), key=lambda event: event.start):
+            start_date, end_date = event.start_date, event.end_date
+            span_days = (end_date - start_date).days + 1
+            day = max(start_date, first_day) if first_day else start_date
+            last = min(end_date, last_day - timedelta(days=1)) if last_day else end_date
+            while day <= last:
+                self.days.setdefault(day, []).append(
+                    DayEntry(event, day == start_date, day == end_date, span_days))
+                day += timedelta(days=1)
+
+    def entries(self, day):
+        """DayEntry objects for a date, ordered by event start"""
+        return self.days.get(day, ())
+
+    def on_day(self, day):
+        """Events occupying any part of a date"""
+        return [entry.event for entry in self.days.get(day, ())]
+
+    def starting_on(self, day):
+        """Events that start on a date"""
+        return [entry.event for entry in self.days.get(day, ()) if entry.is_start]
+
+
+class EventFormatter:
+    """Fills in display labels for a batch of events.
+
+    The labels stored on an event are absolute (time, date, duration), so they
+    never go stale and each event is only formatted once. "Today"/"Tomorrow"
+    depend on the clock and are worked out when a page is rendered, with
+    day_labels().
+    """
+
+    def __init__(self, timezone):
+        self.timezone = timezone
+
+    def format_events(self, events):
+        """Format every event that has no labels yet, in one pass"""
+        for event in events:
+            if event.dated and not event.date_label:
+                self._format(event)
+        return events
+
+    def _format(self, event):
+        event.date_label = event.start.strftime('%a, %b %d')
+        if event.all_day:
+            event.time_label = 'All Day'
+            event.duration_label = 'All Day'
+        else:
+            event.time_label = event.start.strftime('%I:%M %p')
+            seconds = (event.end - event.start).total_seconds()
+            event.duration_label = f"{int(seconds // 3600)}h {int(seconds % 3600 // 60)}m"
+
+    def day_boundaries(self, now=None):
+        """Local midnight today, tomorrow and the day after, from one clock reading"""
+        if now is None:
+            now = datetime.now(self.timezone)
+        today = now.astimezone(self.timezone).date()
+        return [self.timezone.localize(datetime.combine(today + timedelta(days=n), time.min))
+                for n in range(3)]
+
+    def day_labels(self, events, now=None):
+        """Relative date label for each event ('Today', 'Tomorrow' or its date)"""
+        today, tomorrow, day_after = self.day_boundaries(now)
+        labels = []
+        for event in events:
+            if not event.dated:
+                labels.append(event.date_label)
+            elif today <= event.start < tomorrow:
+                labels.append('Today')
+            elif tomorrow <= event.start < day_after:
+                labels.append('Tomorrow')
+            else:
+                labels.append(event.date_label)
+        return labels
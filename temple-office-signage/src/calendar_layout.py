@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+
+# Month grid layout for the calendar views
+# Grids come from a private Sunday-first calendar.Calendar (never the module-wide
+# calendar.setfirstweekday), so concurrent renders can't change each other's
+# week start. Multi-day bars are cut into one segment per week row, and
+# overlapping segments in a week are packed into lanes so they stack.
+
+import calendar
+import functools
+import threading
+from heapq import heappop, heappush
+
+SUNDAY_FIRST = calendar.Calendar(firstweekday=calendar.SUNDAY)
+
+
+@functools.lru_cache(maxsize=36)
+def month_weeks(year, month):
+    """Sunday-first rows of 7 dates for a month, None for days of other months.
+
+    Memoized and shared between threads, so the rows are tuples.
+    """
+    return tuple(tuple(day if day.month == month else None for day in week)
+                 for week in SUNDAY_FIRST.monthdatescalendar(year, month))
+
+
+class SpanSegment:
+    """The part of a multi-day event drawn in one week row (columns are 1-based for CSS grid)"""
+
+    __slots__ = ('event', 'week_idx', 'start_col', 'span_length', 'lane', 'is_start', 'is_end')
+
+    def __init__(self, event, week_idx, start_col, span_length, is_start, is_end):
+        self.event = event
+        self.week_idx = week_idx
+        self.start_col = start_col
+        self.span_length = span_length
+        self.lane = 0
+        self.is_start = is_start
+        self.is_end = is_end
+
+
+def layout_spans(weeks, day_index):
+    """Segments for every multi-day event shown on a month grid.
+
+    weeks is the grid as rows of 7 dates (None for padding cells). Returns
+    (segments per week, lanes used per week). Events are sorted once by
+    their first visible day, then each week's segments - already in column
+    order - get the lowest free lane (greedy interval partitioning).
+    """
+    positions = {}
+    for week_idx, week in enumerate(weeks):
+        for col, day in enumerate(week):
+            if day is not None:
+                positions[day] = (week_idx, col)
+    if not positions:
+        return [[] for _ in weeks], [0 for _ in weeks]
+    last_visible = max(positions)
+
+    # First visible day of each multi-day event
+    first_seen = {}
+    for day in sorted(positions):
+        for entry in day_index.entries(day):
+            if entry.is_multi_day and entry.event not in first_seen:
+                first_seen[entry.event] = day
+    spans = sorted(first_seen.items(), key=lambda item: (item[1], -item[0].span_days))
+
+    week_segments = [[] for _ in weeks]
+    for event, first_day in spans:
+        last_day = min(event.end_date, last_visible)
+        week_idx, col = positions[first_day]
+        end_week, end_col = positions[last_day]
+        while week_idx <= end_week:
+            segment_end = end_col if week_idx == end_week else len(weeks[week_idx]) - 1
+            week_segments[week_idx].append(SpanSegment(
+                event, week_idx, col + 1, segment_end - col + 1,
+                is_start=(week_idx, col) == positions.get(event.start_date),
+                is_end=week_idx == end_week and last_day == event.end_date))
+            week_idx, col = week_idx + 1, 0
+
+    lane_counts = []
+    for segments in week_segments:
+        busy = []  # (column after the segment, lane)
+        free = []
+        lanes = 0
+        for segment in segments:
+            while busy and busy[0][0] <= segment.start_col:
+                heappush(free, heappop(busy)[1])
+            if free:
+                segment.lane = heappop(free)
+            else:
+                segment.lane = lanes
+                lanes += 1
+            heappush(busy, (segment.start_col + segment.span_length, segment.lane))
+        lane_counts.append(lanes)
+    return week_segments, lane_counts
+
+
+class SpanLayoutCache:
+    """Month layouts cached per calendar data version"""
+
+    def __init__(self):
+        self._version = None
+        self._layouts = {}
+        self._lock = threading.Lock()
+
+    def month(self, version, day_index, year, month):
+        with self._lock:
+            if version != self._version:
+                self._layouts.clear()  # Data changed - every month is stale
+                self._version = version
+            key = (year, month)
+            if key not in self._layouts:
+                self._layouts[key] = layout_spans(month_weeks(year, month), day_index)
+            return self._layouts[key]
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+
+# Adaptive calendar polling
+# Room changes matter most right before a meeting and hardly at all at 3 AM
+# on a Sunday, so the sync interval follows the clock and the calendar.
+
+from datetime import datetime, timedelta
+
+
+class CalendarPollPolicy:
+    """Picks the next calendar sync interval from business hours and upcoming events"""
+
+    def __init__(self, timezone, business_hours, business_minutes=15, imminent_minutes=5,
+                 after_hours_minutes=60, weekend_minutes=180, lead_minutes=60):
+        self.timezone = timezone
+        self.business_start = datetime.strptime(business_hours['start'], '%H:%M').time()
+        self.business_end = datetime.strptime(business_hours['end'], '%H:%M').time()
+        self.business_minutes = business_minutes
+        self.imminent_minutes = imminent_minutes
+        self.after_hours_minutes = after_hours_minutes
+        self.weekend_minutes = weekend_minutes
+        self.lead = timedelta(minutes=lead_minutes)  # Poll fast this long before an event
+
+    def is_business_time(self, now):
+        return now.weekday() < 5 and self.business_start <= now.time() < self.business_end
+
+    def next_business_start(self, now):
+        """Start of the next business day at or after now"""
+        day = now.date()
+        if now.time() >= self.business_start:
+            day += timedelta(days=1)
+        while day.weekday() >= 5:
+            day += timedelta(days=1)
+        return self.timezone.localize(datetime.combine(day, self.business_start))
+
+    def interval(self, event_index, now=None):
+        """(minutes, reason) until the next calendar sync"""
+        if now is None:
+            now = datetime.now(self.timezone)
+
+        # Timed events only - an all-day event has no "just before" worth polling for
+        upcoming = [event for event in event_index.starting(now, now + self.lead)
+                    if not event.all_day]
+        if upcoming:
+            return self.imminent_minutes, f"'{upcoming[0].title}' starts within {self.lead_minutes} min"
+
+        if self.is_business_time(now):
+            minutes, reason = self.business_minutes, 'business hours'
+        elif now.weekday() >= 5:
+            minutes, reason = self.weekend_minutes, 'weekend'
+        else:
+            minutes, reason = self.after_hours_minutes, 'after hours'
+
+        # Never sleep past the run-up to the next event or the start of the business day
+        horizon = now + timedelta(minutes=minutes) + self.lead
+        next_event = next((event for event in event_index.starting(now, horizon) if not event.all_day), None)
+        if next_event:
+            minutes_until = (next_event.start - self.lead - now).total_seconds() / 60
+            if minutes_until < minutes:
+                minutes, reason = minutes_until, f"waking before '{next_event.title}'"
+        if not self.is_business_time(now):
+            minutes_until = (self.next_business_start(now) - now).total_seconds() / 60
+            if minutes_until < minutes:
+                minutes, reason = minutes_until, 'waking for business hours'
+
+        return max(self.imminent_minutes, int(minutes)), reason
+
+    @property
+    def lead_minutes(self):
+        return int(self.lead.total_seconds() // 60)
+
+    def get_status(self):
+        return {
+            'business_minutes': self.business_minutes,
+            'imminent_minutes': self.imminent_minutes,
+            'after_hours_minutes': self.after_hours_minutes,
+            'weekend_minutes': self.weekend_minutes,
+            'lead_minutes': self.lead_minutes
+        }
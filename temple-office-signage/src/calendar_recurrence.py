@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+
+# Local expansion of recurring calendar events
+# Instead of asking Google for every instance (singleEvents=True), we fetch
+# each recurring master once and expand its RRULE/RDATE/EXDATE lines here.
+
+from datetime import datetime
+from dateutil import tz
+from dateutil.rrule import rrulestr
+from calendar_events import CalendarEvent
+
+
+class RecurringSeries:
+    """A recurring master event and a cache of its expanded instances"""
+
+    def __init__(self, event, calendar, timezone, overrides=None):
+        self.master = CalendarEvent.from_api(event, calendar, timezone)
+        self.timezone = timezone
+        # Occurrences replaced by a modified instance or cancelled
+        self.overrides = overrides if overrides is not None else set()
+
+        if self.master.all_day:
+            start = datetime.fromisoformat(event['start']['date'])
+            self.dtstart = start
+            self.duration = datetime.fromisoformat(event['end']['date']) - start
+        else:
+            # Expand in the event's own zone so it keeps its wall-clock time across DST
+            zone = tz.gettz(event['start'].get('timeZone') or timezone.zone)
+            self.dtstart = self.master.start.astimezone(zone)
+            self.duration = self.master.end - self.master.start
+
+        self.ruleset = rrulestr('\n'.join(event.get('recurrence', [])),
+                                dtstart=self.dtstart, forceset=True)
+        self._cache = {}
+
+    def invalidate(self):
+        self._cache.clear()
+
+    def instances(self, window_start, window_end):
+        """Instances overlapping [window_start, window_end), cached per window"""
+        key = (window_start, window_end)
+        if key not in self._cache:
+            self._cache.clear()  # Only the current sync window is worth keeping
+            self._cache[key] = self._expand(window_start, window_end)
+        return self._cache[key]
+
+    def _expand(self, window_start, window_end):
+        after = window_start - self.duration
+        before = window_end
+        if self.master.all_day:
+            # All-day rules are expanded with naive dates
+            after = after.astimezone(self.timezone).replace(tzinfo=None)
+            before = before.astimezone(self.timezone).replace(tzinfo=None)
+
+        instances = []
+        for occurrence in self.ruleset.between(after, before, inc=True):
+            if self.master.all_day:
+                original_start = occurrence.date()
+                if original_start in self.overrides:
+                    continue
+                start = self.timezone.localize(occurrence)
+                end = self.timezone.localize(occurrence + self.duration)
+                instance_id = f"{self.master.id}_{occurrence:%Y%m%d}"
+            else:
+                original_start = occurrence
+                if original_start in self.overrides:
+                    continue
+                start = occurrence.astimezone(self.timezone)
+                end = start + self.duration
+                instance_id = f"{self.master.id}_{occurrence.astimezone(tz.UTC):%Y%m%dT%H%M%SZ}"
+
+            master = self.master
+            instances.append(CalendarEvent(
+                instance_id, master.title, start, end, master.all_day,
+                calendar=master.calendar,
+                description=master.description,
+                location=master.location,
+                status=master.status,
+                recurring_event_id=master.id,
+                ical_uid=master.ical_uid,
+                original_start=original_start
+            ))
+        return instances
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+
+# Google Calendar push notifications (watch channels)
+# Google POSTs a ping to our webhook whenever a watched calendar changes;
+# we answer immediately and run an incremental sync for just that calendar.
+
+import secrets
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+# Local stand-in mode: channels are registered with us only, so the webhook
+# can be exercised with calendar_webhook_standin.py without Google
+LOCAL_WEBHOOK = 'local'
+
+
+class CalendarWatchManager:
+    def __init__(self, calendar_api, webhook_url, on_change, ttl_hours=24, renew_margin_hours=2):
+        self.calendar_api = calendar_api
+        self.webhook_url = webhook_url
+        self.on_change = on_change  # Called with a calendar ID from a worker thread
+        self.ttl = timedelta(hours=ttl_hours)
+        self.renew_margin = timedelta(hours=renew_margin_hours)
+
+        self.channels = {}  # channel_id -> channel info
+        self.pending_syncs = set()  # Calendars with a sync already queued
+        self.notifications_received = 0
+        self.last_notification = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_local(self):
+        return self.webhook_url == LOCAL_WEBHOOK
+
+    def open_channel(self, calendar_id):
+        """Open a watch channel for one calendar"""
+        channel_id = str(uuid.uuid4())
+        token = secrets.token_urlsafe(16)
+
+        if self.is_local:
+            resource_id = f"local-{calendar_id}"
+            expiration = datetime.now() + self.ttl
+        else:
+            result = self.calendar_api.watch_events(
+                calendar_id, channel_id, token, self.webhook_url,
+                int(self.ttl.total_seconds()))
+            resource_id = result.get('resourceId')
+            # Google reports expiration as milliseconds since the epoch
+            expiration = datetime.fromtimestamp(int(result['expiration']) / 1000)
+
+        with self._lock:
+            self.channels[channel_id] = {
+                'calendar_id': calendar_id,
+                'resource_id': resource_id,
+                'token': token,
+                'expiration': expiration
+            }
+        print(f"Watch channel opened for {calendar_id} (expires {expiration:%Y-%m-%d %H:%M})")
+        return channel_id
+
+    def close_channel(self, channel_id):
+        """Stop a watch channel and forget it"""
+        with self._lock:
+            channel = self.channels.pop(channel_id, None)
+        if channel and not self.is_local:
+            try:
+                self.calendar_api.stop_channel(channel_id, channel['resource_id'])
+            except Exception as e:
+                # The channel expires on its own anyway
+                print(f"Error stopping watch channel {channel_id}: {e}")
+
+    def ensure_channels(self, calendar_ids):
+        """Open channels for any calendars that are not being watched yet"""
+        with self._lock:
+            watched = {channel['calendar_id'] for channel in self.channels.values()}
+        for calendar_id in calendar_ids:
+            if calendar_id not in watched:
+                try:
+                    self.open_channel(calendar_id)
+                except Exception as e:
+                    print(f"Error opening watch channel for {calendar_id}: {e}")
+
+    def renew_expiring_channels(self):
+        """Replace channels that expire within the renewal margin"""
+        cutoff = datetime.now() + self.renew_margin
+        with self._lock:
+            expiring = [(channel_id, channel['calendar_id'])
+                        for channel_id, channel in self.channels.items()
+                        if channel['expiration'] <= cutoff]
+
+        for channel_id, calendar_id in expiring:
+            try:
+                # Open the replacement first so no changes are missed
+                self.open_channel(calendar_id)
+                self.close_channel(channel_id)
+                print(f"Watch channel renewed for {calendar_id}")
+            except Exception as e:
+                print(f"Error renewing watch channel for {calendar_id}: {e}")
+        return len(expiring)
+
+    def handle_notification(self, headers):
+        """Handle a webhook ping. Returns (http_status, message)"""
+        channel_id = headers.get('X-Goog-Channel-ID')
+        state = headers.get('X-Goog-Resource-State')
+
+        with self._lock:
+            channel = self.channels.get(channel_id)
+        if channel is None:
+            return 404, 'Unknown channel'
+        if headers.get('X-Goog-Channel-Token') != channel['token']:
+            return 403, 'Bad channel token'
+
+        self.notifications_received += 1
+        self.last_notification = {
+            'calendar_id': channel['calendar_id'],
+            'state': state,
+            'message_number': headers.get('X-Goog-Message-Number'),
+            'received': datetime.now().isoformat()
+        }
+
+        # The first message on a new channel is just a handshake
+        if state == 'sync':
+            return 200, 'Channel confirmed'
+
+        if self.queue_sync(channel['calendar_id']):
+            return 200, 'Sync queued'
+        return 200, 'Sync already pending'
+
+    def queue_sync(self, calendar_id):
+        """Sync a calendar in the background, coalescing bursts of pings"""
+        with self._lock:
+            if calendar_id in self.pending_syncs:
+                return False
+            self.pending_syncs.add(calendar_id)
+
+        def run_sync():
+            with self._lock:
+                self.pending_syncs.discard(calendar_id)
+            try:
+                self.on_change(calendar_id)
+            except Exception as e:
+                print(f"Push-triggered sync of {calendar_id} failed: {e}")
+
+        # Short delay so a burst of edits becomes one sync
+        threading.Timer(2, run_sync).start()
+        return True
+
+    def get_status(self):
+        """Channel summary for the debug API"""
+        with self._lock:
+            channels = [{
+                'channel_id': channel_id,
+                'calendar_id': channel['calendar_id'],
+                'resource_id': channel['resource_id'],
+                'token': channel['token'] if self.is_local else None,
+                'expiration': channel['expiration'].isoformat()
+            } for channel_id, channel in self.channels.items()]
+
+        return {
+            'mode': 'local' if self.is_local else 'google',
+            'webhook_url': self.webhook_url,
+            'channels': channels,
+            'notifications_received': self.notifications_received,
+            'last_notification': self.last_notification
+        }
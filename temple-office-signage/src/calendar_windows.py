@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+
+# Fetch window planning for the calendar views
+# Each view declares the date ranges it displays; the planner merges them so
+# we sync exactly what is on screen - no fixed "90 days ahead" guess.
+
+from datetime import date, datetime, time
+
+
+def month_span(today, months=1):
+    """(first day of today's month, first day of the month after `months` months)"""
+    start = today.replace(day=1)
+    month_index = start.year * 12 + start.month - 1 + months
+    return start, date(month_index // 12, month_index % 12 + 1, 1)
+
+
+class FetchWindowPlanner:
+    """Collects the date ranges the calendar views need and merges them"""
+
+    def __init__(self, timezone):
+        self.timezone = timezone
+        self.views = {}  # view name -> function(today) returning [(start_date, end_date), ...]
+
+    def register(self, view, ranges):
+        """Declare the ranges a view displays. End dates are exclusive"""
+        self.views[view] = ranges
+
+    def date_ranges(self, today=None):
+        """Merged date ranges for all views, sorted (overlapping/touching ranges joined)"""
+        if today is None:
+            today = datetime.now(self.timezone).date()
+
+        requested = sorted(span for ranges in self.views.values() for span in ranges(today))
+        merged = []
+        for start, end in requested:
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+
+    def windows(self, today=None):
+        """Merged ranges as (start, end) datetimes from local midnight to local midnight"""
+        return [(self.timezone.localize(datetime.combine(start, time.min)),
+                 self.timezone.localize(datetime.combine(end, time.min)))
+                for start, end in self.date_ranges(today)]
+
+    def get_status(self, today=None):
+        """Per-view ranges and the merged plan, for the status API"""
+        if today is None:
+            today = datetime.now(self.timezone).date()
+        return {
+            'views': {view: [[start.isoformat(), end.isoformat()] for start, end in ranges(today)]
+                      for view, ranges in self.views.items()},
+            'windows': [[start.isoformat(), end.isoformat()] for start, end in self.date_ranges(today)]
+        }
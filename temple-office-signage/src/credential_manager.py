@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+
+# Background OAuth credential refresher
+# Refreshes the access token shortly before it expires so scheduled calendar
+# fetches never pay for (or fail on) a token refresh round trip.
+
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from google.auth.exceptions import RefreshError
+from google.auth.transport.requests import Request
+
+
+def write_token_file(token_file, creds):
+    """Write credentials to token_file atomically (temp file + rename)"""
+    token_dir = os.path.dirname(os.path.abspath(token_file))
+    fd, temp_path = tempfile.mkstemp(dir=token_dir, prefix='.token-', suffix='.json')
+    try:
+        with os.fdopen(fd, 'w') as token:
+            token.write(creds.to_json())
+            token.flush()
+            os.fsync(token.fileno())
+        os.replace(temp_path, token_file)
+    except Exception:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+class CredentialManager:
+    def __init__(self, creds, token_file=None, refresh_margin_minutes=10,
+                 retry_seconds=60, max_retry_seconds=900):
+        self.creds = creds
+        self.token_file = token_file  # None for service accounts (nothing to persist)
+        self.refresh_margin = refresh_margin_minutes * 60
+        self.retry_seconds = retry_seconds
+        self.max_retry_seconds = max_retry_seconds
+
+        self.refresh_count = 0
+        self.consecutive_failures = 0
+        self.last_refresh = None
+        self.last_refresh_ms = None
+        self.last_error = None
+        self.last_exception = None
+        self.next_refresh = None
+        self.needs_reauth = False
+
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def seconds_until_expiry(self):
+        """Seconds until the access token expires (None if unknown)"""
+        if not self.creds.expiry:
+            return None
+        # google-auth keeps expiry as naive UTC
+        expiry = self.creds.expiry.replace(tzinfo=timezone.utc)
+        return (expiry - datetime.now(timezone.utc)).total_seconds()
+
+    def refresh(self):
+        """Refresh the access token now. Returns True on success"""
+        with self._lock:
+            started = time.monotonic()
+            try:
+                self.creds.refresh(Request())
+                if self.token_file:
+                    write_token_file(self.token_file, self.creds)
+            except Exception as e:
+                self.consecutive_failures += 1
+                self.last_error = str(e)
+                self.last_exception = e
+                # invalid_grant and friends won't fix themselves - the user has to re-authenticate
+                self.needs_reauth = isinstance(e, RefreshError)
+                print(f"Credential refresh failed ({self.consecutive_failures} in a row): {e}")
+                return False
+
+            self.last_refresh_ms = round((time.monotonic() - started) * 1000, 1)
+            self.last_refresh = datetime.now()
+            self.refresh_count += 1
+            self.consecutive_failures = 0
+            self.last_error = None
+            self.last_exception = None
+            self.needs_reauth = False
+            print(f"Access token refreshed in {self.last_refresh_ms}ms "
+                  f"(valid for {int(self.seconds_until_expiry() or 0) // 60} min)")
+            return True
+
+    def start(self):
+        """Start the background refresh loop"""
+        self._schedule_next()
+
+    def stop(self):
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+    def _schedule_next(self):
+        if self.consecutive_failures:
+            # Back off while the token endpoint is unreachable
+            delay = min(self.retry_seconds * 2 ** (self.consecutive_failures - 1), self.max_retry_seconds)
+        else:
+            remaining = self.seconds_until_expiry()
+            if remaining is None:
+                delay = self.max_retry_seconds
+            else:
+                # Never spin if Google hands out tokens shorter than the margin
+                delay = max(remaining - self.refresh_margin, 30)
+
+        self.next_refresh = datetime.now().timestamp() + delay
+        self._timer = threading.Timer(delay, self._run)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _run(self):
+        if self.needs_reauth:
+            print("Credential refresher stopped - token needs re-authentication (run auth_calendar.py)")
+            return
+        self.refresh()
+        self._schedule_next()
+
+    def get_status(self):
+        """Token expiry and refresh statistics for the status API"""
+        remaining = self.seconds_until_expiry()
+        return {
+            'valid': self.creds.valid,
+            'expiry': self.creds.expiry.isoformat() + 'Z' if self.creds.expiry else None,
+            'seconds_until_expiry': int(remaining) if remaining is not None else None,
+            'next_refresh': datetime.fromtimestamp(self.next_refresh).isoformat() if self.next_refresh else None,
+            'refresh_count': self.refresh_count,
+            'last_refresh': self.last_refresh.isoformat() if self.last_refresh else None,
+            'last_refresh_ms': self.last_refresh_ms,
+            'consecutive_failures': self.consecutive_failures,
+            'last_error': self.last_error,
+            'needs_reauth': self.needs_reauth
+        }
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+
+# Content fingerprints and version numbers for the signage data sources
+# Every refresh hashes what it fetched; the source's version number only moves
+# when the content actually changed, so pages and clients can skip work.
+
+import hashlib
+import json
+import threading
+from datetime import datetime
+
+# Fields that change on every refresh without the content changing
+VOLATILE_KEYS = {'last_updated'}
+
+
+def _canonical(value):
+    """Strip volatile fields so they don't affect the fingerprint"""
+    if isinstance(value, dict):
+        return {key: _canonical(item) for key, item in value.items() if key not in VOLATILE_KEYS}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if hasattr(value, 'to_dict'):
+        return _canonical(value.to_dict())
+    return value
+
+
+def fingerprint(data):
+    """Stable hash of a data structure (dict keys sorted, datetimes as ISO strings)"""
+    encoded = json.dumps(_canonical(data), sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+
+
+class DataVersions:
+    """Tracks a version number per data source, bumped only on content change"""
+
+    def __init__(self):
+        self.sources = {}  # name -> fingerprint, version and timestamps
+        self._lock = threading.Lock()
+
+    def publish(self, source, data, swap=None):
+        """Record freshly fetched data. Returns True if it differs from the last publish.
+
+        swap(version), if given, installs the new data before the version moves,
+        so a reader never pairs the new version with the old data.
+        """
+        digest = self.changed(source, data)
+        if digest is None:
+            return False
+        self.commit(source, digest, swap)
+        return True
+
+    def changed(self, source, data):
+        """Note a fetch. Returns the data's fingerprint if it differs from the current one, else None"""
+        digest = fingerprint(data)
+        with self._lock:
+            state = self.sources.setdefault(source, {
+                'fingerprint': None, 'version': 0, 'changed': None, 'checked': None
+            })
+            state['checked'] = datetime.now()
+            return None if digest == state['fingerprint'] else digest
+
+    def commit(self, source, digest, swap=None):
+        """Move a source to a new version (see publish - for data that needs building first).
+        Returns the new version"""
+        with self._lock:
+            state = self.sources[source]
+            version = state['version'] + 1
+            if swap:
+                swap(version)
+            state['fingerprint'] = digest
+            state['version'] = version
+            state['changed'] = datetime.now()
+            return version
+
+    def version(self, source):
+        with self._lock:
+            state = self.sources.get(source)
+            return state['version'] if state else 0
+
+    def published(self, source):
+        """When the source's content last changed, None if never"""
+        with self._lock:
+            state = self.sources.get(source)
+            return state['changed'] if state else None
+
+    def age(self, source):
+        """Seconds since the source was last fetched (changed or not), None if never"""
+        with self._lock:
+            state = self.sources.get(source)
+            if not state or not state['checked']:
+                return None
+            return (datetime.now() - state['checked']).total_seconds()
+
+    def etag(self, sources, extra=''):
+        """ETag value for a response built from the given sources"""
+        tag = '.'.join(f"{source}{self.version(source)}" for source in sources)
+        return f"{tag}-{extra}" if extra else tag
+
+    def get_status(self):
+        """Versions and change times for the API"""
+        with self._lock:
+            return {
+                source: {
+                    'version': state['version'],
+                    'fingerprint': state['fingerprint'][:12],
+                    'changed': state['changed'].isoformat() if state['changed'] else None,
+                    'checked': state['checked'].isoformat() if state['checked'] else None
+                }
+                for source, state in self.sources.items()
+            }
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+# Server-Sent Events for the kiosk pages
+# Change messages (weather, lightning, calendar, config) get increasing ids and
+# a short history is kept, so a page that reconnects with Last-Event-ID gets
+# what it missed. Idle streams send a comment line now and then, which keeps
+# the connection alive and lets us notice displays that went away.
+
+import json
+import threading
+import time
+from collections import deque
+
+
+def format_event(event_id, event_type, data):
+    return f"id: {event_id}\nevent: {event_type}\ndata: {data}\n\n"
+
+
+class EventBroker:
+    """Fans typed change messages out to every connected event stream"""
+
+    def __init__(self, history=100, heartbeat_seconds=15, retry_ms=3000):
+        # Ids look like "<boot>.<n>" so an id from before a restart is recognised
+        self.boot = str(int(time.time()))
+        self.history = deque(maxlen=history)  # (n, type, json data)
+        self.heartbeat_seconds = heartbeat_seconds
+        self.retry_ms = retry_ms
+        self.last_n = 0
+        self.clients = 0
+        self._changed = threading.Condition()
+
+    def publish(self, event_type, data):
+        """Send a message to every stream. Returns its id"""
+        with self._changed:
+            self.last_n += 1
+            self.history.append((self.last_n, event_type, json.dumps(data, default=str, separators=(',', ':'))))
+            self._changed.notify_all()
+            return f"{self.boot}.{self.last_n}"
+
+    def _cursor(self, last_event_id):
+        """Position to resume from, or None if the client missed messages we no longer have"""
+        if not last_event_id:
+            return self.last_n
+        boot, _, n = last_event_id.partition('.')
+        if boot != self.boot or not n.isdigit() or int(n) > self.last_n:
+            return None
+        n = int(n)
+        if n < self.last_n and (not self.history or self.history[0][0] > n + 1):
+            return None
+        return n
+
+    def stream(self, last_event_id=None):
+        """SSE text for one client, until it disconnects"""
+        with self._changed:
+            self.clients += 1
+            cursor = self._cursor(last_event_id)
+        try:
+            yield f"retry: {self.retry_ms}\n\n"
+            if cursor is None:
+                # Something changed that we can't replay - the page should refresh everything
+                with self._changed:
+                    cursor = self.last_n
+                yield format_event(f"{self.boot}.{cursor}", 'reset', '{}')
+            while True:
+                with self._changed:
+                    if self.last_n == cursor:
+                        self._changed.wait(self.heartbeat_seconds)
+                    missed = bool(self.history) and self.history[0][0] > cursor + 1
+                    events = [event for event in self.history if event[0] > cursor]
+                    cursor = self.last_n
+                if missed:
+                    # A slow client fell behind the history
+                    yield format_event(f"{self.boot}.{cursor}", 'reset', '{}')
+                elif events:
+                    for n, event_type, data in events:
+                        yield format_event(f"{self.boot}.{n}", event_type, data)
+                else:
+                    yield ": heartbeat\n\n"
+        finally:
+            with self._changed:
+                self.clients -= 1
+
+    def get_status(self):
+        with self._changed:
+            return {
+                'clients': self.clients,
+                'last_event_id': f"{self.boot}.{self.last_n}",
+                'history': len(self.history),
+                'heartbeat_seconds': self.heartbeat_seconds
+            }
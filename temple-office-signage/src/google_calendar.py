@@ -2,38 +2,115 @@
 
 import os
 import json
+import time
+import threading
 from datetime import datetime, timedelta
 import pytz
-from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google.oauth2 import service_account
 from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+from googleapiclient import discovery_cache
+from googleapiclient.discovery import build, build_from_document
 from googleapiclient.errors import HttpError
+from credential_manager import CredentialManager, write_token_file
+from calendar_events import CalendarEvent, EventFormatter, intern_calendar, merge_events, original_start_key
+from calendar_recurrence import RecurringSeries
 
 # If modifying these scopes, delete the file token.json.
 SCOPES = ['https://www.googleapis.com/auth/calendar.readonly']
 
+# Partial-response masks - only request the fields we actually render
+EVENT_FIELDS = ('items(id,iCalUID,summary,start,end,location,description,status,'
+                'recurringEventId,originalStartTime)')
+CALENDAR_LIST_FIELDS = 'items(id,summary,backgroundColor,foregroundColor,primary,accessRole)'
+EVENT_FIELDS_PAGED = EVENT_FIELDS + ',nextPageToken,nextSyncToken'
+# Recurring masters and their modified/cancelled instances, for local expansion
+EVENT_FIELDS_RECURRING = ('items(id,iCalUID,summary,start,end,location,description,status,'
+                          'recurringEventId,originalStartTime,recurrence),nextPageToken,nextSyncToken')
+
+# When the same meeting is on several calendars, show the copy from the
+# calendar we have the most say over (lower wins, ties broken by calendar ID)
+ACCESS_ROLE_PRIORITY = {'owner': 1, 'writer': 2, 'reader': 3, 'freeBusyReader': 4}
+WATCH_FIELDS = 'id,resourceId,expiration'
+
+# Full syncs fetch a little past the requested window so incremental syncs
+# can keep serving the rolling window until the next full sync
+SYNC_WINDOW_SLACK = timedelta(days=1)
+
+# The discovery document and the services built from it are reused for the
+# lifetime of the process instead of being fetched/parsed on every build()
+_discovery_document = None
+_service_cache = {}
+_service_cache_lock = threading.Lock()
+
+def get_discovery_document():
+    """Parsed Calendar v3 discovery document from the client library's bundled copy"""
+    global _discovery_document
+    if _discovery_document is None:
+        get_static_doc = getattr(discovery_cache, 'get_static_doc', None)
+        document = get_static_doc('calendar', 'v3') if get_static_doc else None
+        if document is None:
+            return None
+        _discovery_document = json.loads(document)
+    return _discovery_document
+
+def build_calendar_service(creds):
+    """Calendar service for these credentials, built once per process"""
+    with _service_cache_lock:
+        service = _service_cache.get(id(creds))
+        if service is None:
+            document = get_discovery_document()
+            if document is not None:
+                service = build_from_document(document, credentials=creds)
+            else:
+                # Older client libraries don't bundle discovery documents
+                service = build('calendar', 'v3', credentials=creds)
+            _service_cache[id(creds)] = service
+        return service
+
+def _elapsed_ms(started):
+    return round((time.monotonic() - started) * 1000, 1)
+
 class GoogleCalendarAPI:
-    def __init__(self, credentials_file='credentials.json', token_file='token.json'):
+    def __init__(self, credentials_file='credentials.json', token_file='token.json',
+                 expand_recurring=False):
         self.credentials_file = credentials_file
         self.token_file = token_file
+        # Expand recurring events locally instead of fetching every instance
+        self.expand_recurring = expand_recurring
         self.service = None
+        self.credential_manager = None
         self.timezone = pytz.timezone('America/Chicago')  # CST timezone
+        self.formatter = EventFormatter(self.timezone)
+        self.last_refresh_stats = None
+        self._refresh_stats = None
+        
+        # Local event store, kept current with sync tokens: cal_id -> state
+        self.calendars = []
+        self.calendar_store = {}
+        # Also guards every API call: the service's httplib2 connection isn't
+        # thread-safe, and web requests run on their own threads
+        self._sync_lock = threading.RLock()
         
         # Automatically authenticate during initialization
+        self.startup_timings = {}
+        auth_started = time.monotonic()
         if self.authenticate():
             print("Google Calendar authenticated successfully")
         else:
             print("Google Calendar authentication failed")
+        self.startup_timings['authenticate_ms'] = _elapsed_ms(auth_started)
+        print(f"Calendar startup timings: {self.startup_timings}")
         
     def authenticate(self):
         """Authenticate with Google Calendar API"""
         creds = None
         
         # The file token.json stores the user's access and refresh tokens.
+        load_started = time.monotonic()
         if os.path.exists(self.token_file):
             creds = Credentials.from_authorized_user_file(self.token_file, SCOPES)
+        self.startup_timings['load_token_ms'] = _elapsed_ms(load_started)
             
         # If there are no (valid) credentials available, try service account first,
         # then fall back to user OAuth flow.
@@ -46,7 +123,11 @@ class GoogleCalendarAPI:
                     creds = service_account.Credentials.from_service_account_file(
                         service_account_file, scopes=SCOPES)
                     # No refresh token file for service accounts
-                    self.service = build('calendar', 'v3', credentials=creds)
+                    self.credential_manager = CredentialManager(creds)
+                    build_started = time.monotonic()
+                    self.service = build_calendar_service(creds)
+                    self.startup_timings['build_service_ms'] = _elapsed_ms(build_started)
+                    self.credential_manager.start()
                     return True
                 except Exception as e:
                     print(f"Service account authentication failed: {e}")
@@ -55,15 +136,12 @@ class GoogleCalendarAPI:
         # If there are no (valid) credentials available, let the user log in.
         if not creds or not creds.valid:
             if creds and creds.expired and creds.refresh_token:
-                try:
-                    print("Attempting to refresh expired token...")
-                    creds.refresh(Request())
+                print("Attempting to refresh expired token...")
+                self.credential_manager = CredentialManager(creds, self.token_file)
+                if self.credential_manager.refresh():
+                    self.startup_timings['refresh_token_ms'] = self.credential_manager.last_refresh_ms
                     print("Token refreshed successfully")
-                    # Save the refreshed credentials
-                    with open(self.token_file, 'w') as token:
-                        token.write(creds.to_json())
-                except Exception as e:
-                    print(f"Error refreshing credentials: {e}")
+                elif self.credential_manager.needs_reauth:
                     print("Refresh token may be expired - need to re-authenticate")
                     # Delete the invalid token file so we get a fresh auth next time
                     try:
@@ -72,6 +150,9 @@ class GoogleCalendarAPI:
                     except:
                         pass
                     return False
+                else:
+                    # Network trouble - keep the token and let the background refresher retry
+                    print("Token refresh failed for now - will keep retrying in the background")
             else:
                 print("No valid credentials available - starting fresh authentication")
                 if not os.path.exists(self.credentials_file):
@@ -84,238 +165,353 @@ class GoogleCalendarAPI:
                 creds = flow.run_local_server(port=0)
                 
                 # Save the credentials for the next run
-                with open(self.token_file, 'w') as token:
-                    token.write(creds.to_json())
+                write_token_file(self.token_file, creds)
         else:
             print("Using valid existing credentials")
+        
+        if self.credential_manager is None:
+            self.credential_manager = CredentialManager(creds, self.token_file)
                 
         try:
-            self.service = build('calendar', 'v3', credentials=creds)
+            build_started = time.monotonic()
+            self.service = build_calendar_service(creds)
+            self.startup_timings['build_service_ms'] = _elapsed_ms(build_started)
+            # Keep the access token fresh in the background from here on
+            self.credential_manager.start()
             return True
         except HttpError as error:
             print(f'An error occurred: {error}')
             return False
     
-    def get_upcoming_events(self, max_results=10, days_ahead=90):
+    def _execute(self, request):
+        """Execute an API request with gzip negotiated and response size recorded"""
+        # Google only compresses responses when both headers ask for it
+        if 'gzip' not in request.headers.get('accept-encoding', ''):
+            request.headers['accept-encoding'] = 'gzip'
+        user_agent = request.headers.get('user-agent', '')
+        if 'gzip' not in user_agent:
+            request.headers['user-agent'] = f"{user_agent} (gzip)".strip()
+        
+        postproc = request.postproc
+        
+        def record_size(resp, content):
+            if self._refresh_stats is not None:
+                self._refresh_stats['requests'] += 1
+                self._refresh_stats['bytes'] += len(content or b'')
+                if resp.get('-content-encoding') == 'gzip':
+                    self._refresh_stats['gzip_responses'] += 1
+            return postproc(resp, content)
+        
+        request.postproc = record_size
+        with self._sync_lock:
+            return request.execute()
+    
+    def list_calendars(self, fields=CALENDAR_LIST_FIELDS):
+        """List calendars visible to the account, restricted to the given fields"""
+        calendars_result = self._execute(self.service.calendarList().list(fields=fields))
+        return calendars_result.get('items', [])
+    
+    def _list_events(self, cal_id, **params):
+        """Page through events().list and return (items, next_sync_token)"""
+        items = []
+        while True:
+            result = self._execute(self.service.events().list(
+                calendarId=cal_id,
+                singleEvents=not self.expand_recurring,
+                fields=EVENT_FIELDS_RECURRING if self.expand_recurring else EVENT_FIELDS_PAGED,
+                **params
+            ))
+            items.extend(result.get('items', []))
+            if not result.get('nextPageToken'):
+                return items, result.get('nextSyncToken')
+            params['pageToken'] = result['nextPageToken']
+    
+    def sync_calendar(self, cal_id, time_min=None, time_max=None):
+        """Bring the local event store for one calendar up to date.
+        
+        Uses the stored sync token for an incremental sync while the stored
+        window still covers time_max, otherwise does a full sync of the window.
+        Returns the number of events received.
+        """
+        with self._sync_lock:
+            state = self.calendar_store.setdefault(cal_id, {
+                'events': {}, 'series': {}, 'overrides': {},
+                'sync_token': None, 'time_min': None, 'time_max': None
+            })
+            
+            window_covered = (
+                (time_min is None or (state['time_min'] and state['time_min'] <= time_min)) and
+                (time_max is None or (state['time_max'] and state['time_max'] >= time_max))
+            )
+            if state['sync_token'] and window_covered:
+                try:
+                    changes, sync_token = self._list_events(cal_id, syncToken=state['sync_token'])
+                    calendar = self._calendar_info(cal_id)
+                    for event in changes:
+                        self._store_event(state, event, calendar)
+                    state['sync_token'] = sync_token
+                    print(f"  Incremental sync of {cal_id}: {len(changes)} changes")
+                    return len(changes)
+                except HttpError as error:
+                    if error.resp.status != 410:
+                        raise
+                    print(f"  Sync token for {cal_id} expired - doing full sync")
+            
+            # Full sync - extend the window a little so we can sync incrementally
+            # for a while before the rolling window outgrows it
+            if time_min is None:
+                time_min = state['time_min'] or datetime.now(self.timezone)
+            if time_max is None:
+                time_max = state['time_max'] or time_min + timedelta(days=90)
+            time_max = time_max + SYNC_WINDOW_SLACK
+            
+            items, sync_token = self._list_events(
+                cal_id,
+                timeMin=time_min.isoformat(),
+                timeMax=time_max.isoformat()
+            )
+            calendar = self._calendar_info(cal_id)
+            state['events'] = {}
+            state['series'] = {}
+            state['overrides'] = {}
+            for event in items:
+                self._store_event(state, event, calendar)
+            state['sync_token'] = sync_token
+            state['time_min'] = time_min
+            state['time_max'] = time_max
+            print(f"  Full sync of {cal_id}: {len(items)} events")
+            return len(items)
+    
+    def _calendar_info(self, cal_id):
+        """Shared display metadata (name, colors) for a calendar"""
+        for cal in self.calendars:
+            if cal['id'] == cal_id:
+                return intern_calendar(
+                    cal_id,
+                    cal.get('summary', 'Unknown'),
+                    cal.get('backgroundColor', '#4285f4'),
+                    cal.get('foregroundColor', '#ffffff')
+                )
+        return intern_calendar(cal_id)
+    
+    def _source_rank(self, cal):
+        """Deterministic priority of a calendar when merging duplicate events"""
+        if cal.get('primary'):
+            return (0, cal['id'])
+        return (ACCESS_ROLE_PRIORITY.get(cal.get('accessRole'), 5), cal['id'])
+    
+    def _parse_event(self, event, calendar):
+        """Parse a raw API event into a CalendarEvent (None if it can't be parsed)"""
+        try:
+            return CalendarEvent.from_api(event, calendar, self.timezone)
+        except (KeyError, ValueError) as e:
+            print(f"  Skipping unparseable event {event.get('id')}: {e}")
+            return None
+    
+    def _store_event(self, state, event, calendar):
+        """Apply one event from a full or incremental sync to the local store"""
+        event_id = event['id']
+        
+        master_id = event.get('recurringEventId')
+        if self.expand_recurring and master_id and 'originalStartTime' in event:
+            # A moved, edited or cancelled instance replaces that occurrence of its series
+            state['overrides'].setdefault(master_id, set()).add(original_start_key(event))
+            series = state['series'].get(master_id)
+            if series:
+                series.invalidate()
+        
+        state['events'].pop(event_id, None)
+        state['series'].pop(event_id, None)
+        if event.get('status') == 'cancelled':
+            state['overrides'].pop(event_id, None)
+            return
+        
+        if self.expand_recurring and event.get('recurrence'):
+            try:
+                state['series'][event_id] = RecurringSeries(
+                    event, calendar, self.timezone, state['overrides'].setdefault(event_id, set()))
+            except (KeyError, ValueError) as e:
+                print(f"  Skipping unparseable recurring event {event_id}: {e}")
+            return
+        
+        parsed = self._parse_event(event, calendar)
+        if parsed:
+            state['events'][event_id] = parsed
+    
+    def _stored_events(self, cal_id, windows, max_results=None):
+        """Events from the local store for one calendar that overlap any of the windows"""
+        state = self.calendar_store.get(cal_id)
+        if not state:
+            return []
+        
+        candidates = list(state['events'].values())
+        for series in state['series'].values():
+            # Expanded over the whole synced window so the cache survives until the next sync
+            candidates.extend(series.instances(state['time_min'], state['time_max']))
+        
+        in_window = [event for event in candidates
+                     if any(event.end > start and event.start < end for start, end in windows)]
+        in_window.sort(key=lambda event: event.start)
+        return in_window[:max_results] if max_results else in_window
+    
+    def get_upcoming_events(self, max_results=10, days_ahead=90, only_calendar=None):
         """Get upcoming events from Google Calendar with extended search range"""
         print(f"Getting upcoming events (max: {max_results}, days: {days_ahead})")
+        now = datetime.now(self.timezone)
+        return self.get_events([(now, now + timedelta(days=days_ahead))], max_results, only_calendar)
+    
+    def get_events(self, windows, max_results=None, only_calendar=None):
+        """Get the events overlapping any of the (start, end) windows
+        
+        windows must be sorted; the calendars are synced over the span from
+        the first window's start to the last one's end. Pass only_calendar to
+        sync just that calendar (e.g. after a push notification) and serve
+        the rest from the local event store.
+        """
         
         # Verify service is available
         if not self.service:
             print("Google Calendar service not initialized")
             return [
-                {
-                    'title': 'Calendar Service Error',
-                    'time': 'Error',
-                    'duration': 'Service not initialized',
-                    'description': 'Google Calendar service not available',
-                    'location': 'System Error',
-                    'is_today': False
-                }
+                CalendarEvent.notice(
+                    'Calendar Service Error',
+                    description='Google Calendar service not available',
+                    location='System Error',
+                    time_label='Error',
+                    duration_label='Service not initialized'
+                )
             ]
         
+        with self._sync_lock:
+            return self._refresh_events(windows, max_results, only_calendar)
+    
+    def _refresh_events(self, windows, max_results, only_calendar):
+        """Sync calendars into the local store and format what falls in the windows"""
+        # Track request count and payload bytes for this refresh
+        self._refresh_stats = {'requests': 0, 'bytes': 0, 'gzip_responses': 0}
+        refresh_started = time.monotonic()
+        
         try:
-            # Calculate time range - extend to 30 days ahead
-            now = datetime.now(self.timezone)
-            end_time = now + timedelta(days=days_ahead)
+            # One sync window covering every requested window
+            time_min = windows[0][0]
+            time_max = windows[-1][1]
             
-            print(f"Searching from {now.isoformat()} to {end_time.isoformat()}")
+            print(f"Searching from {time_min.isoformat()} to {time_max.isoformat()}")
             
-            # List available calendars for debugging
-            calendars_result = self.service.calendarList().list().execute()
-            calendars = calendars_result.get('items', [])
-            print(f"Available calendars ({len(calendars)}):")
-            for cal in calendars:
-                cal_id = cal['id']
-                cal_name = cal.get('summary', 'Unknown')
-                print(f"  - {cal_name} ({cal_id})")
+            if only_calendar is None or not self.calendars:
+                # List available calendars for debugging
+                self.calendars = self.list_calendars()
+                print(f"Available calendars ({len(self.calendars)}):")
+                for cal in self.calendars:
+                    cal_id = cal['id']
+                    cal_name = cal.get('summary', 'Unknown')
+                    print(f"  - {cal_name} ({cal_id})")
             
             # Get events from ALL available calendars (including shared ones)
-            print(f"Querying all calendars from {now} to {end_time}")
+            print(f"Querying all calendars from {time_min} to {time_max}")
             
-            all_events = []
-            seen_ids = set()
+            sources = []
             
-            # Query each calendar separately
-            for cal in calendars:
+            # Sync each calendar separately, then read back from the store
+            for cal in self.calendars:
                 cal_id = cal['id']
-                cal_name = cal.get('summary', 'Unknown')
-                cal_bg_color = cal.get('backgroundColor', '#4285f4')
-                cal_fg_color = cal.get('foregroundColor', '#ffffff')
+                calendar = self._calendar_info(cal_id)
                 
                 try:
-                    print(f"Querying calendar: {cal_name} ({cal_id}) - Color: {cal_bg_color}")
-                    events_result = self.service.events().list(
-                        calendarId=cal_id,
-                        timeMin=now.isoformat(),
-                        timeMax=end_time.isoformat(),
-                        maxResults=max_results,
-                        singleEvents=True,
-                        orderBy='startTime'
-                    ).execute()
+                    if only_calendar is None or cal_id == only_calendar:
+                        print(f"Syncing calendar: {calendar.name} ({cal_id}) - Color: {calendar.bg_color}")
+                        self.sync_calendar(cal_id, time_min, time_max)
                     
-                    calendar_events = events_result.get('items', [])
-                    print(f"  Found {len(calendar_events)} events in {cal_name}")
+                    calendar_events = self._stored_events(cal_id, windows, max_results)
+                    print(f"  Found {len(calendar_events)} events in {calendar.name}")
                     
-                    # Add events with calendar source info and remove duplicates
                     for event in calendar_events:
-                        event_id = event.get('id')
-                        if event_id not in seen_ids:
-                            seen_ids.add(event_id)
-                            # Add calendar source information to event
-                            event['calendar_name'] = cal_name
-                            event['calendar_id'] = cal_id
-                            event['calendar_bg_color'] = cal_bg_color
-                            event['calendar_fg_color'] = cal_fg_color
-                            all_events.append(event)
+                        # Calendar name/colors may have changed since the event was stored
+                        event.calendar = calendar
+                    sources.append((self._source_rank(cal), calendar_events))
                             
                 except Exception as e:
-                    print(f"  Error querying calendar {cal_name}: {e}")
+                    print(f"  Error querying calendar {calendar.name}: {e}")
                     continue
             
-            events = all_events
+            # Shared meetings show up once per calendar - keep one copy of each
+            events = merge_events(sources)
             print(f"Total unique events from all calendars: {len(events)}")
+            self._finish_refresh_stats(refresh_started)
             
             if not events:
                 print("No events found in any calendars - creating empty calendar display")
                 print("To see events, add them to your Google Calendar or ensure shared calendars have events!")
                 return [
-                    {
-                        'title': 'No Events Scheduled',
-                        'time': 'Add events to your Google Calendar',
-                        'duration': 'Calendar is empty',
-                        'description': 'No events found in any available calendars',
-                        'location': 'richard.coleman@iescomm.com',
-                        'is_today': False
-                    }
+                    CalendarEvent.notice(
+                        'No Events Scheduled',
+                        description='No events found in any available calendars',
+                        location='richard.coleman@iescomm.com',
+                        time_label='Add events to your Google Calendar',
+                        duration_label='Calendar is empty'
+                    )
                 ]
             
-            formatted_events = []
-            for event in events:
-                formatted_event = self._format_event(event)
-                if formatted_event:
-                    formatted_events.append(formatted_event)
-                    print(f"Found event: {formatted_event['title']} on {formatted_event['date']}")
+            formatted_events = self.formatter.format_events(events)
+            for event in formatted_events:
+                print(f"Found event: {event.title} on {event.date_label}")
             
             return formatted_events
             
         except Exception as error:
             print(f"Error fetching calendar events: {error}")
+            self._finish_refresh_stats(refresh_started)
             return [
-                {
-                    'title': 'Calendar Error',
-                    'time': 'Error',
-                    'duration': 'Troubleshoot',
-                    'description': f'Error: {str(error)}',
-                    'location': 'System Error',
-                    'time': 'Check logs',
-                    'date': 'Error',
-                    'duration': 'Troubleshoot',
-                    'is_today': False
-                }
+                CalendarEvent.notice(
+                    'Calendar Error',
+                    description=f'Error: {str(error)}',
+                    location='System Error',
+                    time_label='Check logs',
+                    date_label='Error',
+                    duration_label='Troubleshoot'
+                )
             ]
     
-    def _format_event(self, event):
-        """Format a Google Calendar event for display"""
-        try:
-            # Get event start time
-            start = event['start'].get('dateTime', event['start'].get('date'))
-            end = event['end'].get('dateTime', event['end'].get('date'))
-            
-            # Parse datetime
-            if 'T' in start:  # DateTime event
-                start_dt = datetime.fromisoformat(start.replace('Z', '+00:00'))
-                end_dt = datetime.fromisoformat(end.replace('Z', '+00:00'))
-                
-                # Convert to local timezone
-                start_local = start_dt.astimezone(self.timezone)
-                end_local = end_dt.astimezone(self.timezone)
-                
-                # Format time and date
-                time_str = start_local.strftime('%I:%M %p')
-                duration_hours = (end_local - start_local).total_seconds() / 3600
-                duration_str = f"{duration_hours:.1f}h" if duration_hours != int(duration_hours) else f"{int(duration_hours)}h"
-                
-                if start_local.date() == datetime.now(self.timezone).date():
-                    date_str = 'Today'
-                    is_today = True
-                elif start_local.date() == (datetime.now(self.timezone) + timedelta(days=1)).date():
-                    date_str = 'Tomorrow'
-                    is_today = False
-                else:
-                    date_str = start_local.strftime('%a, %b %d')
-                    is_today = False
-                    
-                duration = end_local - start_local
-                duration_str = f"{int(duration.total_seconds() / 3600)}h {int((duration.total_seconds() % 3600) / 60)}m"
-                
-            else:  # All-day event
-                start_dt = datetime.fromisoformat(start)
-                time_str = 'All Day'
-                date_str = start_dt.strftime('%a, %b %d')
-                duration_str = 'All Day'
-            
-            return {
-                'title': event.get('summary', 'No Title'),
-                'description': event.get('description', ''),
-                'location': event.get('location', ''),
-                'time': time_str,
-                'date': date_str,
-                'duration': duration_str,
-                'start_datetime': start,
-                'end_datetime': end,  # ADD THIS - we were missing the end datetime!
-                'date_obj': start_local.date() if 'T' in start else datetime.fromisoformat(start).date(),
-                'is_today': date_str == 'Today',
-                'is_all_day': 'T' not in start,
-                'calendar_name': event.get('calendar_name', 'Unknown Calendar'),
-                'calendar_id': event.get('calendar_id', ''),
-                'calendar_bg_color': event.get('calendar_bg_color', '#4285f4'),
-                'calendar_fg_color': event.get('calendar_fg_color', '#ffffff')
-            }
-            
-        except Exception as e:
-            print(f"Error formatting event: {e}")
-            return None
+    def watch_events(self, cal_id, channel_id, token, address, ttl_seconds):
+        """Open a push-notification channel for changes to a calendar's events"""
+        body = {
+            'id': channel_id,
+            'type': 'web_hook',
+            'address': address,
+            'token': token,
+            'params': {'ttl': str(ttl_seconds)}
+        }
+        return self._execute(self.service.events().watch(
+            calendarId=cal_id, body=body, fields=WATCH_FIELDS))
+    
+    def stop_channel(self, channel_id, resource_id):
+        """Stop a push-notification channel opened with watch_events"""
+        self._execute(self.service.channels().stop(
+            body={'id': channel_id, 'resourceId': resource_id}))
+    
+    def _finish_refresh_stats(self, refresh_started):
+        """Publish the request/byte counters collected during a refresh"""
+        stats = self._refresh_stats
+        if stats is None:
+            return
+        stats['duration_ms'] = round((time.monotonic() - refresh_started) * 1000)
+        stats['completed'] = datetime.now(self.timezone).isoformat()
+        self.last_refresh_stats = stats
+        self._refresh_stats = None
+        print(f"Calendar refresh: {stats['requests']} requests, {stats['bytes']} bytes "
+              f"({stats['gzip_responses']} gzip) in {stats['duration_ms']}ms")
     
     def _get_fallback_events(self):
         """Return fallback events when API is unavailable"""
         return [
-            {
-                'title': 'CFSS Team Meeting',
-                'description': 'Weekly project status and updates',
-                'location': 'Conference Room A',
-                'time': '2:00 PM',
-                'date': 'Today',
-                'duration': '1h 0m',
-                'is_today': True
-            },
-            {
-                'title': 'System Maintenance',
-                'description': 'Network updates and server maintenance',
-                'location': 'Server Room',
-                'time': '6:00 PM',
-                'date': 'Today',
-                'duration': '2h 0m',
-                'is_today': True
-            },
-            {
-                'title': 'All Hands Meeting',
-                'description': 'Quarterly review and planning session',
-                'location': 'Main Conference Room',
-                'time': '10:00 AM',
-                'date': 'Tomorrow',
-                'duration': '1h 30m',
-                'is_today': False
-            },
-            {
-                'title': 'Training Session',
-                'description': 'New security protocols and procedures',
-                'location': 'Training Room B',
-                'time': '3:30 PM',
-                'date': 'Fri, Aug 8',
-                'duration': '2h 0m',
-                'is_today': False
-            }
+            CalendarEvent.notice('CFSS Team Meeting', 'Weekly project status and updates',
+                                 'Conference Room A', '2:00 PM', 'Today', '1h 0m'),
+            CalendarEvent.notice('System Maintenance', 'Network updates and server maintenance',
+                                 'Server Room', '6:00 PM', 'Today', '2h 0m'),
+            CalendarEvent.notice('All Hands Meeting', 'Quarterly review and planning session',
+                                 'Main Conference Room', '10:00 AM', 'Tomorrow', '1h 30m'),
+            CalendarEvent.notice('Training Session', 'New security protocols and procedures',
+                                 'Training Room B', '3:30 PM', 'Fri, Aug 8', '2h 0m')
         ]
 
 def main():
@@ -324,12 +520,12 @@ def main():
     events = calendar.get_upcoming_events()
     
     print("Upcoming Events:")
-    for event in events:
-        print(f"- {event['title']} ({event['date']} at {event['time']})")
-        if event['location']:
-            print(f"  Location: {event['location']}")
-        if event['description']:
-            print(f"  Description: {event['description'][:100]}...")
+    for event, day in zip(events, calendar.formatter.day_labels(events)):
+        print(f"- {event.title} ({day} at {event.time_label})")
+        if event.location:
+            print(f"  Location: {event.location}")
+        if event.description:
+            print(f"  Description: {event.description[:100]}...")
         print()
 
 if __name__ == '__main__':
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+
+# iCalendar (.ics) feed source
+# Reads calendars exported/published as iCalendar from a local path or URL.
+# Feeds are parsed line by line into the same event model as Google Calendar,
+# and are only re-read when the file's mtime or the server's ETag changes.
+
+import os
+import re
+import time
+import pytz
+import requests
+from datetime import datetime, timedelta
+from calendar_events import CalendarEvent, EventFormatter, intern_calendar, merge_events, original_start_key
+from calendar_recurrence import RecurringSeries
+
+ICS_COLOR = '#0b8043'
+DURATION_PATTERN = re.compile(
+    r'^([+-])?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$')
+RECURRENCE_PROPERTIES = ('RRULE', 'RDATE', 'EXDATE', 'EXRULE')
+
+
+def unfold_lines(lines):
+    """Join folded iCalendar content lines (continuations start with a space or tab)
+
+    Blank lines are skipped, so a fold after one still joins the line before it:
+
+    >>> list(unfold_lines(['SUMMARY:Site', '', ' Visit', 'END:VEVENT']))
+    ['SUMMARY:SiteVisit', 'END:VEVENT']
+    """
+    current = None
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if not line:
+            continue  # Stray blank lines (some exporters add them) aren't content lines
+        if line[:1] in (' ', '\t') and current is not None:
+            current += line[1:]
+            continue
+        if current:
+            yield current
+        current = line
+    if current:
+        yield current
+
+
+def split_property(line):
+    """'DTSTART;TZID=America/Chicago:20261020T090000' -> (name, params, value, raw)"""
+    in_quotes = False
+    for i, char in enumerate(line):
+        if char == '"':
+            in_quotes = not in_quotes
+        elif char == ':' and not in_quotes:
+            head, value = line[:i], line[i + 1:]
+            break
+    else:
+        return None
+
+    name, *param_parts = head.split(';')
+    params = {}
+    for part in param_parts:
+        key, _, param_value = part.partition('=')
+        params[key.upper()] = param_value.strip('"')
+    return name.upper(), params, value, line
+
+
+def unescape_text(value):
+    return (value.replace('\\n', '\n').replace('\\N', '\n')
+            .replace('\\,', ',').replace('\\;', ';').replace('\\\\', '\\'))
+
+
+def parse_duration(value):
+    match = DURATION_PATTERN.match(value)
+    if not match:
+        raise ValueError(f"Bad DURATION {value!r}")
+    sign, weeks, days, hours, minutes, seconds = match.groups()
+    duration = timedelta(weeks=int(weeks or 0), days=int(days or 0), hours=int(hours or 0),
+                         minutes=int(minutes or 0), seconds=int(seconds or 0))
+    return -duration if sign == '-' else duration
+
+
+class ICSParser:
+    """Streams VEVENTs out of an iCalendar feed as Calendar API style dicts"""
+
+    def __init__(self, timezone):
+        self.timezone = timezone
+        self.calendar_name = None
+
+    def _zone(self, tzid):
+        try:
+            return pytz.timezone(tzid) if tzid else self.timezone
+        except pytz.UnknownTimeZoneError:
+            # e.g. Outlook's "Central Standard Time" - assume the signage timezone
+            return self.timezone
+
+    def _time(self, params, value):
+        """DTSTART/DTEND/RECURRENCE-ID value -> Calendar API start/end dict"""
+        if params.get('VALUE') == 'DATE' or 'T' not in value:
+            return {'date': datetime.strptime(value[:8], '%Y%m%d').date().isoformat()}
+        if value.endswith('Z'):
+            moment = datetime.strptime(value[:15], '%Y%m%dT%H%M%S')
+            return {'dateTime': moment.isoformat() + 'Z', 'timeZone': 'UTC'}
+        zone = self._zone(params.get('TZID'))
+        moment = zone.localize(datetime.strptime(value[:15], '%Y%m%dT%H%M%S'))
+        return {'dateTime': moment.isoformat(), 'timeZone': zone.zone}
+
+    def events(self, lines):
+        """Yield one dict per VEVENT while reading the lines"""
+        depth = []
+        props = None
+        for line in unfold_lines(lines):
+            if line.startswith('BEGIN:'):
+                depth.append(line[6:].upper())
+                if depth == ['VCALENDAR', 'VEVENT']:
+                    props = {}
+                continue
+            if line.startswith('END:'):
+                if depth == ['VCALENDAR', 'VEVENT'] and props is not None:
+                    try:
+                        yield self._to_event(props)
+                    except (KeyError, ValueError) as e:
+                        print(f"  Skipping unparseable VEVENT {props.get('UID', (None, '?'))[1]}: {e}")
+                    props = None
+                if depth:
+                    depth.pop()
+                continue
+
+            parsed = split_property(line)
+            if parsed is None:
+                continue
+            name, params, value, raw = parsed
+            if depth == ['VCALENDAR'] and name == 'X-WR-CALNAME':
+                self.calendar_name = unescape_text(value)
+            elif depth == ['VCALENDAR', 'VEVENT']:  # Skip VALARMs etc. nested in events
+                if name in RECURRENCE_PROPERTIES:
+                    props.setdefault('recurrence', []).append(raw)
+                else:
+                    props[name] = (params, value, raw)
+
+    def _to_event(self, props):
+        uid = props['UID'][1]
+        start = self._time(*props['DTSTART'][:2])
+        if 'DTEND' in props:
+            end = self._time(*props['DTEND'][:2])
+        else:
+            length = parse_duration(props['DURATION'][1]) if 'DURATION' in props else None
+            if 'date' in start:
+                day = datetime.fromisoformat(start['date']) + (length or timedelta(days=1))
+                end = {'date': day.date().isoformat()}
+            else:
+                moment = datetime.fromisoformat(start['dateTime'].replace('Z', '+00:00')) + (length or timedelta(0))
+                end = {'dateTime': moment.isoformat(), 'timeZone': start.get('timeZone')}
+
+        event = {
+            'id': uid,
+            'iCalUID': uid,
+            'summary': unescape_text(props['SUMMARY'][1]) if 'SUMMARY' in props else 'No Title',
+            'description': unescape_text(props['DESCRIPTION'][1]) if 'DESCRIPTION' in props else '',
+            'location': unescape_text(props['LOCATION'][1]) if 'LOCATION' in props else '',
+            'status': 'cancelled' if props.get('STATUS', ('', ''))[1].upper() == 'CANCELLED' else 'confirmed',
+            'start': start,
+            'end': end
+        }
+        if 'recurrence' in props:
+            event['recurrence'] = props['recurrence']
+        if 'RECURRENCE-ID' in props:
+            # An edited occurrence of a recurring event
+            params, value, _ = props['RECURRENCE-ID']
+            event['recurringEventId'] = uid
+            event['originalStartTime'] = self._time(params, value)
+            event['id'] = f"{uid}_{value}"
+        return event
+
+
+class ICSCalendarSource:
+    """Calendar events from one or more iCalendar feeds (file paths or URLs)"""
+
+    def __init__(self, feeds, timezone):
+        self.timezone = timezone
+        self.formatter = EventFormatter(timezone)
+        self.feeds = [{
+            'source': feed,
+            'is_url': feed.startswith(('http://', 'https://', 'webcal://')),
+            'validator': None,  # mtime/size for files, ETag/Last-Modified for URLs
+            'calendar': None,
+            'events': {},
+            'series': {},
+            'loads': 0,
+            'skipped': 0,
+            'last_load_ms': None,
+            'last_error': None
+        } for feed in feeds]
+
+    def refresh(self):
+        """Re-read any feeds that changed. Returns the number of feeds reloaded"""
+        reloaded = 0
+        for feed in self.feeds:
+            try:
+                if self._refresh_feed(feed):
+                    reloaded += 1
+                feed['last_error'] = None
+            except Exception as e:
+                feed['last_error'] = str(e)
+                print(f"ICS feed {feed['source']} failed: {e}")
+        return reloaded
+
+    def _refresh_feed(self, feed):
+        if feed['is_url']:
+            url = feed['source'].replace('webcal://', 'https://', 1)
+            headers = {}
+            if feed['validator']:
+                etag, last_modified = feed['validator']
+                if etag:
+                    headers['If-None-Match'] = etag
+                if last_modified:
+                    headers['If-Modified-Since'] = last_modified
+            with requests.get(url, headers=headers, stream=True, timeout=30) as response:
+                if response.status_code == 304:
+                    feed['skipped'] += 1
+                    return False
+                response.raise_for_status()
+                response.encoding = response.encoding or 'utf-8'
+                self._load(feed, response.iter_lines(decode_unicode=True))
+                feed['validator'] = (response.headers.get('ETag'), response.headers.get('Last-Modified'))
+            return True
+
+        stat = os.stat(feed['source'])
+        validator = (stat.st_mtime_ns, stat.st_size)
+        if validator == feed['validator']:
+            feed['skipped'] += 1
+            return False
+        with open(feed['source'], 'r', encoding='utf-8', errors='replace') as ics_file:
+            self._load(feed, ics_file)
+        feed['validator'] = validator
+        return True
+
+    def _load(self, feed, lines):
+        """Parse a feed into its event store, one VEVENT at a time"""
+        started = time.monotonic()
+        parser = ICSParser(self.timezone)
+        events, series, overrides = {}, {}, {}
+        calendar = None
+
+        for raw in parser.events(lines):
+            if calendar is None:
+                # X-WR-CALNAME comes before the first VEVENT
+                calendar = self._feed_calendar(feed, parser)
+
+            if 'originalStartTime' in raw:
+                overrides.setdefault(raw['recurringEventId'], set()).add(original_start_key(raw))
+                master = series.get(raw['recurringEventId'])
+                if master:
+                    master.invalidate()
+            if raw['status'] == 'cancelled':
+                continue
+            try:
+                if 'recurrence' in raw and 'originalStartTime' not in raw:
+                    series[raw['id']] = RecurringSeries(
+                        raw, calendar, self.timezone, overrides.setdefault(raw['id'], set()))
+                else:
+                    events[raw['id']] = CalendarEvent.from_api(raw, calendar, self.timezone)
+            except (KeyError, ValueError) as e:
+                print(f"  Skipping unparseable event {raw['id']}: {e}")
+
+        feed['calendar'] = calendar or self._feed_calendar(feed, parser)
+        feed['events'] = events
+        feed['series'] = series
+        feed['loads'] += 1
+        feed['last_load_ms'] = round((time.monotonic() - started) * 1000, 1)
+        print(f"ICS feed {feed['source']}: {len(events)} events, {len(series)} recurring "
+              f"({feed['last_load_ms']}ms)")
+
+    def _feed_calendar(self, feed, parser):
+        name = parser.calendar_name or os.path.splitext(os.path.basename(feed['source']))[0]
+        return intern_calendar(feed['source'], name, ICS_COLOR)
+
+    def get_events(self, windows):
+        """Events overlapping any of the sorted (start, end) windows, all feeds merged"""
+        self.refresh()
+        if not windows:
+            return []
+        span_start, span_end = windows[0][0], windows[-1][1]
+
+        sources = []
+        for rank, feed in enumerate(self.feeds):
+            candidates = list(feed['events'].values())
+            for series in feed['series'].values():
+                candidates.extend(series.instances(span_start, span_end))
+            sources.append((rank, [event for event in candidates
+                                   if any(event.end > start and event.start < end
+                                          for start, end in windows)]))
+        return self.formatter.format_events(merge_events(sources))
+
+    def get_status(self):
+        return [{
+            'source': feed['source'],
+            'calendar': feed['calendar'].name if feed['calendar'] else None,
+            'events': len(feed['events']),
+            'recurring': len(feed['series']),
+            'loads': feed['loads'],
+            'skipped_unchanged': feed['skipped'],
+            'last_load_ms': feed['last_load_ms'],
+            'last_error': feed['last_error']
+        } for feed in self.feeds]
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+
+# In-memory cache of rendered dashboard pages
+# Pages are rendered when their data changes (or their clock ticks over) and
+# requests are served the stored bytes. A max age re-renders pages whose
+# clock-dependent bits ("Last updated ...") would otherwise go stale.
+# Each render is compressed once (gzip, and brotli when installed) and tagged
+# with a strong ETag, so requests never compress and unchanged pages get a 304.
+# Renderers may return the page as a generator of chunks. A request that finds
+# its page stale gets those chunks as they're produced (stream()), and the
+# cache keeps the joined result.
+
+import gzip
+import hashlib
+import threading
+import time
+
+try:
+    import brotli  # Optional - pip install brotli
+except ImportError:
+    brotli = None
+
+CHUNK_BYTES = 16 * 1024
+
+
+class RenderedPage:
+    """One render of a page: its bytes in every encoding we serve, plus its ETag"""
+
+    __slots__ = ('key', 'etag', 'variants')
+
+    def __init__(self, key, body):
+        self.key = key
+        # The key names the data; the digest covers clock-only re-renders of the same data
+        self.etag = f"{key}-{hashlib.sha1(body).hexdigest()[:12]}"
+        self.variants = {'identity': body, 'gzip': gzip.compress(body, compresslevel=9)}
+        if brotli is not None:
+            self.variants['br'] = brotli.compress(body)
+
+    def pick_encoding(self, accept_encodings):
+        """Smallest variant the client accepts (werkzeug Accept or None)"""
+        if accept_encodings is not None:
+            for encoding in ('br', 'gzip'):
+                if encoding in self.variants and accept_encodings.quality(encoding) > 0:
+                    return encoding
+        return 'identity'
+
+    def etag_for(self, encoding):
+        # Each encoding is a different representation, so it needs its own strong tag
+        return self.etag if encoding == 'identity' else f"{self.etag}-{encoding}"
+
+
+class PageCache:
+    """Rendered pages keyed by the data versions they were built from"""
+
+    def __init__(self):
+        self.pages = {}
+
+    def register(self, name, render, key, max_age=None):
+        """Cache a page. render() returns the page (str, or chunks of it); key() names the data it would show"""
+        self.pages[name] = {
+            'render': render,
+            'key': key,
+            'max_age': max_age,
+            'page': None,
+            'rendered_at': None,
+            'lock': threading.Lock(),
+            'renders': 0,
+            'hits': 0,
+            'last_render_ms': None,
+            'last_error': None
+        }
+
+    def _is_fresh(self, page, key):
+        if page['page'] is None or page['page'].key != key:
+            return False
+        return page['max_age'] is None or time.monotonic() - page['rendered_at'] < page['max_age']
+
+    def _chunks(self, page):
+        """The page's render as bytes chunks of at least CHUNK_BYTES (but the last)"""
+        body = page['render']()
+        if isinstance(body, (str, bytes)):
+            body = [body]
+        # Templates generate a piece per tag - gather them so each write to the socket is worthwhile
+        pending, size = [], 0
+        for piece in body:
+            if isinstance(piece, str):
+                piece = piece.encode('utf-8')
+            pending.append(piece)
+            size += len(piece)
+            if size >= CHUNK_BYTES:
+                yield b''.join(pending)
+                pending, size = [], 0
+        if pending:
+            yield b''.join(pending)
+
+    def _render(self, page, key):
+        started = time.monotonic()
+        self._store(page, key, list(self._chunks(page)), started)
+
+    def _store(self, page, key, chunks, started):
+        page['page'] = RenderedPage(key, b''.join(chunks))  # One join, however many chunks
+        page['rendered_at'] = time.monotonic()
+        page['renders'] += 1
+        page['last_render_ms'] = round((page['rendered_at'] - started) * 1000, 1)
+
+    def get(self, name):
+        """The page's current RenderedPage, rendered now only if the cached copy is stale"""
+        page = self.pages[name]
+        key = page['key']()
+        if self._is_fresh(page, key):
+            page['hits'] += 1
+            return page['page']
+        with page['lock']:
+            # Another request may have rendered it while we waited
+            key = page['key']()
+            if not self._is_fresh(page, key):
+                self._render(page, key)
+            return page['page']
+
+    def stream(self, name):
+        """None if the cached copy is fresh (use get()); otherwise the page's chunks as
+        they render, stored in the cache once the last one is out.
+
+        The lock isn't held while sending, so a slow or stalled display can't
+        hold up other requests. A client that hangs up mid-page leaves the
+        cache untouched.
+        """
+        page = self.pages[name]
+        if self._is_fresh(page, page['key']()):
+            return None
+        return self._stream_render(page)
+
+    def _stream_render(self, page):
+        key = page['key']()
+        started = time.monotonic()
+        chunks = []
+        for chunk in self._chunks(page):
+            chunks.append(chunk)
+            yield chunk
+        with page['lock']:
+            # Keep a render that landed meanwhile (the scheduler, or another request)
+            if not self._is_fresh(page, key):
+                self._store(page, key, chunks, started)
+
+    def refresh(self):
+        """Re-render stale pages ahead of the next request (call after data updates)"""
+        for name, page in self.pages.items():
+            # A page being rendered right now (possibly by the caller itself,
+            # when a view triggers a data update) is left to that render
+            if not page['lock'].acquire(blocking=False):
+                continue
+            try:
+                key = page['key']()
+                if not self._is_fresh(page, key):
+                    self._render(page, key)
+                page['last_error'] = None
+            except Exception as e:
+                page['last_error'] = str(e)
+                print(f"Page cache: rendering {name} failed: {e}")
+            finally:
+                page['lock'].release()
+
+    def get_status(self):
+        now = time.monotonic()
+        return {
+            name: {
+                'key': page['page'].key if page['page'] else None,
+                'etag': page['page'].etag if page['page'] else None,
+                'bytes': {encoding: len(body) for encoding, body in page['page'].variants.items()}
+                if page['page'] else {},
+                'age_seconds': round(now - page['rendered_at'], 1) if page['rendered_at'] else None,
+                'max_age': page['max_age'],
+                'renders': page['renders'],
+                'hits': page['hits'],
+                'last_render_ms': page['last_render_ms'],
+                'last_error': page['last_error']
+            }
+            for name, page in self.pages.items()
+        }
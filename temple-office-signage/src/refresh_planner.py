@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+
+# Rotation-aware data refresh
+# The rotation page reports each dashboard as it comes on screen, which gives
+# us the timeline: what is shown next and when. A data source is refreshed
+# shortly before the next slot that shows it - and only if its data would
+# otherwise be older than its freshness SLO by the end of that slot. Sources
+# that no enabled dashboard shows aren't refreshed at all, and the fixed
+# timers only run while no display is reporting.
+
+import threading
+import time
+
+
+class RefreshPlanner:
+    """Schedules source refreshes just ahead of the dashboards that show them"""
+
+    def __init__(self, rotation, data_versions, lead_seconds=20):
+        self.rotation = rotation
+        self.data_versions = data_versions
+        self.lead_seconds = lead_seconds  # Refresh this long before the slot (the page prefetches 8s ahead)
+        self.sources = {}
+        self.showing = None  # (dashboard id, monotonic time it came on screen)
+        self._lock = threading.Lock()
+
+    def add_source(self, name, refresh, slo):
+        """refresh() fetches the source; slo() is the oldest its data may be on screen, in seconds"""
+        self.sources[name] = {
+            'refresh': refresh,
+            'slo': slo,
+            'timer': None,
+            'due': None,
+            'refreshes': 0,
+            'skipped_slots': 0,
+            'last_error': None
+        }
+
+    def sources_in_rotation(self):
+        return {source for dashboard in self.rotation.enabled() for source in dashboard['sources']}
+
+    def is_live(self, now=None):
+        """True while a display is reporting its rotation"""
+        if self.showing is None:
+            return False
+        if now is None:
+            now = time.monotonic()
+        cycle = sum(dashboard['duration'] for dashboard in self.rotation.enabled())
+        return now - self.showing[1] < 2 * cycle + 60
+
+    def wants_timer(self, source):
+        """Whether a fixed-interval job should refresh this source now"""
+        return source in self.sources_in_rotation() and not self.is_live()
+
+    def dashboard_shown(self, dashboard_id):
+        """The rotation page put a dashboard on screen - plan the refreshes for what follows"""
+        now = time.monotonic()
+        with self._lock:
+            self.showing = (dashboard_id, now)
+            self._plan(now)
+
+    def _slots(self, now):
+        """(dashboard, start, end) from the one on screen through one full cycle"""
+        enabled = self.rotation.enabled()
+        shown_id, started = self.showing
+        ids = [dashboard['id'] for dashboard in enabled]
+        if shown_id in ids:
+            position = ids.index(shown_id)
+            slots = [(enabled[position], started, started + enabled[position]['duration'])]
+            start = slots[0][2]
+        else:
+            position, slots, start = -1, [], now  # Not in the rotation (any more) - the page moves on
+        for step in range(1, len(enabled) + 1):
+            dashboard = enabled[(position + step) % len(enabled)]
+            slots.append((dashboard, start, start + dashboard['duration']))
+            start += dashboard['duration']
+        return slots
+
+    def _plan(self, now):
+        slots = self._slots(now)
+        for name, source in self.sources.items():
+            if source['timer']:
+                source['timer'].cancel()
+            source['timer'], source['due'] = None, None
+            slo = source['slo']()
+            age = self.data_versions.age(name)
+            fetched = now - age if age is not None else None
+            # Only the next slot showing this source matters; later ones get planned on later reports
+            for dashboard, start, end in slots:
+                if name not in dashboard['sources']:
+                    continue
+                if fetched is not None and fetched >= end - slo:
+                    source['skipped_slots'] += 1  # Still within its SLO when the slot ends
+                    break
+                # Fresh data must also last the slot, so a tight SLO shortens the lead
+                lead = min(self.lead_seconds, max(0, slo - (end - start)))
+                due = max(now, start - lead)
+                source['due'] = due
+                source['timer'] = threading.Timer(due - now, self._refresh, args=(name,))
+                source['timer'].daemon = True
+                source['timer'].start()
+                break
+
+    def _refresh(self, name):
+        source = self.sources[name]
+        with self._lock:
+            source['timer'], source['due'] = None, None
+        try:
+            source['refresh']()
+            source['refreshes'] += 1
+            source['last_error'] = None
+        except Exception as e:
+            source['last_error'] = str(e)
+            print(f"Refresh planner: refreshing {name} failed: {e}")
+
+    def get_status(self):
+        now = time.monotonic()
+        with self._lock:
+            ages = {name: self.data_versions.age(name) for name in self.sources}
+            return {
+                'live': self.is_live(now),
+                'showing': self.showing[0] if self.showing else None,
+                'showing_seconds': round(now - self.showing[1], 1) if self.showing else None,
+                'sources': {
+                    name: {
+                        'in_rotation': name in self.sources_in_rotation(),
+                        'slo_seconds': source['slo'](),
+                        'age_seconds': round(ages[name], 1) if ages[name] is not None else None,
+                        'refresh_in_seconds': round(source['due'] - now, 1) if source['due'] else None,
+                        'refreshes': source['refreshes'],
+                        'skipped_slots': source['skipped_slots'],
+                        'last_error': source['last_error']
+                    }
+                    for name, source in self.sources.items()
+                }
+            }
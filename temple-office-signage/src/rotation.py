@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+
+# Dashboard rotation config
+# The one list of dashboards the kiosk cycles through: order, seconds on
+# screen and whether each is enabled. It lives in a JSON file so it can be
+# edited (or POSTed to /api/rotation) while the browser keeps running.
+
+import json
+import os
+import threading
+
+# sources: the data each dashboard shows, refreshed ahead of its slot
+DEFAULT_DASHBOARDS = [
+    {'id': 'cfss', 'name': 'CFSS Dashboard', 'path': '/cfss', 'duration': 90, 'enabled': True, 'sources': []},
+    {'id': 'calendar3', 'name': '3-Month Calendar', 'path': '/calendar3', 'duration': 45, 'enabled': True,
+     'sources': ['calendar']},
+    {'id': 'weather', 'name': 'Temple Weather', 'path': '/weather', 'duration': 45, 'enabled': True,
+     'sources': ['weather']},
+]
+DEFAULT_SOURCES = {dashboard['path']: dashboard['sources'] for dashboard in DEFAULT_DASHBOARDS}
+
+
+def validate_dashboards(data):
+    """Normalized dashboard list from a config document; ValueError if it's unusable"""
+    if isinstance(data, dict):
+        data = data.get('dashboards')
+    if not isinstance(data, list) or not data:
+        raise ValueError("expected a non-empty list of dashboards")
+    dashboards = []
+    for entry in data:
+        if not isinstance(entry, dict):
+            raise ValueError(f"dashboard entry must be an object: {entry!r}")
+        path = entry.get('path')
+        if not isinstance(path, str) or not path.startswith('/'):
+            raise ValueError(f"dashboard path must start with '/': {path!r}")
+        duration = entry.get('duration')
+        if isinstance(duration, bool) or not isinstance(duration, (int, float)) or duration <= 0:
+            raise ValueError(f"{path}: duration must be a positive number of seconds")
+        dashboard_id = str(entry.get('id') or path.strip('/') or 'home')
+        # Entries without a sources list keep the built-in ones for their page
+        sources = entry.get('sources', DEFAULT_SOURCES.get(path, []))
+        if not isinstance(sources, list) or not all(isinstance(source, str) for source in sources):
+            raise ValueError(f"{path}: sources must be a list of names")
+        dashboards.append({
+            'id': dashboard_id,
+            'name': str(entry.get('name') or dashboard_id),
+            'path': path,
+            'duration': duration,
+            'enabled': bool(entry.get('enabled', True)),
+            'sources': list(sources)
+        })
+    if len({dashboard['id'] for dashboard in dashboards}) != len(dashboards):
+        raise ValueError("dashboard ids must be unique")
+    if not any(dashboard['enabled'] for dashboard in dashboards):
+        raise ValueError("at least one dashboard must be enabled")
+    return dashboards
+
+
+class RotationConfig:
+    """Dashboards in rotation order, loaded from (and saved to) a JSON file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.dashboards = validate_dashboards(DEFAULT_DASHBOARDS)
+        self._mtime = None
+        self._lock = threading.Lock()
+        self.reload()
+
+    def reload(self):
+        """Re-read the file if it changed on disk. Returns True if it was loaded"""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return False  # No file - keep what we have (the defaults at startup)
+        with self._lock:
+            if mtime == self._mtime:
+                return False
+            self._mtime = mtime
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.dashboards = validate_dashboards(json.load(f))
+            except (OSError, ValueError) as e:
+                print(f"Rotation config {self.path} ignored: {e}")
+                return False
+        print(f"Rotation config loaded: {', '.join(d['id'] for d in self.enabled())}")
+        return True
+
+    def update(self, data):
+        """Replace the rotation and save it, so a restart keeps the change"""
+        dashboards = validate_dashboards(data)
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'dashboards': dashboards}, f, indent=2)
+            os.replace(temp_path, self.path)
+            self._mtime = os.stat(self.path).st_mtime_ns
+            self.dashboards = dashboards
+
+    def enabled(self):
+        return [dashboard for dashboard in self.dashboards if dashboard['enabled']]
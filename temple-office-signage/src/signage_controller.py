@@ -16,7 +16,10 @@ import random
 import traceback
 import sys
 from datetime import datetime, timedelta
-from flask import Flask, render_template_string, render_template, jsonify, request
+from flask import Flask, Response, render_template_string, render_template, stream_template, stream_with_context, jsonify, request, make_response, abort, send_from_directory
+from jinja2 import FileSystemBytecodeCache
+import functools
+import tempfile
 import threading
 import pytz
 import requests
@@ -29,17 +32,55 @@ sys.stderr.reconfigure(line_buffering=True)
 from temple_weather import TempleWeather, get_weather_emoji
 # Google Calendar integration
 from google_calendar import GoogleCalendarAPI
+from calendar_events import CalendarEvent, DayIndex, EventIndex, merge_events
+from calendar_windows import FetchWindowPlanner, month_span
+from calendar_polling import CalendarPollPolicy
+from calendar_layout import SpanLayoutCache, month_weeks
+from ics_calendar import ICSCalendarSource
+from calendar_watch import CalendarWatchManager
+from data_versions import DataVersions
+from page_cache import PageCache
+from event_stream import EventBroker
+from rotation import RotationConfig
+from refresh_planner import RefreshPlanner
+from static_assets import StaticAssets
 
-app = Flask(__name__, template_folder='../templates')
+app = Flask(__name__, template_folder='../templates', static_folder='../static')
+
+# Dashboard pages are Jinja templates (autoescaped). Compiled templates are kept
+# on disk so a restart doesn't compile them again, and all of them are loaded
+# once at startup so no request pays the compile cost.
+TEMPLATE_CACHE_DIR = os.getenv('TEMPLATE_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'signage-templates'))
+os.makedirs(TEMPLATE_CACHE_DIR, exist_ok=True)
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache(TEMPLATE_CACHE_DIR)
+
+def precompile_templates():
+    started = time.monotonic()
+    names = app.jinja_env.list_templates(extensions=['html'])
+    for name in names:
+        app.jinja_env.get_template(name)
+    print(f"Loaded {len(names)} templates in {(time.monotonic() - started) * 1000:.1f}ms")
+
+precompile_templates()
+
+# Page CSS/JS lives in static/ and is linked by content hash, so Chromium keeps
+# the parsed files across rotations instead of re-parsing inline blocks
+ASSET_MAX_AGE = 365 * 24 * 3600
+static_assets = StaticAssets(app.static_folder)
+app.jinja_env.globals['asset_url'] = static_assets.url
+
+# Uploaded CFSS dashboard served on /cfss
+CFSS_DASHBOARD_PATH = '/home/pi/RCcode/dashboards/dashboard.html'
+
+# Dashboard order, durations and enabled flags (defaults apply until the file exists)
+ROTATION_CONFIG_PATH = os.getenv('ROTATION_CONFIG', os.path.join(
+    os.path.expanduser('~'), '.local', 'share', 'temple-office-signage', 'rotation.json'))
 
 class DigitalSignage:
     def __init__(self):
         self.current_dashboard = 0
-        self.dashboards = [
-            {"name": "CFSS Dashboard", "url": "http://localhost:8080/cfss", "duration": 90},
-            {"name": "3-Month Calendar", "url": "http://localhost:8080/calendar3", "duration": 45},
-            {"name": "Temple Weather", "url": "http://localhost:8080/weather", "duration": 45},
-        ]
+        # The kiosk page follows this through /api/rotation
+        self.rotation = RotationConfig(ROTATION_CONFIG_PATH)
         # Set TV on by default during business hours
         current_time = datetime.now().time()
         business_start = datetime.strptime("07:00", "%H:%M").time()
@@ -60,6 +101,13 @@ class DigitalSignage:
         self.weather_data = None
         self.forecast_data = None
         self.lightning_data = None
+        # Version numbers that only move when a source's content changes
+        self.data_versions = DataVersions()
+        # Dashboard pages rendered when their data changes, served from memory
+        self.page_cache = PageCache()
+        # Change messages pushed to the kiosk pages over /events
+        self.events = EventBroker()
+        self.data_versions.publish('rotation', self.rotation.dashboards)
         
         # 2310 Eberhardt Rd, Temple, Texas coordinates for lightning detection
         self.temple_lat = 31.0847
@@ -77,92 +125,256 @@ class DigitalSignage:
         self.sharepoint_path = "/home/pi/sharepoint-sync"
         
         # Google Calendar setup
+        calendar_init_started = time.monotonic()
         try:
             print("Initializing Google Calendar...")
             self.calendar = GoogleCalendarAPI(
                 credentials_file='/home/pi/RCcode/temple-office-signage/credentials.json',
-                token_file='/home/pi/RCcode/temple-office-signage/token.json'
+                token_file='/home/pi/RCcode/temple-office-signage/token.json',
+                # Set CALENDAR_EXPAND_RECURRING=1 to expand recurring events locally
+                expand_recurring=os.getenv('CALENDAR_EXPAND_RECURRING', '').lower() in ('1', 'true', 'yes')
             )
             print("Google Calendar initialized successfully")
         except Exception as e:
             print(f"Error initializing Google Calendar: {e}")
             self.calendar = None
         self.calendar_events = None
+        # One calendar fetch-and-publish at a time (polling, push syncs and web requests)
+        self.calendar_lock = threading.RLock()
+        self.calendar_timezone = pytz.timezone('America/Chicago')
+        self.calendar_index = EventIndex([], self.calendar_timezone)
+        # (version, events, DayIndex) - the calendar views read all three from one snapshot
+        self.calendar_snapshot = (0, [], DayIndex([]))
+        self.calendar_layouts = SpanLayoutCache()
+        
+        # Each calendar view declares the dates it shows; we sync exactly their union
+        self.calendar_planner = FetchWindowPlanner(self.calendar_timezone)
+        self.calendar_planner.register('calendar3', lambda today: [month_span(today, 3)])
+        self.calendar_planner.register('sharepoint', lambda today: [month_span(today, 1)])
+        
+        # Optional iCalendar feeds (comma-separated file paths or URLs) shown
+        # alongside Google Calendar - and instead of it when Google is unavailable
+        ics_feeds = [feed.strip() for feed in os.getenv('CALENDAR_ICS_FEEDS', '').split(',') if feed.strip()]
+        self.ics_calendar = ICSCalendarSource(ics_feeds, self.calendar_timezone) if ics_feeds else None
+        
+        # Optional push notifications: set CALENDAR_WEBHOOK_URL to the public https URL
+        # of /api/calendar/notify, or to 'local' to test with calendar_webhook_standin.py
+        self.calendar_webhook_url = os.getenv('CALENDAR_WEBHOOK_URL')
+        self.calendar_watch = None
+        if self.calendar and self.calendar_webhook_url:
+            self.calendar_watch = CalendarWatchManager(
+                self.calendar, self.calendar_webhook_url, self.sync_changed_calendar)
+            print(f"Calendar push notifications enabled ({self.calendar_webhook_url})")
+        # Poll often in the run-up to meetings and during business hours, back off
+        # nights and weekends. With push notifications on, polling is only a safety net
+        if self.calendar_watch:
+            self.calendar_poll_policy = CalendarPollPolicy(
+                self.calendar_timezone, self.business_hours, business_minutes=60,
+                imminent_minutes=15, after_hours_minutes=120, weekend_minutes=240)
+        else:
+            self.calendar_poll_policy = CalendarPollPolicy(self.calendar_timezone, self.business_hours)
+        self.calendar_poll_minutes = None
+        self.calendar_poll_reason = None
+        
+        # Refresh each source just before the rotation shows it, within its freshness SLO
+        # (the same intervals the fixed timers use: 1 or 10 min weather, adaptive calendar)
+        self.refresh_planner = RefreshPlanner(self.rotation, self.data_versions)
+        self.refresh_planner.add_source('weather', self.update_weather_data_with_dynamic_frequency,
+                                        lambda: self.get_update_frequency() * 60)
+        self.refresh_planner.add_source('calendar', self.update_calendar_data_with_adaptive_frequency,
+                                        lambda: (self.calendar_poll_minutes or 15) * 60)
+        
+        self.calendar_startup = {'init_ms': round((time.monotonic() - calendar_init_started) * 1000, 1)}
         
         # Update weather data every 10 minutes
         self.update_weather_data()
+        self.check_lightning()
+        first_sync_started = time.monotonic()
         self.update_calendar_data()
+        self.calendar_startup['first_sync_ms'] = round((time.monotonic() - first_sync_started) * 1000, 1)
+        self.calendar_poll_minutes, self.calendar_poll_reason = self.calendar_poll_policy.interval(self.calendar_index)
+        print(f"Calendar subsystem startup: {self.calendar_startup}")
         
     def update_weather_data(self):
-        """Update weather data from API"""
+        """Update weather data from API (lightning is checked separately, see check_lightning)"""
+        versions = {'weather': self.data_versions.version('weather')}
         if self.weather:
             try:
-                self.weather_data = self.weather.get_current_weather()
-                self.forecast_data = self.weather.get_forecast(4)
-                
-                # Get lightning data
-                self.lightning_data = self.get_lightning_data()
-                
+                self.publish_weather(self.weather.get_current_weather(), self.weather.get_forecast(4))
                 print(f"Weather updated: {self.weather_data['temperature']}°F")
-                if self.lightning_data and self.lightning_data.get('status') != 'clear':
-                    print(f"Lightning status: {self.lightning_data.get('status')}")
             except Exception as e:
                 print(f"Weather update failed: {e}")
-                self.weather_data = self.weather.get_fallback_weather()
-                self.forecast_data = self.weather.get_fallback_forecast()
-                self.lightning_data = None
+                self.publish_weather(self.weather.get_fallback_weather(), self.weather.get_fallback_forecast())
         else:
             # Use fallback data if no API key
-            self.weather_data = {
+            self.publish_weather({
                 'temperature': 75, 'feels_like': 78, 'humidity': 60,
                 'description': 'Partly Cloudy', 'icon': '02d',
                 'wind_speed': 8, 'pressure': 1013, 'visibility': 10, 'uv_index': 6
-            }
-            self.forecast_data = [
+            }, [
                 {'date': 'Tomorrow', 'high': 78, 'low': 65, 'description': 'Sunny', 'icon': '01d'},
                 {'date': 'Wed', 'high': 82, 'low': 68, 'description': 'Partly Cloudy', 'icon': '02d'},
                 {'date': 'Thu', 'high': 75, 'low': 62, 'description': 'Rain', 'icon': '09d'},
                 {'date': 'Fri', 'high': 79, 'low': 66, 'description': 'Cloudy', 'icon': '03d'}
-            ]
-            self.lightning_data = None
+            ])
+        self.page_cache.refresh()
+        self.announce_changes(versions)
+    
+    def check_lightning(self):
+        """Strike detection and the 30-minute safety countdown. Runs every minute on its
+        own job - a safety check, so the rotation planner never skips or delays it"""
+        versions = {'lightning': self.data_versions.version('lightning')}
+        if self.weather:
+            try:
+                self.publish_lightning(self.get_lightning_data())
+                if self.lightning_data and self.lightning_data.get('status') != 'clear':
+                    print(f"Lightning status: {self.lightning_data.get('status')}")
+            except Exception as e:
+                print(f"Lightning check failed: {e}")
+                self.publish_lightning(None)
+        else:
+            self.publish_lightning(None)
+        self.page_cache.refresh()
+        self.announce_changes(versions)
+    
+    def announce_changes(self, versions):
+        """Tell the kiosk pages about every source whose version moved since `versions`"""
+        for source, version in versions.items():
+            current = self.data_versions.version(source)
+            if current != version:
+                self.events.publish(source, {'version': current})
+    
+    def publish_weather(self, weather_data, forecast_data):
+        """Swap in new weather data only if its content changed"""
+        def swap(version):
+            self.weather_data = weather_data
+            self.forecast_data = forecast_data
+        self.data_versions.publish('weather', {'current': weather_data, 'forecast': forecast_data}, swap)
+    
+    def publish_lightning(self, lightning_data):
+        """Swap in new lightning data; the version only moves if its content changed"""
+        # The countdown ticks every minute after a strike without anything new happening,
+        # so it stays out of the version (the page re-renders each minute while it runs)
+        settled = lightning_data
+        if lightning_data:
+            settled = {key: value for key, value in lightning_data.items() if key not in ('safety_timer', 'message')}
+            settled['safety_status'] = lightning_data.get('safety_timer', {}).get('status')
+        
+        def swap(version):
+            self.lightning_data = lightning_data
+        if not self.data_versions.publish('lightning', settled, swap) and lightning_data:
+            # Same content - keep the latest check time and countdown
+            self.lightning_data = lightning_data
     
     def update_calendar_data(self):
         """Update calendar events from Google Calendar"""
-        print("Updating calendar data...")
-        if self.calendar is None:
-            print("Calendar is None - using fallback events")
-            # Fallback events when calendar is not set up yet
-            self.calendar_events = [
-                {
-                    'title': 'Google Calendar Not Available',
-                    'time': 'Error',
-                    'duration': 'Check configuration',
-                    'description': 'Google Calendar integration not initialized',
-                    'location': 'Temple Office',
-                    'is_today': True
-                }
-            ]
-            return
+        with self.calendar_lock:
+            print("Updating calendar data...")
+            windows = self.calendar_planner.windows()
+            ics_events = self.get_ics_events(windows)
+            if self.calendar is None:
+                if ics_events:
+                    print(f"Calendar is None - showing {len(ics_events)} iCalendar feed events")
+                    self.set_calendar_events(ics_events)
+                    return
+                print("Calendar is None - using fallback events")
+                # Fallback events when calendar is not set up yet
+                self.set_calendar_events([
+                    CalendarEvent.notice(
+                        'Google Calendar Not Available',
+                        description='Google Calendar integration not initialized',
+                        location='Temple Office',
+                        time_label='Error',
+                        duration_label='Check configuration'
+                    )
+                ])
+                return
             
+            try:
+                print("Calling calendar.get_events...")
+                self.set_calendar_events(self.combine_calendar_sources(
+                    self.calendar.get_events(windows), ics_events))
+                print(f"Calendar updated: {len(self.calendar_events)} events loaded")
+                if self.calendar_events:
+                    print(f"First event: {self.calendar_events[0].title}")
+                if self.calendar_watch:
+                    self.calendar_watch.ensure_channels([cal['id'] for cal in self.calendar.calendars])
+            except Exception as e:
+                print(f"Calendar update failed: {e}")
+                # Show error message instead of fallback events
+                self.set_calendar_events(self.combine_calendar_sources([
+                    CalendarEvent.notice(
+                        'Real Calendar Error',
+                        description=f'Google Calendar API connection failed: {str(e)}',
+                        location='richard.coleman@iescomm.com',
+                        time_label='Error',
+                        duration_label='Check connection'
+                    )
+                ], ics_events))
+    
+    def get_ics_events(self, windows):
+        """Events from the iCalendar feeds (unchanged feeds aren't re-read)"""
+        if not self.ics_calendar:
+            return []
         try:
-            print("Calling calendar.get_upcoming_events...")
-            self.calendar_events = self.calendar.get_upcoming_events(max_results=8, days_ahead=90)
-            print(f"Calendar updated: {len(self.calendar_events)} events loaded")
-            if self.calendar_events:
-                print(f"First event: {self.calendar_events[0]['title']}")
+            return self.ics_calendar.get_events(windows)
         except Exception as e:
-            print(f"Calendar update failed: {e}")
-            # Show error message instead of fallback events
-            self.calendar_events = [
-                {
-                    'title': 'Real Calendar Error',
-                    'time': 'Error',
-                    'duration': 'Check connection',
-                    'description': f'Google Calendar API connection failed: {str(e)}',
-                    'location': 'richard.coleman@iescomm.com',
-                    'is_today': True
-                }
-            ]
+            print(f"iCalendar feed update failed: {e}")
+            return []
+    
+    def combine_calendar_sources(self, google_events, ics_events):
+        """Google events plus feed events; Google's notices only show if neither has events"""
+        if not ics_events:
+            return google_events
+        # On duplicates the Google copy wins
+        return merge_events([(0, [event for event in google_events if event.dated]), (1, ics_events)])
+    
+    def set_calendar_events(self, events):
+        """Publish a new event list along with the indexes the calendar views query"""
+        # Date -> events for the month grids covers the dates the views show, which
+        # move at month rollover even when the events don't - so they're part of the version
+        date_ranges = self.calendar_planner.date_ranges()
+        first_day, last_day = date_ranges[0][0], date_ranges[-1][1]
+        with self.calendar_lock:
+            digest = self.data_versions.changed('calendar', {'events': events, 'days': [first_day, last_day]})
+            if digest is None:
+                return  # Nothing changed - keep the current list and indexes
+            # Build first, then swap everything in before the version moves, so a
+            # request never renders the new version from the old indexes
+            event_index = EventIndex(events, self.calendar_timezone)
+            day_index = DayIndex(events, first_day, last_day)
+            
+            def swap(version):
+                self.calendar_index = event_index
+                self.calendar_events = events
+                self.calendar_snapshot = (version, events, day_index)
+            version = self.data_versions.commit('calendar', digest, swap)
+        self.page_cache.refresh()
+        self.events.publish('calendar', {'version': version})
+    
+    def check_calendar_window(self):
+        """Refetch as soon as the views show dates the last sync didn't cover (month rollover).
+        Not left to polling - that can be hours away, or off while the rotation skips the calendar"""
+        date_ranges = self.calendar_planner.date_ranges()
+        day_index = self.calendar_snapshot[2]
+        if (day_index.first_day, day_index.last_day) != (date_ranges[0][0], date_ranges[-1][1]):
+            print(f"Calendar: displayed dates moved to {date_ranges[0][0]} - {date_ranges[-1][1]}, refreshing")
+            self.update_calendar_data()
+    
+    def sync_changed_calendar(self, calendar_id):
+        """Incremental sync of a single calendar after a push notification"""
+        with self.calendar_lock:
+            print(f"Calendar change notification - syncing {calendar_id}")
+            windows = self.calendar_planner.windows()
+            self.set_calendar_events(self.combine_calendar_sources(
+                self.calendar.get_events(windows, only_calendar=calendar_id), self.get_ics_events(windows)))
+            print(f"Calendar updated from push: {len(self.calendar_events)} events loaded")
+            self.adapt_calendar_polling()  # A meeting may have been added for the next hour
+    
+    def renew_calendar_channels(self):
+        """Renew push-notification channels before Google expires them"""
+        if self.calendar_watch:
+            self.calendar_watch.renew_expiring_channels()
     
     def get_lightning_data(self):
         """Get lightning strike data within 10 miles of Temple, Texas"""
@@ -385,7 +597,36 @@ class DigitalSignage:
         frequency = self.get_update_frequency()
         print(f"Rescheduling weather updates: every {frequency} minutes")
         
-        schedule.every(frequency).minutes.do(self.update_weather_data_with_dynamic_frequency).tag('weather-updates')
+        schedule.every(frequency).minutes.do(self.timer_refresh, 'weather').tag('weather-updates')
+
+    def timer_refresh(self, source):
+        """Fixed-interval refresh - skipped while the rotation planner covers the source,
+        or when no enabled dashboard shows it"""
+        if not self.refresh_planner.wants_timer(source):
+            return
+        if source == 'weather':
+            self.update_weather_data_with_dynamic_frequency()
+        else:
+            self.update_calendar_data_with_adaptive_frequency()
+
+    def update_calendar_data_with_adaptive_frequency(self):
+        """Update calendar data and reschedule based on upcoming events and the time of day"""
+        self.update_calendar_data()
+        self.adapt_calendar_polling()
+
+    def adapt_calendar_polling(self):
+        """Reschedule calendar updates if the polling policy wants a different interval"""
+        minutes, reason = self.calendar_poll_policy.interval(self.calendar_index)
+        self.calendar_poll_reason = reason
+        if minutes != self.calendar_poll_minutes:
+            print(f"Calendar polling: every {self.calendar_poll_minutes} -> {minutes} minutes ({reason})")
+            self.calendar_poll_minutes = minutes
+            self.reschedule_calendar_updates()
+
+    def reschedule_calendar_updates(self):
+        """Replace the calendar update job with one at the current interval"""
+        schedule.clear('calendar-updates')
+        schedule.every(self.calendar_poll_minutes).minutes.do(self.timer_refresh, 'calendar').tag('calendar-updates')
     
     def calculate_distance(self, lat1, lon1, lat2, lon2):
         """Calculate distance between two coordinates in miles"""
@@ -796,20 +1037,38 @@ class DigitalSignage:
         if not self.check_browser_health():
             print(f"{datetime.now()}: Browser health check failed - skipping dashboard switch")
         
-        dashboard = self.dashboards[self.current_dashboard]
+        dashboards = self.rotation.enabled()
+        dashboard = dashboards[self.current_dashboard % len(dashboards)]
         print(f"{datetime.now()}: Switching to {dashboard['name']}")
         
         # The browser now handles rotation automatically via JavaScript
         # No need for xdotool - the browser loads localhost:8080/ which rotates
         
-        self.current_dashboard = (self.current_dashboard + 1) % len(self.dashboards)
+        self.current_dashboard = (self.current_dashboard + 1) % len(dashboards)
         threading.Timer(dashboard['duration'], self.switch_dashboard).start()
+    
+    def rotation_manifest(self):
+        """The rotation as the kiosk page (and POST /api/rotation) sees it"""
+        return {
+            'version': self.data_versions.version('rotation'),
+            'dashboards': [dict(dashboard) for dashboard in self.rotation.dashboards]
+        }
+    
+    def publish_rotation(self):
+        """Version the rotation and push it to the kiosk if it changed"""
+        if self.data_versions.publish('rotation', self.rotation.dashboards):
+            self.events.publish('config', {'rotation': self.data_versions.version('rotation')})
+    
+    def check_rotation_config(self):
+        """Pick up edits to the rotation file"""
+        if self.rotation.reload():
+            self.publish_rotation()
 
     def start_business_day(self):
         """Start business day with browser monitoring"""
         print(f"{datetime.now()}: Starting business day")
         self.update_weather_data()  # Refresh weather at start of day
-        self.update_calendar_data()  # Refresh calendar at start of day
+        self.update_calendar_data_with_adaptive_frequency()  # Refresh calendar (and speed up polling) at start of day
         
         # Turn on TV
         self.turn_tv_on()
@@ -923,14 +1182,139 @@ schedule.every().thursday.at(signage.business_hours["end"]).do(signage.end_busin
 schedule.every().friday.at(signage.business_hours["end"]).do(signage.end_business_day)
 
 # Update weather with dynamic frequency based on lightning activity
-schedule.every(signage.update_frequency_normal).minutes.do(signage.update_weather_data_with_dynamic_frequency).tag('weather-updates')
+schedule.every(signage.update_frequency_normal).minutes.do(signage.timer_refresh, 'weather').tag('weather-updates')
+# Lightning is checked every minute whatever the rotation shows (not a timer_refresh)
+schedule.every(1).minutes.do(signage.check_lightning).tag('lightning-checks')
+
+# Re-render pages whose clock ticked over or whose max age ran out before anyone
+# asks for them, so requests get the cached copy (with its ETag) rather than a streamed render
+schedule.every(1).minutes.do(signage.page_cache.refresh).tag('page-cache')
+
+# Watch the rotation file so edits reach the kiosk without a browser restart
+schedule.every(1).minutes.do(signage.check_rotation_config).tag('rotation-config')
 
-# Update calendar every 15 minutes
-schedule.every(15).minutes.do(signage.update_calendar_data)
+# Resync at month rollover, when the views start showing dates outside the last sync
+schedule.every(1).minutes.do(signage.check_calendar_window).tag('calendar-window')
+
+# Update calendar at an interval that adapts to upcoming events, business hours and weekends
+signage.reschedule_calendar_updates()
+if signage.calendar_watch:
+    schedule.every(30).minutes.do(signage.renew_calendar_channels).tag('calendar-watch')
 
 # Start the background scheduler
 run_pending_jobs()
 
+def today_key():
+    """Clock part of the ETag for pages that only change at midnight"""
+    return datetime.now().strftime('%Y%m%d')
+
+def weather_clock_key():
+    """The weather page's news rotates hourly and strike ages count in minutes"""
+    if signage.lightning_data and signage.lightning_data.get('strikes'):
+        return datetime.now().strftime('%Y%m%dT%H%M')
+    return datetime.now().strftime('%Y%m%dT%H')
+
+def weather_version():
+    """Version of everything the weather page shows (its data plus its clock)"""
+    return signage.data_versions.etag(('weather', 'lightning'), weather_clock_key())
+
+def published_label(source, date_format):
+    """When a source's data last changed, for "Updated:" lines. Not the render time:
+    cached pages re-render on a timer, and unchanged data should give identical bytes"""
+    published = signage.data_versions.published(source)
+    return published.strftime(date_format) if published else 'Unknown'
+
+def cfss_file_key():
+    """The CFSS page changes when the uploaded dashboard file does"""
+    try:
+        return str(os.stat(CFSS_DASHBOARD_PATH).st_mtime_ns)
+    except OSError:
+        return 'sample'
+
+def cached_page_response(page):
+    """Serve a page cache entry in the best encoding the client accepts, or a 304"""
+    encoding = page.pick_encoding(request.accept_encodings)
+    etag = page.etag_for(encoding)
+    if request.if_none_match.contains_weak(etag):
+        response = make_response('', 304)
+    else:
+        response = make_response(page.variants[encoding])
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+    response.set_etag(etag)
+    response.vary.add('Accept-Encoding')
+    response.cache_control.no_cache = True
+    return response
+
+def versioned(*sources, clock=today_key, cache_seconds=None):
+    """Tag a view's response with an ETag from the data versions it renders.
+    
+    A client that already has the current version gets a 304 and the view
+    doesn't run at all. With cache_seconds the page is kept in the page
+    cache: rendered once per version (at most cache_seconds old) and
+    served from memory, precompressed, under a strong ETag. A request that
+    finds the page stale is streamed the render as it's produced.
+    """
+    def decorator(view):
+        if cache_seconds is not None:
+            def render():
+                # Pages are also rendered from the scheduler thread, outside any request.
+                # Streamed templates render as they're read, so the context stays up until the end
+                with app.app_context():
+                    body = view()
+                    if isinstance(body, str):
+                        yield body
+                    else:
+                        yield from body
+            signage.page_cache.register(
+                view.__name__, render, lambda: signage.data_versions.etag(sources, clock()), cache_seconds)
+        
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if cache_seconds is not None:
+                chunks = signage.page_cache.stream(view.__name__) if request.method == 'GET' else None
+                if chunks is None:
+                    return cached_page_response(signage.page_cache.get(view.__name__))
+                # Stale - send the page while it renders; the next request gets the cached one with its ETag
+                response = Response(stream_with_context(chunks), mimetype='text/html')
+                response.cache_control.no_cache = True
+                return response
+            etag = signage.data_versions.etag(sources, clock())
+            if request.if_none_match.contains_weak(etag):
+                response = make_response('', 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+            # Weak - timestamps inside the page may differ between renders
+            response.set_etag(etag, weak=True)
+            response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
+
+@app.route('/api/versions')
+def api_versions():
+    """Current data versions - poll this to see whether anything changed"""
+    return jsonify(signage.data_versions.get_status())
+
+@app.route('/events')
+def event_stream():
+    """Server-Sent Events: a message per data change, heartbeats while idle"""
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('lastEventId')
+    response = Response(signage.events.stream(last_event_id), mimetype='text/event-stream')
+    response.cache_control.no_cache = True
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@app.route('/api/debug/events')
+def debug_events():
+    """Connected event streams and the last message id"""
+    return jsonify(signage.events.get_status())
+
+@app.route('/api/debug/pages')
+def debug_pages():
+    """Page cache entries: size, age, renders and hits"""
+    return jsonify(signage.page_cache.get_status())
+
 @app.route('/api/debug/schedule')
 def debug_schedule():
     """Debug endpoint to see scheduled jobs"""
@@ -946,7 +1330,13 @@ def debug_schedule():
     return {
         'current_time': datetime.now().isoformat(),
         'jobs': jobs,
-        'total_jobs': len(schedule.jobs)
+        'total_jobs': len(schedule.jobs),
+        'calendar_polling': {
+            'interval_minutes': signage.calendar_poll_minutes,
+            'reason': signage.calendar_poll_reason,
+            'policy': signage.calendar_poll_policy.get_status()
+        },
+        'refresh_planner': signage.refresh_planner.get_status()
     }
 
 @app.route('/api/debug/start-business-day')
@@ -985,372 +1375,86 @@ def debug_tv_on():
     except Exception as e:
         return {'status': 'error', 'message': str(e)}
 
+@app.route('/assets/<path:hashed_name>')
+def static_asset(hashed_name):
+    """Fingerprinted static file - its URL changes with its contents, so it never needs revalidating"""
+    filename = static_assets.resolve(hashed_name)
+    if filename is None:
+        abort(404)
+    response = send_from_directory(app.static_folder, filename, max_age=ASSET_MAX_AGE)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
 @app.route('/')
 def home():
     """Main rotating dashboard page"""
-    return '''<!DOCTYPE html>
-<html>
-<head>
-    <title>Temple Office Digital Signage</title>
-    <meta charset="UTF-8">
-    <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        html, body { 
-            width: 100%; height: 100%; overflow: hidden; 
-            font-family: Arial; background: #000;
-        }
-        /* Hide all scrollbars */
-        ::-webkit-scrollbar { display: none; }
-        * { -ms-overflow-style: none; scrollbar-width: none; }
-        
-        #dashboard-container { 
-            width: 100vw; height: 100vh; 
-            position: relative; overflow: hidden;
-        }
-        
-        .dashboard-content { 
-            width: 100%; height: 100%; 
-            position: absolute; top: 0; left: 0;
-            opacity: 0; transition: opacity 1s ease-in-out;
-        }
-        
-        .dashboard-content.active { opacity: 1; }
-        
-        #status { 
-            position: fixed; top: 10px; right: 10px; 
-            background: rgba(0,0,0,0.8); color: white; 
-            padding: 8px 12px; border-radius: 5px; 
-            font-size: 12px; z-index: 1000;
-            display: none;
-        }
-    </style>
-</head>
-<body>
-    <div id="status">Loading...</div>
-    <div id="dashboard-container"></div>
-    
-    <script>
-        const dashboards = [
-            { url: '/cfss', name: 'CFSS Dashboard', duration: 90000 },
-            { url: '/calendar3', name: '3-Month Calendar', duration: 45000 },
-            { url: '/weather', name: 'Temple Weather', duration: 45000 }
-        ];
-        
-        let currentIndex = 0;
-        const container = document.getElementById('dashboard-container');
-        const status = document.getElementById('status');
-        
-        function loadDashboard(url, callback) {
-            fetch(url)
-                .then(response => response.text())
-                .then(html => {
-                    // Remove existing content
-                    container.innerHTML = '';
-                    
-                    // Create new content div
-                    const contentDiv = document.createElement('div');
-                    contentDiv.className = 'dashboard-content active';
-                    contentDiv.innerHTML = html;
-                    container.appendChild(contentDiv);
-                    
-                    if (callback) callback();
-                })
-                .catch(error => {
-                    console.error('Error loading dashboard:', error);
-                    if (callback) callback();
-                });
-        }
-        
-        function switchToDashboard() {
-            const dashboard = dashboards[currentIndex];
-            status.textContent = dashboard.name;
-            status.style.display = 'block';
-            
-            loadDashboard(dashboard.url, () => {
-                setTimeout(() => {
-                    status.style.display = 'none';
-                }, 3000);
-            });
-            
-            currentIndex = (currentIndex + 1) % dashboards.length;
-            setTimeout(switchToDashboard, dashboard.duration);
-        }
-        
-        // Start immediately
-        switchToDashboard();
-        
-        // Debug: Show rotation in console
-        console.log('Dashboard rotation started');
-    </script>
-</body>
-</html>'''
+    return render_template('home.html', rotation=signage.rotation_manifest())
+
+@app.route('/api/rotation')
+@versioned('rotation')
+def api_rotation():
+    """Dashboards in rotation order with their durations (seconds) - the kiosk follows this"""
+    return jsonify(signage.rotation_manifest())
+
+@app.route('/api/rotation/showing', methods=['POST'])
+def api_rotation_showing():
+    """The rotation page reports each dashboard as it goes on screen"""
+    dashboard_id = (request.get_json(silent=True) or {}).get('id')
+    if not dashboard_id:
+        return jsonify({'status': 'error', 'message': 'dashboard id required'}), 400
+    signage.refresh_planner.dashboard_shown(dashboard_id)
+    return jsonify({'status': 'ok'})
+
+@app.route('/api/rotation', methods=['POST'])
+def api_rotation_update():
+    """Replace the rotation (order, durations, enabled) and push it to the kiosk"""
+    try:
+        signage.rotation.update(request.get_json(force=True, silent=True))
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    signage.publish_rotation()
+    return jsonify(signage.rotation_manifest())
 
 @app.route('/cfss')
+@versioned(clock=cfss_file_key, cache_seconds=300)
 def cfss_dashboard():
     """Serve the main CFSS dashboard from uploaded file or fallback to sample"""
-    dashboard_path = '/home/pi/RCcode/dashboards/dashboard.html'
-    
     # Try to read the uploaded dashboard file
     try:
-        with open(dashboard_path, 'r', encoding='utf-8') as f:
+        with open(CFSS_DASHBOARD_PATH, 'r', encoding='utf-8') as f:
             content = f.read()
         
         # Inject height fixes for ALL screen sizes, not just 4K
-        height_fix = '''
-        <style>
-        /* CFSS Dashboard Height Fix - Optimized spacing for better readability */
-        #dashboardContent {
-            min-height: 300vh !important; /* REDUCED excessive height */
-            padding-bottom: 500px !important; /* REDUCED excessive padding */
-            gap: 60px !important; /* REDUCED gaps for better content density */
-        }
-        
-        /* Make sections larger with better proportions for readability */
-        .dashboard-section {
-            padding: 50px 35px !important; /* REDUCED padding but still spacious */
-            margin-bottom: 80px !important; /* REDUCED spacing between sections */
-        }
-        
-        .summary, .stats, .circuits-container, .completed-circuits {
-            margin-bottom: 60px !important; /* REDUCED space but kept separation */
-            padding: 40px !important; /* ADD internal padding to grow content areas */
-        }
-        
-        /* Make circuit content areas JUST A BIT wider to prevent text overlap */
-        .circuits-container, .completed-circuits {
-            padding: 60px 45px !important; /* BIGGER content areas */
-            width: 96% !important; /* SLIGHTLY wider containers to prevent text overlap */
-            max-width: none !important; /* Remove any width restrictions */
-        }
-        
-        .circuits-container h3, .completed-circuits h3 {
-            font-size: 1.8em !important; /* BIGGER section headers */
-            margin-bottom: 30px !important;
-        }
-        
-        .circuit-item, .completed-item {
-            padding: 25px 35px !important; /* JUST A BIT wider individual circuit boxes */
-            margin: 20px 0 !important; /* More space between items */
-            line-height: 1.4 !important; /* Better line spacing */
-            width: 100% !important; /* Full width to prevent overlap */
-            box-sizing: border-box !important; /* Include padding in width */
-            overflow: hidden !important; /* Prevent text overflow */
-            word-wrap: break-word !important; /* Break long words */
-        }
-        
-        /* OPTIMIZED: 4K smooth CFSS auto-scroll - ALTERNATIVE METHOD */
-        .auto-scroll {
-            animation: autoScrollSmooth 40s infinite linear !important;
-            transform: translate3d(0, 0, 0);
-            will-change: transform;
-            backface-visibility: hidden;
-            filter: blur(0);
-            animation-fill-mode: both;
-            animation-timing-function: linear;
-        }
-        
-        @keyframes autoScrollSmooth {
-            0% { transform: translate3d(0, 0, 0); }
-            17.5% { transform: translate3d(0, 0, 0); }
-            47.5% { transform: translate3d(0, -140vh, 0); }
-            67.5% { transform: translate3d(0, -140vh, 0); }
-            100% { transform: translate3d(0, 0, 0); }
-        }
-        
-        /* Media queries - OPTIMIZED for better content density and readability */
-        @media screen and (max-width: 1920px) {
-            #dashboardContent {
-                min-height: 250vh !important; /* REDUCED for smaller screens */
-                padding-bottom: 350px !important; /* REDUCED padding */
-            }
-            .dashboard-section {
-            }
-            .circuit-item, .completed-item {
-                padding: 30px 40px !important; /* JUST A BIT wider for smaller screens */
-            }
-            @keyframes autoScroll {
-                0% { transform: translateY(0) translateZ(0); }
-                10% { transform: translateY(0) translateZ(0); }
-                45% { transform: translateY(-90vh) translateZ(0); } /* DEEPER scroll for smaller screens */
-                55% { transform: translateY(-90vh) translateZ(0); }
-                90% { transform: translateY(0) translateZ(0); }
-                100% { transform: translateY(0) translateZ(0); }
-            }
-        }
-        
-        @media screen and (min-width: 2560px) {
-            #dashboardContent {
-                min-height: 280vh !important; /* OPTIMIZED for 4K readability */
-                padding-bottom: 450px !important; /* BALANCED padding */
-            }
-            .dashboard-section {
-            }
-            .circuits-container, .completed-circuits {
-                width: 97% !important; /* SLIGHTLY wider for 4K */
-            }
-            .circuits-container h3, .completed-circuits h3 {
-                font-size: 2.2em !important; /* MUCH bigger headers for 4K */
-            }
-            .circuit-item, .completed-item {
-                padding: 35px 45px !important; /* JUST A BIT wider content boxes for 4K */
-                width: 99% !important; /* SLIGHTLY wider for 4K to prevent overlap */
-                max-width: none !important; /* Remove width restrictions */
-            }
-            @keyframes autoScrollSmooth {
-                0% { transform: translate3d(0, 0, 0); }
-                17.5% { transform: translate3d(0, 0, 0); }
-                47.5% { transform: translate3d(0, -110vh, 0); }
-                67.5% { transform: translate3d(0, -110vh, 0); }
-                100% { transform: translate3d(0, 0, 0); }
-            }
-            
-        }
-        </style>
-        '''
+        height_fix = render_template('cfss_height_fix.html')
         
         # Inject the style right before the closing </head> tag
         content = content.replace('</head>', height_fix + '</head>')
         return content
     except FileNotFoundError:
         # Fallback to sample dashboard if file doesn't exist
-        return '''<!DOCTYPE html>
-<html>
-<head>
-    <title>CFSS Circuit Monitor</title>
-    <meta http-equiv="refresh" content="25">
-    <style>
-        body { font-family: Arial; background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%); 
-               color: white; margin: 0; padding: 40px; min-height: 100vh; display: flex; flex-direction: column; }
-        .container { max-width: 4000px; margin: 0 auto; width: 95%; flex: 1; display: flex; flex-direction: column; min-height: calc(100vh - 80px); }
-        h1 { text-align: center; font-size: 12em; margin-bottom: 80px; text-shadow: 5px 5px 10px rgba(0,0,0,0.5); }
-        .metrics { display: flex; justify-content: space-around; flex-wrap: wrap; flex: 1; align-items: stretch; }
-        .metric { background: rgba(255,255,255,0.15); padding: 120px; border-radius: 40px; 
-                  text-align: center; min-width: 750px; margin: 60px; box-shadow: 0 30px 120px rgba(0,0,0,0.3); 
-                  display: flex; flex-direction: column; justify-content: center; min-height: 500px; }
-        .metric h2 { font-size: 7.5em; margin: 0; }
-        .metric p { font-size: 12em; margin: 40px 0; color: #4CAF50; font-weight: bold; }
-        .status-bar { background: rgba(0,0,0,0.3); padding: 80px; border-radius: 30px; margin-top: 80px; }
-        .status-bar h3 { font-size: 5em; margin-bottom: 40px; }
-        .status-bar p { font-size: 3.8em; margin: 20px 0; line-height: 1.4; }
-        .timestamp { text-align: center; margin-top: 80px; font-size: 4.2em; opacity: 0.8; }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>🚀 CFSS Circuit Monitoring</h1>
-        <div class="metrics">
-            <div class="metric">
-                <h2>Total Circuits</h2>
-                <p>17</p>
-            </div>
-            <div class="metric">
-                <h2>Active Now</h2>
-                <p>15</p>
-            </div>
-            <div class="metric">
-                <h2>System Health</h2>
-                <p style="color: #4CAF50;">GOOD</p>
-            </div>
-            <div class="metric">
-                <h2>Alerts</h2>
-                <p style="color: #FFC107;">2</p>
-            </div>
-        </div>
-        <div class="status-bar">
-            <h3>Recent Activity - Temple Office</h3>
-            <p>• Circuit BB-DR: Connection stable (99.8% uptime)</p>
-            <p>• Circuit CS-EB: Performance optimal (15ms latency)</p>
-            <p>• Circuit RSW-MA: Monitoring active (24/7)</p>
-        </div>
-        <div class="timestamp">
-            Last Updated: ''' + datetime.now().strftime('%Y-%m-%d %H:%M:%S') + '''<br>
-            Next: SharePoint Files
-        </div>
-    </div>
-</body>
-</html>'''
-
-def generate_month_calendar(events, year=None, month=None):
-    """Generate a monthly calendar grid with events"""
+        # The sample's own edit time - a render time would change the page (and its ETag) every render
+        sample_path = os.path.join(app.root_path, app.template_folder, 'cfss_sample.html')
+        updated = datetime.fromtimestamp(os.path.getmtime(sample_path))
+        return stream_template('cfss_sample.html', updated=updated.strftime('%Y-%m-%d %H:%M:%S'))
+
+def generate_month_calendar(day_index, year=None, month=None):
+    """Generate a monthly calendar grid with events from a DayIndex"""
     if year is None:
         year = datetime.now().year
     if month is None:
         month = datetime.now().month
     
-    # Create calendar matrix - SET SUNDAY AS FIRST DAY
-    calendar.setfirstweekday(calendar.SUNDAY)
-    cal = calendar.monthcalendar(year, month)
+    # Sunday-first calendar matrix (shared, thread-safe)
+    weeks = month_weeks(year, month)
     today = datetime.now().date()
     
-    # Group events by date - HANDLE MULTI-DAY EVENTS
-    events_by_date = {}
-    for event in events:
-        if not event:
-            continue
-            
-        start_date = None
-        end_date = None
-        
-        # Try to get start date from various fields
-        if 'date_obj' in event and event['date_obj']:
-            start_date = event['date_obj']
-        elif 'start_datetime' in event and event['start_datetime']:
-            # Parse the datetime string if needed
-            try:
-                if isinstance(event['start_datetime'], str):
-                    if 'T' in event['start_datetime']:
-                        dt = datetime.fromisoformat(event['start_datetime'].replace('Z', '+00:00'))
-                        start_date = dt.date()
-                    else:
-                        start_date = datetime.fromisoformat(event['start_datetime']).date()
-                else:
-                    start_date = event['start_datetime'].date()
-            except:
-                # Try to parse from 'date' field
-                date_str = event.get('date', '')
-                if date_str == 'Today':
-                    start_date = today
-                elif date_str == 'Tomorrow':
-                    start_date = today + timedelta(days=1)
-                else:
-                    # Try to parse other date formats
-                    try:
-                        # Format like 'Mon, Dec 30'
-                        start_date = datetime.strptime(f"{date_str} {year}", "%a, %b %d %Y").date()
-                    except:
-                        continue
-        
-        # Try to get end date
-        if 'end_datetime' in event and event['end_datetime']:
-            try:
-                if isinstance(event['end_datetime'], str):
-                    if 'T' in event['end_datetime']:
-                        dt = datetime.fromisoformat(event['end_datetime'].replace('Z', '+00:00'))
-                        end_date = dt.date()
-                    else:
-                        end_date = datetime.fromisoformat(event['end_datetime']).date()
-                else:
-                    end_date = event['end_datetime'].date()
-            except:
-                end_date = start_date  # Single day event
-        else:
-            end_date = start_date  # Single day event if no end date
-        
-        # Add event to all days it spans
-        if start_date and end_date:
-            current_date = start_date
-            while current_date <= end_date:
-                if current_date not in events_by_date:
-                    events_by_date[current_date] = []
-                events_by_date[current_date].append(event)
-                current_date += timedelta(days=1)
-    
     # Build calendar data structure
     calendar_data = []
-    for week in cal:
+    for week in weeks:
         week_data = []
-        for day in week:
-            if day == 0:
+        for current_date in week:
+            if current_date is None:
                 # Day from previous/next month
                 week_data.append({
                     'day': '',
@@ -1359,12 +1463,11 @@ def generate_month_calendar(events, year=None, month=None):
                     'events': []
                 })
             else:
-                current_date = datetime(year, month, day).date()
                 is_today = current_date == today
-                day_events = events_by_date.get(current_date, [])
+                day_events = day_index.on_day(current_date)  # Multi-day events on every day they span
                 
                 week_data.append({
-                    'day': day,
+                    'day': current_date.day,
                     'is_today': is_today,
                     'is_other_month': False,
                     'events': day_events
@@ -1373,1153 +1476,221 @@ def generate_month_calendar(events, year=None, month=None):
     
     return calendar_data
 
-@app.route('/sharepoint')
-def sharepoint_dashboard():
-    # Get calendar events for the full month
-    if not signage.calendar_events:
-        signage.update_calendar_data()
-    
-    events = signage.calendar_events if signage.calendar_events else []
-    
-    # Create a monthly calendar view
-    from datetime import datetime, timedelta
-    import calendar
-    
-    now = datetime.now()
-    year = now.year
-    month = now.month
+def sharepoint_view_model(snapshot, now):
+    """Month grid for the single-month calendar page (snapshot: see DigitalSignage.calendar_snapshot)"""
+    version, events, day_index = snapshot
+    # The month the index covers, which is the month on screen once a rollover's sync is in
+    shown = day_index.first_day or now.date()
+    year = shown.year
+    month = shown.month
     month_name = calendar.month_name[month]
     
     print(f"Calendar display: Processing {len(events)} events for {month_name} {year}")
     
     # Debug: Print all events and their dates
     for event in events:
-        print(f"Event: {event.get('title')} - Date: {event.get('date')} - Date obj: {event.get('date_obj')} - Start: {event.get('start_datetime')}")
-    
-    # Get first day of month and number of days
-    first_day = datetime(year, month, 1)
-    last_day = datetime(year, month, calendar.monthrange(year, month)[1])
-    start_day = first_day.weekday()  # 0=Monday, 6=Sunday
-    
-    # Adjust for Sunday start (0=Sunday, 6=Saturday)
-    start_day = (start_day + 1) % 7
-    
-    # Generate calendar grid
-    calendar_html = ""
-    week_html = ""
+        print(f"Event: {event.title} - Date: {event.date_label} - Start: {event.start}")
     
-    # Add empty cells for days before month starts
-    for i in range(start_day):
-        week_html += '<div class="calendar-day empty"></div>'
-    
-    # Add days of the month
-    for day in range(1, calendar.monthrange(year, month)[1] + 1):
-        current_date = datetime(year, month, day).date()
-        is_today = current_date == now.date()
-        
-        # Find events for this specific date using the date_obj field
-        day_events = []
-        for event in events:
-            if not event or not isinstance(event, dict):
+    weeks = []
+    for week in month_weeks(year, month):
+        cells = []
+        for current_date in week:
+            if current_date is None:
+                cells.append(None)  # Day from previous/next month
                 continue
-                
-            event_date = None
-            
-            # Try to get date from the date_obj field first (most reliable)
-            if 'date_obj' in event and event['date_obj']:
-                date_obj_value = event['date_obj']
-                if isinstance(date_obj_value, str):
-                    # Parse the string date
-                    event_date = datetime.fromisoformat(date_obj_value).date()
-                else:
-                    # Already a date object
-                    event_date = date_obj_value
             
-            # Fallback to parsing start_datetime
-            elif 'start_datetime' in event and event['start_datetime']:
-                try:
-                    start_dt_str = event['start_datetime']
-                    if 'T' in start_dt_str:
-                        # Parse datetime with timezone
-                        if start_dt_str.endswith('Z'):
-                            start_dt_str = start_dt_str.replace('Z', '+00:00')
-                        dt = datetime.fromisoformat(start_dt_str)
-                        event_date = dt.date()
-                    else:
-                        # All-day event - just date
-                        event_date = datetime.fromisoformat(start_dt_str).date()
-                except Exception as e:
-                    print(f"Failed to parse start_datetime for event '{event.get('title', 'Unknown')}': {e}")
-            
-            # Fallback to date string parsing
-            elif 'date' in event:
-                date_str = event.get('date', '')
-                if date_str == 'Today':
-                    event_date = now.date()
-                elif date_str == 'Tomorrow':
-                    event_date = now.date() + timedelta(days=1)
+            # Find events that start on this date
+            day_events = day_index.starting_on(current_date)
+            for event in day_events:
+                print(f"Added event '{event.title}' to date {current_date}")
+            
+            day_class = "calendar-day"
+            if current_date == now.date():
+                day_class += " today"
+            if day_events:
+                day_class += " has-events"
+            
+            cell_events = []
+            for event in day_events[:3]:  # Show max 3 events per day
+                title = event.title
+                time_str = event.time_label
+                
+                # Format the display with time if available
+                if time_str and time_str != 'All day':
+                    # Truncate title to make room for time
+                    display_title = title[:18] + ("..." if len(title) > 18 else "")
+                    display_text = f"{time_str} - {display_title}"
                 else:
-                    # Try to parse other date formats like 'Mon, Aug 5'
-                    try:
-                        # Add current year to parse properly
-                        event_date = datetime.strptime(f"{date_str} {year}", "%a, %b %d %Y").date()
-                    except:
-                        continue
-            
-            # If this event is on the current day, add it
-            if event_date == current_date:
-                day_events.append(event)
-                print(f"Added event '{event.get('title')}' to date {current_date}")
-        
-        # Create day cell
-        day_class = "calendar-day"
-        if is_today:
-            day_class += " today"
-        if day_events:
-            day_class += " has-events"
-        
-        events_html = ""
-        for event in day_events[:3]:  # Show max 3 events per day
-            title = event.get('title', 'Untitled')
-            time_str = event.get('time', '')
-            calendar_name = event.get('calendar_name', 'Unknown Calendar')
-            # Get calendar-specific colors
-            bg_color = event.get('calendar_bg_color', '#4285f4')
-            fg_color = event.get('calendar_fg_color', '#ffffff')
-            
-            # Format the display with time if available
-            if time_str and time_str != 'All day':
-                # Truncate title to make room for time
-                display_title = title[:18] + ("..." if len(title) > 18 else "")
-                display_text = f"{time_str} - {display_title}"
-            else:
-                # Truncate long titles but show enough to be useful
-                display_title = title[:25] + ("..." if len(title) > 25 else "")
-                display_text = display_title
-            
-            tooltip = f"{title} - {time_str} ({calendar_name})" if time_str else f"{title} ({calendar_name})"
-            events_html += f'<div class="day-event" style="background-color: {bg_color}; color: {fg_color};" title="{tooltip}">{display_text}</div>'
-        
-        # Add indicator if there are more than 3 events
-        if len(day_events) > 3:
-            events_html += f'<div class="day-event more">+{len(day_events) - 3} more</div>'
-        
-        week_html += f'''
-        <div class="{day_class}">
-            <div class="day-number">{day}</div>
-            <div class="day-events">{events_html}</div>
-        </div>'''
-        
-        # Start new week after Saturday
-        if (start_day + day - 1) % 7 == 6:
-            calendar_html += f'<div class="calendar-week">{week_html}</div>'
-            week_html = ""
-    
-    # Add remaining empty cells and close last week
-    if week_html:
-        remaining_days = 7 - ((start_day + calendar.monthrange(year, month)[1] - 1) % 7 + 1)
-        for i in range(remaining_days):
-            week_html += '<div class="calendar-day empty"></div>'
-        calendar_html += f'<div class="calendar-week">{week_html}</div>'
-    
-    # Create upcoming events sidebar - REMOVED for full-width calendar
-    
-    return f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Google Calendar - Temple Office</title>
-    <style>
-        html {{
-            background: #1f1f1f;
-            min-height: 100vh;
-            font-family: 'Google Sans', 'Roboto', Arial, sans-serif;
-        }}
-        
-        body {{
-            margin: 0;
-            padding: 20px;
-            background: #1f1f1f;
-            color: #e8eaed;
-            min-height: 100vh;
-        }}
-        
-        .calendar-header {{
-            text-align: center;
-            margin-bottom: 30px;
-            padding: 20px;
-        }}
-        
-        .calendar-header h1 {{
-            font-size: 12.0em;
-            margin: 0 0 30px 0;
-            color: #4285f4;
-            font-weight: 400;
-        }}
-        
-        .calendar-header h2 {{
-            font-size: 7.5em;
-            margin: 0;
-            color: #9aa0a6;
-            font-weight: 300;
-        }}
-        
-        .main-container {{
-            display: block;
-            max-width: 3800px;
-            margin: 0 auto;
-            height: calc(100vh - 250px);
-            padding: 0 60px;
-        }}
-        
-        .calendar-container {{
-            background: #202124;
-            border-radius: 25px;
-            padding: 75px;
-            border: 3px solid #3c4043;
-            width: 100%;
-            height: 100%;
-        }}
-        
-        .month-header {{
-            display: grid;
-            grid-template-columns: repeat(7, 1fr);
-            gap: 12px;
-            margin-bottom: 40px;
-        }}
-        
-        .weekday {{
-            text-align: center;
-            padding: 45px 15px;
-            font-weight: 500;
-            color: #9aa0a6;
-            font-size: 4.5em;
-            background: #28292c;
-            border-radius: 18px;
-        }}
-        
-        .calendar-grid {{
-            display: flex;
-            flex-direction: column;
-            gap: 15px;
-            height: calc(100% - 200px);
-        }}
-        
-        .calendar-week {{
-            display: grid;
-            grid-template-columns: repeat(7, 1fr);
-            gap: 15px;
-            flex: 1;
-        }}
-        
-        .calendar-day {{
-            background: #28292c;
-            border-radius: 20px;
-            padding: 60px 35px;
-            min-height: 520px;
-            position: relative;
-            border: 3px solid transparent;
-            transition: all 0.2s ease;
-        }}
-        
-        .calendar-day:hover {{
-            background: #2d2e30;
-            border-color: #4285f4;
-        }}
-        
-        .calendar-day.today {{
-            background: #1a73e8;
-            color: white;
-        }}
-        
-        .calendar-day.today .day-number {{
-            background: rgba(255,255,255,0.2);
-            border-radius: 50%;
-            width: 120px;
-            height: 120px;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            margin: 0 auto 36px auto;
-        }}
-        
-        .calendar-day.has-events {{
-            border-color: #34a853;
-        }}
-        
-        .calendar-day.empty {{
-            background: transparent;
-            pointer-events: none;
-        }}
-        
-        .day-number {{
-            font-size: 6.6em;
-            font-weight: 500;
-            margin-bottom: 36px;
-            text-align: center;
-        }}
-        
-        .day-events {{
-            display: flex;
-            flex-direction: column;
-            gap: 12px;
-        }}
-        
-        .day-event {{
-            background: #4285f4;
-            color: white;
-            padding: 18px 24px;
-            border-radius: 12px;
-            font-size: 3.0em;
-            overflow: hidden;
-            text-overflow: ellipsis;
-            white-space: nowrap;
-            line-height: 1.2;
-        }}
-        
-        .day-event.more {{
-            background: #34a853;
-            font-size: 1.5em;
-            font-style: italic;
-        }}
-        
-        .footer {{
-            text-align: center;
-            margin-top: 25px;
-            color: #5f6368;
-            font-size: 2.0em;
-            position: fixed;
-            bottom: 10px;
-            left: 0;
-            right: 0;
-        }}
-        
-        /* Media queries for responsive design */
-        @media screen and (max-width: 1920px) {{
-            .calendar-header h1 {{ font-size: 4.0em; }}
-            .calendar-header h2 {{ font-size: 2.5em; }}
-            .weekday {{ font-size: 1.6em; padding: 16px 5px; }}
-            .day-number {{ font-size: 2.0em; }}
-            .calendar-day {{ min-height: 130px; padding: 18px 10px; }}
-            .day-event {{ font-size: 1.0em; padding: 5px 7px; }}
-        }}
-        
-        @media screen and (max-width: 1440px) {{
-            .calendar-header h1 {{ font-size: 3.5em; }}
-            .calendar-header h2 {{ font-size: 2.2em; }}
-            .weekday {{ font-size: 1.4em; padding: 14px 5px; }}
-            .day-number {{ font-size: 1.8em; }}
-            .calendar-day {{ min-height: 120px; padding: 16px 8px; }}
-            .day-event {{ font-size: 0.95em; padding: 4px 6px; }}
-        }}
-        
-        @media screen and (max-width: 1080px) {{
-            .calendar-header h1 {{ font-size: 3.0em; }}
-            .calendar-header h2 {{ font-size: 2.0em; }}
-            .weekday {{ font-size: 1.2em; padding: 12px 5px; }}
-            .day-number {{ font-size: 1.6em; }}
-            .calendar-day {{ min-height: 100px; padding: 14px 6px; }}
-            .day-event {{ font-size: 0.9em; padding: 3px 5px; }}
-        }}
-        
-        @media screen and (min-width: 2560px) {{
-            .calendar-header h1 {{ font-size: 5.5em; }}
-            .calendar-header h2 {{ font-size: 3.2em; }}
-            .weekday {{ font-size: 2.2em; padding: 22px 5px; }}
-            .day-number {{ font-size: 2.6em; }}
-            .calendar-day {{ min-height: 160px; padding: 24px 14px; }}
-            .day-event {{ font-size: 2.8em; padding: 18px 20px; }} /* MUCH bigger day event text for TV readability */
-            .day-event.more {{ font-size: 2.4em; }} /* Bigger "more" indicator for TV */
-            .footer {{ font-size: 1.6em; }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="calendar-header">
-        <h1>📅 {month_name} {year}</h1>
-        <h2>Temple Office Calendar</h2>
-    </div>
-    
-    <div class="main-container">
-        <div class="calendar-container">
-            <div class="month-header">
-                <div class="weekday">Sun</div>
-                <div class="weekday">Mon</div>
-                <div class="weekday">Tue</div>
-                <div class="weekday">Wed</div>
-                <div class="weekday">Thu</div>
-                <div class="weekday">Fri</div>
-                <div class="weekday">Sat</div>
-            </div>
+                    # Truncate long titles but show enough to be useful
+                    display_text = title[:25] + ("..." if len(title) > 25 else "")
+                
+                cell_events.append({
+                    'text': display_text,
+                    'tooltip': f"{title} - {time_str} ({event.calendar_name})" if time_str else f"{title} ({event.calendar_name})",
+                    'bg_color': event.bg_color,
+                    'fg_color': event.fg_color
+                })
             
-            <div class="calendar-grid">
-                {calendar_html}
-            </div>
-        </div>
-    </div>
+            cells.append({
+                'day': current_date.day,
+                'classes': day_class,
+                'events': cell_events,
+                'more': max(len(day_events) - 3, 0)  # "+N more" indicator
+            })
+        weeks.append(cells)
     
-    <div class="footer">
-        📅 Connected to Google Calendar • Last synced: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} • {len(events)} events displayed • Next: Temple Weather
-    </div>
-</body>
-</html>'''
+    return {
+        'month_name': month_name,
+        'year': year,
+        'weeks': weeks,
+        'event_count': len(events),
+        'synced_at': published_label('calendar', '%Y-%m-%d %H:%M:%S')
+    }
 
-@app.route('/calendar3')
-def calendar3_dashboard():
-    """3-Month Auto-Scrolling Calendar View using Google Calendar data"""
-    # Get calendar events
+@app.route('/sharepoint')
+@versioned('calendar', cache_seconds=300)
+def sharepoint_dashboard():
+    # Get calendar events for the full month
     if not signage.calendar_events:
         signage.update_calendar_data()
     
-    events = signage.calendar_events if signage.calendar_events else []
-    
-    from datetime import datetime, timedelta
-    import calendar
-    
-    now = datetime.now()
-    current_month = now.month
-    current_year = now.year
+    return stream_template('sharepoint.html', **sharepoint_view_model(signage.calendar_snapshot, datetime.now()))
+
+def short_event_label(event):
+    """'09:30 - Title' for timed events, just the title otherwise"""
+    time_str = event.time_label
+    if time_str and time_str != 'All day':
+        return f"{time_str[:5]} - {event.title}"
+    return event.title
+
+def calendar3_view_model(snapshot, now):
+    """Three stacked month grids with their multi-day bars"""
+    version, events, day_index = snapshot
+    today = now.date()
+    # Months come from the indexed range, so a grid never shows a month the index doesn't cover
+    first_shown = day_index.first_day or today
     
     # Generate 3 months: current, next, and the month after
-    months_data = []
+    months = []
     for i in range(3):
-        month_date = datetime(current_year, current_month, 1) + timedelta(days=32*i)
+        month_date = datetime(first_shown.year, first_shown.month, 1) + timedelta(days=32*i)
         month_date = month_date.replace(day=1)  # First day of month
-        
         year = month_date.year
         month = month_date.month
-        month_name = calendar.month_name[month]
-        
-        # Generate calendar for this month - SET SUNDAY AS FIRST DAY
-        calendar.setfirstweekday(calendar.SUNDAY)
-        cal = calendar.monthcalendar(year, month)
-        today = now.date()
-        
-        # Group events by date - HANDLE MULTI-DAY EVENTS
-        month_events = {}
-        
-        for event in events:
-            if not event or not isinstance(event, dict):
-                continue
-                
-            start_date = None
-            end_date = None
-            event_title = event.get('title', 'Unknown Event')
-            
-            # Parse event start date
-            if 'date_obj' in event and event['date_obj']:
-                date_obj_value = event['date_obj']
-                if isinstance(date_obj_value, str):
-                    try:
-                        start_date = datetime.fromisoformat(date_obj_value).date()
-                    except:
-                        continue
-                else:
-                    start_date = date_obj_value
-            elif 'start_datetime' in event and event['start_datetime']:
-                try:
-                    start_dt_str = event['start_datetime']
-                    if 'T' in start_dt_str:
-                        if start_dt_str.endswith('Z'):
-                            start_dt_str = start_dt_str.replace('Z', '+00:00')
-                        dt = datetime.fromisoformat(start_dt_str)
-                        start_date = dt.date()
-                    else:
-                        start_date = datetime.fromisoformat(start_dt_str).date()
-                except:
-                    pass
-            
-            # Parse event end date
-            if 'end_datetime' in event and event['end_datetime']:
-                try:
-                    end_dt_str = event['end_datetime']
-                    if 'T' in end_dt_str:
-                        if end_dt_str.endswith('Z'):
-                            end_dt_str = end_dt_str.replace('Z', '+00:00')
-                        dt = datetime.fromisoformat(end_dt_str)
-                        end_date = dt.date()
-                    else:
-                        end_date = datetime.fromisoformat(end_dt_str).date()
-                except:
-                    end_date = start_date  # Single day event
-            else:
-                end_date = start_date  # Single day event if no end date
-            
-            # Add event to all days it spans within this month
-            # For Google Calendar, end dates are exclusive (event ends at start of end_date)
-            if start_date and end_date:
-                # For all-day events, end_date is exclusive, so subtract 1 day
-                if start_date == end_date:
-                    # Single day event
-                    actual_end_date = end_date
-                else:
-                    # Multi-day event - end_date is exclusive, so actual end is the day before
-                    actual_end_date = end_date - timedelta(days=1)
-                
-                current_date = start_date
-                while current_date <= actual_end_date:
-                    # Only include events for this month
-                    if current_date.year == year and current_date.month == month:
-                        if current_date not in month_events:
-                            month_events[current_date] = []
-                        
-                        # Add event with span information for better rendering
-                        event_copy = event.copy()
-                        event_copy['span_start'] = start_date
-                        event_copy['span_end'] = actual_end_date
-                        event_copy['is_span_start'] = (current_date == start_date)
-                        event_copy['is_span_end'] = (current_date == actual_end_date)
-                        event_copy['span_days'] = (actual_end_date - start_date).days + 1
-                        
-                        month_events[current_date].append(event_copy)
-                    current_date += timedelta(days=1)
-        
-        # Build month calendar HTML
-        month_html = f'''
-        <div class="month-container" id="month-{i}">
-            <div class="month-header-3">
-                <h2>{month_name} {year}</h2>
-            </div>
-            <div class="weekdays-3">
-                <div class="weekday-3">Sun</div>
-                <div class="weekday-3">Mon</div>
-                <div class="weekday-3">Tue</div>
-                <div class="weekday-3">Wed</div>
-                <div class="weekday-3">Thu</div>
-                <div class="weekday-3">Fri</div>
-                <div class="weekday-3">Sat</div>
-            </div>
-            <div class="month-grid">'''
         
-        # Add calendar weeks and collect all spanning events first
-        all_spanning_events = []
-        week_structures = []
+        # Multi-day bars: one segment per week row, stacked in lanes (cached per data version)
+        week_segments, lane_counts = signage.calendar_layouts.month(version, day_index, year, month)
         
-        for week_idx, week in enumerate(cal):
-            # Collect spanning events that start in this week
-            for day in week:
-                if day == 0:
+        weeks = []
+        for week_idx, week in enumerate(month_weeks(year, month)):
+            cells = []
+            for current_date in week:
+                if current_date is None:
+                    cells.append(None)
                     continue
-                    
-                current_date = datetime(year, month, day).date()
-                day_events = month_events.get(current_date, [])
                 
-                for event in day_events:
-                    is_span_start = event.get('is_span_start', False)
-                    span_days = event.get('span_days', 1)
-                    
-                    if span_days > 1 and is_span_start:
-                        span_start = event.get('span_start')
-                        span_end = event.get('span_end')
-                        
-                        # Calculate which weeks this event spans across
-                        event_info = {
-                            'event': event,
-                            'start_date': span_start,
-                            'end_date': span_end,
-                            'start_week': week_idx,
-                            'segments': []  # Will store week segments
-                        }
-                        
-                        # Calculate segments for each week this event crosses
-                        current_segment_start = span_start
-                        for check_week_idx, check_week in enumerate(cal):
-                            if check_week_idx < week_idx:
-                                continue
-                                
-                            # Find dates in this week that are part of the event
-                            week_event_days = []
-                            week_start_col = None
-                            
-                            for col, day_num in enumerate(check_week):
-                                if day_num == 0:
-                                    continue
-                                check_date = datetime(year, month, day_num).date()
-                                
-                                if current_segment_start <= check_date <= span_end:
-                                    if week_start_col is None:
-                                        week_start_col = col + 1  # CSS grid is 1-indexed
-                                    week_event_days.append(check_date)
-                            
-                            if week_event_days:
-                                event_info['segments'].append({
-                                    'week_idx': check_week_idx,
-                                    'start_col': week_start_col,
-                                    'span_length': len(week_event_days),
-                                    'is_start': (check_week_idx == week_idx),
-                                    'is_end': (week_event_days[-1] == span_end)
-                                })
-                                
-                            # Update for next week
-                            if week_event_days and week_event_days[-1] < span_end:
-                                current_segment_start = week_event_days[-1] + timedelta(days=1)
-                            else:
-                                break
-                        
-                        all_spanning_events.append(event_info)
-        
-        # Now build the weeks with their spanning overlays
-        for week_idx, week in enumerate(cal):
-            week_html = f'<div class="week-row" id="week-{week_idx}">'
-            
-            # First pass: add all day cells
-            for day in week:
-                if day == 0:
-                    week_html += '<div class="day-cell empty"></div>'
-                else:
-                    current_date = datetime(year, month, day).date()
-                    is_today = current_date == today
-                    day_events = month_events.get(current_date, [])
-                    
-                    day_class = "day-cell"
-                    if is_today:
-                        day_class += " today"
-                    if day_events:
-                        day_class += " has-events"
-                    
-                    # Create events HTML for this day - only single day events and event starts
-                    events_html = ""
-                    for event in day_events[:2]:
-                        title = event.get('title', 'Untitled')
-                        time_str = event.get('time', '')
-                        bg_color = event.get('calendar_bg_color', '#4285f4')
-                        fg_color = event.get('calendar_fg_color', '#ffffff')
-                        
-                        is_span_start = event.get('is_span_start', False)
-                        span_days = event.get('span_days', 1)
-                        
-                        # Skip ALL multi-day events - they are handled by spanning bars
-                        if span_days > 1:
-                            continue  # Skip all days of multi-day events - will be handled by spanning bars
-                        
-                        display_title = title
-                        if time_str and time_str != 'All day':
-                            display_text = f"{time_str[:5]} - {display_title}"
-                        else:
-                            display_text = display_title
-                        
-                        events_html += f'<div class="event-3" style="background-color: {bg_color}; color: {fg_color};">{display_text}</div>'
-                    
-                    if len([e for e in day_events if e.get('span_days', 1) == 1]) > 2:
-                        remaining = len([e for e in day_events if e.get('span_days', 1) == 1]) - 2
-                        events_html += f'<div class="event-3 more-3">+{remaining}</div>'
-                    
-                    week_html += f'''
-                    <div class="{day_class}" data-date="{current_date}">
-                        <div class="day-number-3">{day}</div>
-                        <div class="events-3">{events_html}</div>
-                    </div>'''
-            
-            week_html += '</div>'
-            
-            # Second pass: add spanning event bars for this specific week
-            spanning_bars_html = ""
-            
-            for span_event in all_spanning_events:
-                # Find the segment for this week
-                week_segment = None
-                for segment in span_event['segments']:
-                    if segment['week_idx'] == week_idx:
-                        week_segment = segment
-                        break
+                day_entries = day_index.entries(current_date)
+                day_class = "day-cell"
+                if current_date == today:
+                    day_class += " today"
+                if day_entries:
+                    day_class += " has-events"
                 
-                if week_segment:
-                    event = span_event['event']
-                    title = event.get('title', 'Untitled')
-                    time_str = event.get('time', '')
-                    bg_color = event.get('calendar_bg_color', '#4285f4')
-                    fg_color = event.get('calendar_fg_color', '#ffffff')
-                    
-                    # Show full title on start segment, abbreviated on continuation
-                    if week_segment['is_start']:
-                        if time_str and time_str != 'All day':
-                            display_text = f"{time_str[:5]} - {title}"
-                        else:
-                            display_text = title
-                    else:
-                        display_text = f"→ {title}"  # Continuation indicator
-                    
-                    spanning_bars_html += f'''
-                    <div class="spanning-event" style="
-                        grid-column: {week_segment['start_col']} / span {week_segment['span_length']};
-                        background-color: {bg_color}; 
-                        color: {fg_color};
-                        grid-row: 1;
-                        z-index: 10;
-                        margin-top: 95px;
-                        margin-bottom: 10px;
-                    ">{display_text}</div>'''
+                # Only single day events here - multi-day events are drawn as spanning bars
+                cell_events = [{
+                    'text': short_event_label(entry.event),
+                    'bg_color': entry.event.bg_color,
+                    'fg_color': entry.event.fg_color
+                } for entry in day_entries[:2] if not entry.is_multi_day]
+                
+                single_day_count = len([entry for entry in day_entries if not entry.is_multi_day])
+                cells.append({
+                    'day': current_date.day,
+                    'date': current_date,
+                    'classes': day_class,
+                    'events': cell_events,
+                    'more': single_day_count - 2 if single_day_count > 2 else 0
+                })
             
-            # Combine week with spanning bars
-            month_html += f'''
-            <div class="week-container">
-                {week_html}
-                <div class="spanning-overlay">
-                    {spanning_bars_html}
-                </div>
-            </div>'''
-        
-        month_html += '''
-            </div>
-        </div>'''
-        
-        months_data.append(month_html)
+            bars = [{
+                'start_col': segment.start_col,
+                'span_length': segment.span_length,
+                'lane': segment.lane,
+                'bg_color': segment.event.bg_color,
+                'fg_color': segment.event.fg_color,
+                # Show full title on start segment, abbreviated on continuation
+                'text': short_event_label(segment.event) if segment.is_start else f"→ {segment.event.title}"
+            } for segment in week_segments[week_idx]]
+            weeks.append({'cells': cells, 'bars': bars, 'lanes': lane_counts[week_idx]})
+        
+        months.append({'name': calendar.month_name[month], 'year': year, 'weeks': weeks})
     
-    return f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>3-Month Calendar - Temple Office</title>
-    <style>
-        html {{
-            background: #1f1f1f;
-            min-height: 100vh;
-            font-family: 'Google Sans', 'Roboto', Arial, sans-serif;
-            scroll-behavior: smooth;
-        }}
-        
-        body {{
-            margin: 0;
-            padding: 0;
-            background: #1f1f1f;
-            color: #e8eaed;
-            overflow-x: hidden;
-        }}
-        
-        /* Calendar with consistent 4.5s holds and 2s transitions - 2 rotations */
-        .auto-scroll {{
-            animation: scrollDown 70s infinite ease-in-out;
-            transform: translateZ(0); /* Force hardware acceleration */
-            will-change: transform; /* Optimize for smooth transforms */
-            backface-visibility: hidden; /* Prevent flickering */
-        }}
-        
-        @keyframes scrollDown {{
-            /* 4.5s holds, 4s moves - consistent timing */
-            0% {{ transform: translateY(0) translateZ(0); }} /* August - Start */
-            6.4% {{ transform: translateY(0) translateZ(0); }} /* Hold August - 4.5s */
-            12.1% {{ transform: translateY(-100vh) translateZ(0); }} /* Move to September - 4s */
-            18.6% {{ transform: translateY(-100vh) translateZ(0); }} /* Hold September - 4.5s */
-            24.3% {{ transform: translateY(-200vh) translateZ(0); }} /* Move to October - 4s */
-            30.7% {{ transform: translateY(-200vh) translateZ(0); }} /* Hold October - 4.5s */
-            36.4% {{ transform: translateY(-100vh) translateZ(0); }} /* Move back to September - 4s */
-            42.9% {{ transform: translateY(-100vh) translateZ(0); }} /* Hold September - 4.5s */
-            48.6% {{ transform: translateY(0) translateZ(0); }} /* Move back to August - 4s */
-            55.0% {{ transform: translateY(0) translateZ(0); }} /* Hold August - 4.5s (end 1st rotation) */
-            60.7% {{ transform: translateY(-100vh) translateZ(0); }} /* Move to September - 4s */
-            67.1% {{ transform: translateY(-100vh) translateZ(0); }} /* Hold September - 4.5s */
-            72.9% {{ transform: translateY(-200vh) translateZ(0); }} /* Move to October - 4s */
-            79.3% {{ transform: translateY(-200vh) translateZ(0); }} /* Hold October - 4.5s */
-            85.0% {{ transform: translateY(-100vh) translateZ(0); }} /* Move back to September - 4s */
-            91.4% {{ transform: translateY(-100vh) translateZ(0); }} /* Hold September - 4.5s */
-            97.1% {{ transform: translateY(0) translateZ(0); }} /* Move back to August - 4s */
-            100% {{ transform: translateY(0) translateZ(0); }} /* Hold August until dashboard switches */
-        }}
-        
-        .calendar-container-3 {{
-            min-height: 300vh; /* 3 months stacked vertically */
-            width: 100vw;
-            padding: 20px;
-            box-sizing: border-box;
-        }}
-        
-        /* REMOVED FIXED HEADER - was blocking third month scroll */
-        .header-3 {{
-            display: none; /* Remove the fixed header completely */
-        }}
-        
-        .month-container {{
-            background: rgba(255,255,255,0.12);
-            border-radius: 30px;
-            padding: 30px;
-            margin-bottom: 20px;
-            border: 2px solid rgba(255,255,255,0.2);
-            box-shadow: 0 20px 80px rgba(0,0,0,0.4);
-            height: calc(100vh - 40px); /* USE FULL SCREEN HEIGHT WITHOUT HEADER */
-            display: flex;
-            flex-direction: column;
-        }}
-        
-        .month-header-3 {{
-            text-align: center;
-            margin-bottom: 15px;
-            flex-shrink: 0;
-        }}
-        
-        .month-header-3 h2 {{
-            font-size: 5.5em;
-            margin: 0;
-            color: #4285f4; /* Make it more prominent */
-            font-weight: 400;
-        }}
-        
-        .weekdays-3 {{
-            display: grid;
-            grid-template-columns: repeat(7, 1fr);
-            gap: 8px;
-            margin-bottom: 15px;
-            flex-shrink: 0;
-        }}
-        
-        .weekday-3 {{
-            text-align: center;
-            padding: 15px 8px;
-            font-weight: 500;
-            color: #e3f2fd;
-            font-size: 2.8em;
-            background: rgba(0,0,0,0.6);
-            backdrop-filter: blur(8px);
-            border-radius: 15px;
-            border: 1px solid rgba(255,255,255,0.08);
-            box-shadow: 0 4px 16px rgba(0,0,0,0.3);
-        }}
-        
-        .month-grid {{
-            display: flex;
-            flex-direction: column;
-            gap: 12px;
-            flex: 1; /* TAKE REMAINING HEIGHT */
-            height: 100%;
-        }}
-        
-        .week-container {{
-            position: relative;
-            flex: 1; /* EACH WEEK TAKES EQUAL HEIGHT */
-        }}
-        
-        .week-row {{
-            display: grid;
-            grid-template-columns: repeat(7, 1fr);
-            gap: 12px;
-            height: 100%; /* FILL WEEK CONTAINER HEIGHT */
-        }}
-        
-        .spanning-overlay {{
-            position: absolute;
-            top: 0;
-            left: 0;
-            right: 0;
-            bottom: 0;
-            display: grid;
-            grid-template-columns: repeat(7, 1fr);
-            gap: 12px;
-            pointer-events: none; /* Allow clicking through to day cells */
-        }}
-        
-        .spanning-event {{
-            background: #4285f4;
-            color: white;
-            padding: 8px 12px;
-            border-radius: 8px;
-            font-size: 1.4em;
-            line-height: 1.3;
-            word-wrap: break-word;
-            overflow-wrap: break-word;
-            hyphens: auto;
-            height: 40px; /* Fixed height for spanning bars */
-            display: flex;
-            align-items: center;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.3);
-            border: 2px solid rgba(255,255,255,0.2);
-        }}
-        
-        .day-cell {{
-            background: rgba(0,0,0,0.5);
-            border-radius: 18px;
-            padding: 20px 15px;
-            min-height: 160px; /* BIGGER CELLS FOR 4K */
-            border: 1px solid rgba(255,255,255,0.08);
-            display: flex;
-            flex-direction: column;
-            height: 100%; /* FILL WEEK ROW HEIGHT */
-            position: relative; /* For event positioning */
-            box-shadow: 0 4px 16px rgba(0,0,0,0.3);
-        }}
-        
-        .week-row {{
-            display: grid;
-            grid-template-columns: repeat(7, 1fr);
-            gap: 12px;
-            flex: 1; /* EACH WEEK TAKES EQUAL HEIGHT */
-            position: relative; /* For positioning spanning events */
-        }}
-        
-        .day-cell {{
-            background: rgba(0,0,0,0.5);
-            border-radius: 18px;
-            padding: 20px 15px;
-            min-height: 160px; /* BIGGER CELLS FOR 4K */
-            border: 1px solid rgba(255,255,255,0.08);
-            display: flex;
-            flex-direction: column;
-            height: 100%; /* FILL WEEK ROW HEIGHT */
-            box-shadow: 0 4px 16px rgba(0,0,0,0.3);
-        }}
-        
-        .day-cell.today {{
-            background: rgba(26, 115, 232, 0.3);
-            backdrop-filter: blur(12px);
-            border: 2px solid rgba(26, 115, 232, 0.6);
-            box-shadow: 0 8px 32px rgba(26, 115, 232, 0.4);
-            color: #e3f2fd;
-        }}
-        
-        .day-cell.has-events {{
-            border-color: #34a853;
-        }}
-        
-        .day-cell.today {{
-            background: rgba(26, 115, 232, 0.3);
-            backdrop-filter: blur(12px);
-            border: 2px solid rgba(26, 115, 232, 0.6);
-            box-shadow: 0 8px 32px rgba(26, 115, 232, 0.4);
-            color: #e3f2fd;
-        }}
-        
-        .day-cell.has-events {{
-            border-color: #34a853;
-        }}
-        
-        .day-cell.empty {{
-            background: rgba(0,0,0,0.5);
-            border: 1px solid rgba(255,255,255,0.08);
-            box-shadow: 0 4px 16px rgba(0,0,0,0.3);
-        }}
-        
-        .day-number-3 {{
-            font-size: 2.8em;
-            font-weight: 500;
-            margin-bottom: 15px;
-            text-align: center;
-            flex-shrink: 0;
-        }}
-        
-        .events-3 {{
-            display: flex;
-            flex-direction: column;
-            gap: 8px;
-            flex: 1; /* TAKE REMAINING VERTICAL SPACE */
-            overflow: hidden;
-            padding-top: 60px; /* Make room for spanning bars above */
-        }}
-        
-        .event-3 {{
-            background: rgba(66, 133, 244, 0.25);
-            backdrop-filter: blur(10px);
-            color: #e8f0fe;
-            padding: 12px 15px;
-            border-radius: 12px;
-            border: 1px solid rgba(66, 133, 244, 0.4);
-            box-shadow: 0 6px 24px rgba(66, 133, 244, 0.2);
-            font-size: 1.6em;
-            line-height: 1.3;
-            word-wrap: break-word;
-            overflow-wrap: break-word;
-            hyphens: auto;
-        }}
-            flex-shrink: 0;
-        }}
-        
-        .events-3 {{
-            display: flex;
-            flex-direction: column;
-            gap: 12px; /* Increased gap between events for better separation */
-            flex: 1; /* TAKE REMAINING VERTICAL SPACE */
-            overflow: hidden;
-        }}
-        
-        .event-3 {{
-            background: rgba(66, 133, 244, 0.25);
-            backdrop-filter: blur(10px);
-            color: #e8f0fe;
-            padding: 12px 15px;
-            border-radius: 12px;
-            border: 1px solid rgba(66, 133, 244, 0.4);
-            box-shadow: 0 6px 24px rgba(66, 133, 244, 0.2);
-            font-size: 1.6em;
-            line-height: 1.3;
-            word-wrap: break-word;
-            overflow-wrap: break-word;
-            hyphens: auto;
-        }}
-        
-        .event-3.more-3 {{
-            background: rgba(52, 168, 83, 0.25);
-            backdrop-filter: blur(10px);
-            border: 1px solid rgba(52, 168, 83, 0.4);
-            box-shadow: 0 6px 24px rgba(52, 168, 83, 0.2);
-            font-size: 1.6em;
-            font-style: italic;
-            text-align: center;
-            margin-top: 6px; /* Add extra space above "more" indicator */
-        }}
-        
-        .footer-3 {{
-            text-align: center;
-            margin-top: 40px;
-            color: #5f6368;
-            font-size: 1.8em;
-            padding: 10px;
-        }}
-        
-        /* 4K TV Optimization - FULL HEIGHT UTILIZATION */
-        @media screen and (min-width: 2560px) {{
-            .header-3 h1 {{ font-size: 5.0em; }}
-            .month-header-3 h2 {{ font-size: 5.5em; }}
-            .weekday-3 {{ font-size: 3.4em; padding: 20px 10px; }}
-            .day-number-3 {{ font-size: 3.8em; margin-bottom: 20px; }}
-            .day-cell {{ 
-                min-height: 220px; 
-                padding: 25px 20px; 
-            }}
-            .event-3 {{ 
-                font-size: 2.4em; 
-                padding: 15px 20px; 
-                margin-bottom: 8px;
-            }}
-            .event-3.more-3 {{ font-size: 2.0em; }}
-            .footer-3 {{ font-size: 2.6em; padding: 15px; }}
-        }}
-    </style>
-</head>
-<body>
-    <!-- REMOVED HEADER - was blocking third month scroll -->
-    
-    <div class="calendar-container-3 auto-scroll">
-        {''.join(months_data)}
-    </div>
+    return {'months': months, 'event_count': len(events)}
+
+@app.route('/calendar3')
+@versioned('calendar', cache_seconds=300)
+def calendar3_dashboard():
+    """3-Month Auto-Scrolling Calendar View using Google Calendar data"""
+    # Get calendar events
+    if not signage.calendar_events:
+        signage.update_calendar_data()
     
-    <div class="footer-3">
-        📅 Google Calendar • {len(events)} events • Auto-scrolling 3-month view • Next: CFSS Dashboard
-    </div>
-</body>
-</html>'''
+    return stream_template('calendar3.html', **calendar3_view_model(signage.calendar_snapshot, datetime.now()))
 
 
-@app.route('/weather')
-def weather_dashboard():
-    if not signage.weather_data:
-        signage.update_weather_data()
+def lightning_view_model(lightning, now):
+    """Lightning monitor panel - Perry Weather style"""
+    strikes = lightning.get('strikes', [])
+    safety_timer = lightning.get('safety_timer', {})
+    total_strikes = lightning.get('total_strikes_60min', 0)
+    timer_status = safety_timer.get('status', 'unknown')
     
-    weather = signage.weather_data
-    forecast = signage.forecast_data
-    lightning = signage.lightning_data
-    
-    # Generate lightning alert HTML - Perry Weather style
-    lightning_html = ""
-    if lightning:
-        strikes = lightning.get('strikes', [])
-        safety_timer = lightning.get('safety_timer', {})
-        total_strikes = lightning.get('total_strikes_60min', 0)
-        
-        # Safety timer display
-        timer_status = safety_timer.get('status', 'unknown')
-        minutes_remaining = safety_timer.get('minutes_remaining', 0)
-        timer_message = safety_timer.get('message', '')
-        
-        # Color coding based on safety status
-        if timer_status == 'wait':
-            alert_class = "lightning-alert danger"
-            timer_color = "#ff4757"
-            timer_icon = "⚠️"
-        elif timer_status == 'safe' and total_strikes > 0:
-            alert_class = "lightning-alert safe"
-            timer_color = "#2ed573"
-            timer_icon = "✅"
-        else:
-            alert_class = "lightning-alert clear"
-            timer_color = "#74b9ff"
-            timer_icon = "☀️"
-        
-        # Lightning map visualization
-        map_html = ""
-        update_status = f"⚡ Lightning mode: Enhanced alerts (1min updates)" if signage.lightning_active else f"🌤️ Normal mode: Fast detection (1min updates)"
-        
-        if strikes:
-            # Create simple text-based strike display
-            recent_strikes = sorted(strikes, key=lambda x: x['timestamp'], reverse=True)[:10]
-            map_html = '<div class="strike-list">'
-            for i, strike in enumerate(recent_strikes):
-                # Handle both datetime objects and ISO strings
-                timestamp = strike['timestamp']
-                if isinstance(timestamp, str):
-                    strike_time = datetime.fromisoformat(timestamp)
-                else:
-                    strike_time = timestamp  # Already a datetime object
-                
-                time_ago = (datetime.now() - strike_time).total_seconds() / 60
-                direction = signage.get_direction_from_coordinates(signage.temple_lat, signage.temple_lon, 
-                                                        strike['latitude'], strike['longitude'])
-                map_html += f'''
-                <div class="strike-item">
-                    <span class="strike-icon">⚡</span>
-                    <span class="strike-info">{strike['distance_miles']:.1f}mi {direction} - {int(time_ago)}min ago</span>
-                    <span class="strike-intensity">{strike['intensity']}</span>
-                </div>'''
-            map_html += '</div>'
-        else:
-            map_html = '<div class="no-strikes">No lightning strikes detected in the last hour</div>'
-        
-        lightning_html = f'''
-        <div class="{alert_class}">
-            <div class="lightning-header">
-                <div class="lightning-icon-large">{timer_icon}</div>
-                <div class="lightning-title">
-                    <h3>LIGHTNING MONITOR</h3>
-                    <p class="coverage">10-mile radius around Temple, TX</p>
-                </div>
-                <div class="safety-timer" style="color: {timer_color};">
-                    <div class="timer-display">{minutes_remaining if minutes_remaining > 0 else '0'}</div>
-                    <div class="timer-label">{'MIN WAIT' if minutes_remaining > 0 else 'SAFE'}</div>
-                </div>
-            </div>
-            
-            <div class="lightning-stats">
-                <div class="stat">
-                    <span class="stat-number">{total_strikes}</span>
-                    <span class="stat-label">Strikes (1hr)</span>
-                </div>
-                <div class="stat">
-                    <span class="stat-number">{len([s for s in strikes if (datetime.now() - (datetime.fromisoformat(s['timestamp']) if isinstance(s['timestamp'], str) else s['timestamp'])).total_seconds() / 60 <= 15])}</span>
-                    <span class="stat-label">Recent (15min)</span>
-                </div>
-                <div class="stat">
-                    <span class="stat-number">{lightning.get('coverage_radius_miles', 25)}</span>
-                    <span class="stat-label">Mile Radius</span>
-                </div>
-            </div>
-            
-            <div class="lightning-message">
-                <p style="color: {timer_color}; font-weight: bold;">{timer_message}</p>
-                <p style="color: #9aa0a6; font-size: 0.9em; margin-top: 5px;">{update_status}</p>
-            </div>
-            
-            <div class="lightning-map">
-                <h4>Strike Locations</h4>
-                {map_html}
-            </div>
-            
-            <div class="lightning-footer">
-                <small>Real-time lightning monitoring • Updated: {lightning.get('last_updated', 'Unknown')[:16]}</small>
-            </div>
-        </div>'''
+    # Color coding based on safety status
+    if timer_status == 'wait':
+        alert_class = "lightning-alert danger"
+        timer_color = "#ff4757"
+        timer_icon = "⚠️"
+    elif timer_status == 'safe' and total_strikes > 0:
+        alert_class = "lightning-alert safe"
+        timer_color = "#2ed573"
+        timer_icon = "✅"
+    else:
+        alert_class = "lightning-alert clear"
+        timer_color = "#74b9ff"
+        timer_icon = "☀️"
     
-    # Generate forecast HTML
-    forecast_html = ""
-    for day in forecast:
-        weather_text = get_weather_emoji(day.get('icon', '02d'))
-        forecast_html += f'''
-        <div class="forecast-item">
-            <div class="forecast-day">{day['date']}</div>
-            <div class="forecast-icon" style="font-size: 1.2em; font-weight: bold; color: #74b9ff;">{weather_text}</div>
-            <div class="forecast-temp">{day['high']}°/{day['low']}°</div>
-            <div class="forecast-desc">{day['description']}</div>
-        </div>'''
+    def minutes_ago(strike):
+        # Handle both datetime objects and ISO strings
+        timestamp = strike['timestamp']
+        strike_time = datetime.fromisoformat(timestamp) if isinstance(timestamp, str) else timestamp
+        return (now - strike_time).total_seconds() / 60
     
-    # Get current time for news rotation and weather updates
-    current_hour = datetime.now().hour
+    recent_strikes = sorted(strikes, key=lambda x: x['timestamp'], reverse=True)[:10]
+    minutes_remaining = safety_timer.get('minutes_remaining', 0)
+    return {
+        'alert_class': alert_class,
+        'timer_color': timer_color,
+        'timer_icon': timer_icon,
+        'minutes_remaining': minutes_remaining,
+        'timer_display': minutes_remaining if minutes_remaining > 0 else 0,
+        'timer_label': 'MIN WAIT' if minutes_remaining > 0 else 'SAFE',
+        'timer_message': safety_timer.get('message', ''),
+        'total_strikes': total_strikes,
+        'recent_strikes': len([strike for strike in strikes if minutes_ago(strike) <= 15]),
+        'radius_miles': lightning.get('coverage_radius_miles', 25),
+        'update_status': "⚡ Lightning mode: Enhanced alerts (1min updates)" if signage.lightning_active else "🌤️ Normal mode: Fast detection (1min updates)",
+        'strikes': [{
+            'distance_miles': strike['distance_miles'],
+            'direction': signage.get_direction_from_coordinates(signage.temple_lat, signage.temple_lon,
+                                                                strike['latitude'], strike['longitude']),
+            'minutes_ago': int(minutes_ago(strike)),
+            'intensity': strike['intensity']
+        } for strike in recent_strikes],
+        'last_updated': published_label('lightning', '%Y-%m-%dT%H:%M')
+    }
+
+def weather_view_model(weather, forecast, lightning, now):
+    """Current conditions, forecast, lightning panel and the rotating news"""
     current_temp = weather['temperature']
     
     # Generate more comprehensive news stories based on weather and local events
@@ -2557,1011 +1728,76 @@ def weather_dashboard():
         {"title": "🎓 Education News", "summary": "Temple ISD reports successful summer programs with 95% participation rate - fall enrollment opens August 10th"}
     ])
     
-    news_html = ""
-    for i, story in enumerate(news_stories[:3]):  # Show 3 stories
-        news_html += f'''
-        <div class="news-item">
-            <div class="news-icon">📰</div>
-            <div class="news-content">
-                <h4>{story['title']}</h4>
-                <p>{story['summary']}</p>
-            </div>
-        </div>'''
-    
-    return f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Temple Weather & News</title>
-    <meta http-equiv="Cache-Control" content="no-cache, no-store, must-revalidate">
-    <meta http-equiv="Pragma" content="no-cache">
-    <meta http-equiv="Expires" content="0">
-    <style>
-        /* Updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} - News section width optimization */
-        html {{
-            background: linear-gradient(135deg, #0f0f23 0%, #1a1a2e 50%, #16213e 100%);
-            min-height: 100vh;
-            scroll-behavior: smooth;
-        }}
-        
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            margin: 0;
-            background: linear-gradient(135deg, #0f0f23 0%, #1a1a2e 50%, #16213e 100%);
-            height: 100vh;
-            color: #e0e0e0;
-            overflow: hidden;
-            padding: 5px; /* REDUCE PADDING TO PREVENT CUTOFF */
-            box-sizing: border-box;
-        }}
-        
-        .main-container {{
-            display: grid;
-            grid-template-columns: 58% 42%; /* ADJUST RATIO FOR BETTER FIT */
-            gap: 10px; /* REDUCE GAP */
-            height: calc(100vh - 60px); /* EVEN MORE PADDING TO ENSURE BOTTOM BORDERS SHOW */
-            max-width: 100vw; /* ENSURE NO OVERFLOW */
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        
-        .weather-section {{
-            background: rgba(52, 152, 219, 0.1);
-            border-radius: 15px;
-            padding: 20px;
-            border: 2px solid rgba(52, 152, 219, 0.3);
-            overflow-y: auto; /* ALLOW SCROLLING IF NEEDED */
-            height: 100%;
-            display: flex;
-            flex-direction: column;
-            justify-content: flex-start; /* ALIGN TO TOP, DON'T STRETCH */
-            box-sizing: border-box;
-        }}
-        
-        .news-section {{
-            background: rgba(231, 76, 60, 0.1);
-            border-radius: 15px;
-            padding: 20px;
-            border: 2px solid rgba(231, 76, 60, 0.3);
-            overflow-y: auto; /* ALLOW SCROLLING IF NEEDED */
-            height: 100%;
-            display: flex;
-            flex-direction: column;
-            justify-content: flex-start; /* ALIGN TO TOP, DON'T STRETCH */
-            box-sizing: border-box;
-        }}
-        
-        .header {{
-            text-align: center;
-            margin-bottom: 15px;
-            flex-shrink: 0;
-        }}
-        
-        .header h1 {{
-            font-size: 4.2em;
-            margin: 0;
-            color: #3498db;
-            text-shadow: 4px 4px 8px rgba(0,0,0,0.5);
-        }}
-        
-        .current-weather {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin: 15px 0;
-            background: rgba(52, 152, 219, 0.15);
-            border-radius: 20px;
-            padding: 30px;
-            min-height: 160px;
-            flex-shrink: 0;
-        }}
-        
-        .weather-icon {{
-            font-size: 8em;
-            margin-right: 30px;
-            font-family: 'Arial Unicode MS', Arial, sans-serif;
-        }}
-        
-        .current-temp {{
-            font-size: 8em;
-            font-weight: 700;
-            margin: 0;
-            color: #3498db;
-        }}
-        
-        .current-desc {{
-            font-size: 3.5em;
-            margin: 10px 0;
-            color: #74b9ff;
-        }}
-        
-        .current-location {{
-            font-size: 2.8em;
-            color: #bdc3c7;
-        }}
-        
-        .feels-like {{
-            font-size: 4.0em;
-            color: #3498db;
-            margin: 0;
-        }}
-        
-        .conditions {{
-            font-size: 2.2em;
-            color: #74b9ff;
-            margin-top: 10px;
-        }}
-        
-        .weather-details {{
-            display: grid;
-            grid-template-columns: repeat(4, 1fr);
-            gap: 15px;
-            margin: 15px 0;
-            flex-shrink: 0;
-        }}
-        
-        .detail-card {{
-            background: rgba(52, 152, 219, 0.1);
-            border-radius: 15px;
-            padding: 25px 20px;
-            text-align: center;
-            border: 2px solid rgba(52, 152, 219, 0.2);
-            min-height: 120px;
-            display: flex;
-            flex-direction: column;
-            justify-content: center;
-        }}
-        
-        .detail-card h3 {{
-            font-size: 2.4em;
-            margin: 0 0 12px 0;
-            color: #74b9ff;
-            font-weight: 500;
-        }}
-        
-        .detail-card .value {{
-            font-size: 3.5em;
-            font-weight: 700;
-            color: #3498db;
-            margin: 0;
-        }}
-        
-        .forecast-grid {{
-            display: grid;
-            grid-template-columns: repeat(4, 1fr);
-            gap: 15px;
-            margin: 15px 0;
-            flex: 1; /* TAKE REMAINING SPACE */
-            align-content: stretch;
-        }}
-        
-        .forecast-item {{
-            background: rgba(52, 152, 219, 0.1);
-            border-radius: 15px;
-            padding: 25px 20px;
-            text-align: center;
-            border: 2px solid rgba(52, 152, 219, 0.2);
-            display: flex;
-            flex-direction: column;
-            justify-content: space-between;
-            min-height: 200px;
-        }}
-        
-        .forecast-day {{
-            font-size: 2.4em;
-            font-weight: 600;
-            color: #74b9ff;
-            margin-bottom: 10px;
-        }}
-        
-        .forecast-icon {{
-            font-size: 3.2em;
-            margin: 10px 0;
-            font-weight: bold;
-            color: #3498db;
-            background: rgba(52, 152, 219, 0.1);
-            padding: 12px;
-            border-radius: 8px;
-            text-align: center;
-        }}
-        
-        .forecast-temp {{
-            font-size: 2.4em;
-            font-weight: 700;
-            color: #3498db;
-            margin: 8px 0;
-        }}
-        
-        .forecast-desc {{
-            font-size: 1.8em;
-            color: #bdc3c7;
-        }}
-        
-        .news-header {{
-            text-align: center;
-            margin-bottom: 15px;
-            flex-shrink: 0;
-        }}
-        
-        .news-header h2 {{
-            font-size: 5.2em; /* MUCH BIGGER news header for better readability */
-            margin: 0;
-            color: #e74c3c;
-            text-shadow: 4px 4px 8px rgba(0,0,0,0.5);
-        }}
-        
-        .news-subtitle {{
-            font-size: 3.4em; /* MUCH BIGGER subtitle for better readability */
-            color: #f39c12;
-            margin-top: 8px;
-        }}
-        
-        .news-item {{
-            display: flex;
-            align-items: flex-start;
-            margin: 15px 0;
-            background: rgba(231, 76, 60, 0.1);
-            border-radius: 10px;
-            padding: 25px 20px;
-            border-left: 4px solid #e74c3c;
-            flex: 1; /* TAKE EQUAL SPACE */
-            min-height: 120px;
-        }}
-        
-        .news-icon {{
-            font-size: 4.2em; /* MUCH BIGGER news icons for better visibility */
-            margin-right: 20px;
-            color: #e74c3c;
-            flex-shrink: 0;
-        }}
-        
-        .news-content h4 {{
-            font-size: 3.8em; /* MUCH BIGGER news title text for better readability */
-            margin: 0 0 12px 0;
-            color: #e74c3c;
-            font-weight: 600;
-            line-height: 1.2;
-        }}
-        
-        .news-content p {{
-            font-size: 3.0em; /* MUCH BIGGER news content text for better readability */
-            margin: 0;
-            color: #bdc3c7;
-            line-height: 1.3;
-        }}
-        
-        .live-embed {{
-            margin: 20px 0;
-            border-radius: 15px;
-            background: rgba(52, 152, 219, 0.1);
-            border: 1px solid rgba(52, 152, 219, 0.2);
-            flex: 1; /* TAKE REMAINING SPACE */
-            padding: 25px;
-            min-height: 150px;
-            display: flex;
-            flex-direction: column;
-            justify-content: center;
-        }}
-        
-        .embed-placeholder {{
-            text-align: center;
-            color: #74b9ff;
-        }}
-        
-        .embed-placeholder h3 {{
-            margin: 0;
-            font-size: 3.2em;
-        }}
-        
-        .embed-placeholder p {{
-            margin: 15px 0 0 0;
-            font-size: 2.6em;
-        }}
-        
-        .footer {{
-            text-align: center;
-            margin-top: 20px;
-            padding: 15px;
-            color: #7f8c8d;
-            font-size: 0.9em;
-            grid-column: 1 / -1;
-        }}
-        
-        .radar-link {{
-            display: inline-block;
-            background: rgba(52, 152, 219, 0.2);
-            color: #3498db;
-            padding: 10px 20px;
-            border-radius: 25px;
-            text-decoration: none;
-            font-weight: 600;
-            margin: 10px;
-            border: 1px solid rgba(52, 152, 219, 0.3);
-        }}
-        
-        .radar-link:hover {{
-            background: rgba(52, 152, 219, 0.3);
-        }}
-        
-        .weather-animation {{
-            position: absolute;
-            top: 0;
-            left: 0;
-            width: 100%;
-            height: 100%;
-            pointer-events: none;
-            opacity: 0.1;
-            z-index: -1;
-        }}
-        
-        .lightning-alert {{
-            margin: 15px 0;
-            border-radius: 15px;
-            padding: 25px;
-            background: rgba(255, 193, 7, 0.2); /* MUCH MORE VISIBLE BACKGROUND */
-            border: 3px solid #ffc107; /* PROMINENT YELLOW BORDER */
-            flex-shrink: 0;
-            min-height: 180px; /* MAKE IT BIGGER */
-            box-shadow: 0 0 20px rgba(255, 193, 7, 0.3); /* GLOW EFFECT */
-        }}
-        
-        .lightning-alert.danger {{
-            border-color: #ff4757;
-            background: rgba(255, 71, 87, 0.3); /* MORE VISIBLE */
-            box-shadow: 0 0 20px rgba(255, 71, 87, 0.4);
-        }}
-        
-        .lightning-alert.safe {{
-            border-color: #2ed573;
-            background: rgba(46, 213, 115, 0.3); /* MORE VISIBLE */
-            box-shadow: 0 0 20px rgba(46, 213, 115, 0.4);
-        }}
-        
-        .lightning-alert.clear {{
-            border-color: #74b9ff;
-            background: rgba(116, 185, 255, 0.3); /* MORE VISIBLE */
-            box-shadow: 0 0 20px rgba(116, 185, 255, 0.4);
-        }}
-        
-        .lightning-header {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 15px;
-            border-bottom: 2px solid rgba(255, 255, 255, 0.3);
-            padding-bottom: 15px;
-        }}
-        
-        .lightning-icon-large {{
-            font-size: 3.5em; /* MUCH BIGGER ICON */
-            margin-right: 15px;
-            color: #ffc107; /* BRIGHT YELLOW */
-        }}
-        
-        .lightning-title h3 {{
-            margin: 0;
-            font-size: 2.2em; /* MUCH BIGGER TEXT */
-            font-weight: bold;
-            color: #fff;
-        }}
-        
-        .lightning-title .coverage {{
-            margin: 5px 0 0 0;
-            font-size: 1.4em; /* BIGGER COVERAGE TEXT */
-            color: #ddd;
-        }}
-        
-        .safety-timer {{
-            text-align: center;
-            background: rgba(0, 0, 0, 0.5);
-            border-radius: 12px;
-            padding: 15px;
-            min-width: 100px;
-        }}
-        
-        .timer-display {{
-            font-size: 3.0em; /* MUCH BIGGER TIMER */
-            font-weight: bold;
-            margin: 0;
-            color: #fff;
-        }}
-        
-        .timer-label {{
-            font-size: 1.2em; /* BIGGER LABEL */
-            margin: 5px 0 0 0;
-            font-weight: bold;
-            color: #ddd;
-        }}
-        
-        .lightning-stats {{
-            display: flex;
-            justify-content: space-around;
-            margin: 15px 0;
-            background: rgba(0, 0, 0, 0.4);
-            border-radius: 12px;
-            padding: 15px;
-        }}
-        
-        .stat {{
-            text-align: center;
-            flex: 1;
-        }}
-        
-        .stat-number {{
-            display: block;
-            font-size: 3.2em; /* MUCH BIGGER STATS */
-            font-weight: bold;
-            color: #ffc107;
-        }}
-        
-        .stat-label {{
-            display: block;
-            font-size: 1.4em; /* BIGGER LABELS */
-            color: #ddd;
-            margin-top: 5px;
-        }}
-        
-        .lightning-message {{
-            text-align: center;
-            margin: 15px 0;
-            padding: 10px;
-            background: rgba(0, 0, 0, 0.2);
-            border-radius: 8px;
-        }}
-        
-        .lightning-map {{
-            margin: 20px 0;
-        }}
-        
-        .lightning-map h4 {{
-            margin: 0 0 15px 0;
-            font-size: 1.4em;
-            color: #fff;
-            border-bottom: 1px solid rgba(255, 255, 255, 0.2);
-            padding-bottom: 8px;
-        }}
-        
-        .strike-list {{
-            max-height: 200px;
-            overflow-y: auto;
-            background: rgba(0, 0, 0, 0.2);
-            border-radius: 8px;
-            padding: 10px;
-        }}
-        
-        .strike-item {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            padding: 8px 12px;
-            margin: 5px 0;
-            background: rgba(255, 255, 255, 0.05);
-            border-radius: 6px;
-            border-left: 3px solid #ff4757;
-        }}
-        
-        .strike-icon {{
-            font-size: 1.2em;
-            margin-right: 10px;
-        }}
-        
-        .strike-info {{
-            flex: 1;
-            font-size: 1.1em;
-        }}
-        
-        .strike-intensity {{
-            font-size: 0.9em;
-            color: #bbb;
-            background: rgba(0, 0, 0, 0.3);
-            padding: 3px 8px;
-            border-radius: 4px;
-        }}
-        
-        .no-strikes {{
-            text-align: center;
-            padding: 30px;
-            color: #bbb;
-            font-style: italic;
-            background: rgba(0, 0, 0, 0.2);
-            border-radius: 8px;
-        }}
-        
-        .lightning-footer {{
-            text-align: center;
-            margin-top: 15px;
-            padding-top: 10px;
-            border-top: 1px solid rgba(255, 255, 255, 0.2);
-        }}
-        
-        .lightning-footer small {{
-            color: #bbb;
-            font-size: 1.0em;
-        }}
-        
-        @keyframes pulse {{
-            0%, 100% {{ opacity: 1; }}
-            50% {{ opacity: 0.7; }}
-        }}
-        
-        .weather-particle {{
-            position: absolute;
-            width: 4px;
-            height: 4px;
-            background: #74b9ff;
-            border-radius: 50%;
-            animation: fall 8s linear infinite;
-        }}
-        
-        @keyframes fall {{
-            0% {{ transform: translateY(-100vh) rotate(0deg); opacity: 1; }}
-            100% {{ transform: translateY(100vh) rotate(360deg); opacity: 0; }}
-        }}
-        
-        .news-ticker {{
-            background: rgba(231, 76, 60, 0.2);
-            color: #e74c3c;
-            padding: 30px;
-            border-radius: 12px;
-            margin: 20px 0;
-            font-weight: 600;
-            font-size: 3.2em; /* MUCH BIGGER text for better readability */
-            border-left: 4px solid #e74c3c;
-            white-space: nowrap;
-            overflow: hidden;
-            position: relative;
-            height: 120px; /* Taller to accommodate bigger text */
-            display: flex;
-            align-items: center;
-            flex: 1; /* TAKE REMAINING SPACE */
-            box-shadow: 0 4px 12px rgba(231, 76, 60, 0.3);
-        }}
-        
-        .ticker-content {{
-            position: absolute;
-            animation: tickerScrollFromRight 20s linear infinite;
-            white-space: nowrap;
-            font-weight: 700;
-            text-shadow: 2px 2px 4px rgba(0, 0, 0, 0.3);
-            width: max-content;
-        }}
-        
-        @keyframes tickerScrollFromRight {{
-            0% {{ 
-                transform: translateX(100%);
-                opacity: 1;
-            }}
-            100% {{ 
-                transform: translateX(-100%);
-                opacity: 1;
-            }}
-        }}
-        
-        /* 4K TV Optimization for Weather Dashboard */
-        @media screen and (min-width: 2560px) {{
-            /* Lightning alert section - make fonts much bigger for TV readability */
-            .lightning-alert {{
-                margin: 30px 0;
-                border-radius: 20px;
-                padding: 40px;
-                border-width: 4px;
-            }}
-            
-            .lightning-header {{
-                margin-bottom: 30px;
-                padding-bottom: 20px;
-            }}
-            
-            .lightning-icon-large {{
-                font-size: 8em; /* Much bigger lightning icon for TV */
-            }}
-            
-            .lightning-title h3 {{
-                font-size: 4.0em; /* Much bigger title for TV readability */
-                margin-bottom: 12px;
-            }}
-            
-            .lightning-title .coverage {{
-                font-size: 2.4em; /* Much bigger coverage text for TV */
-                margin: 12px 0 0 0;
-            }}
-            
-            .safety-timer {{
-                padding: 35px;
-                border-radius: 20px;
-                min-width: 200px;
-            }}
-            
-            .timer-display {{
-                font-size: 5.5em; /* Huge timer display for TV visibility */
-                font-weight: bold;
-                margin: 0;
-            }}
-            
-            .timer-label {{
-                font-size: 2.2em; /* Much bigger timer label for TV */
-                margin: 12px 0 0 0;
-                font-weight: bold;
-            }}
-            
-            .lightning-stats {{
-                margin: 40px 0;
-                padding: 35px;
-                border-radius: 20px;
-            }}
-            
-            .stat-number {{
-                font-size: 4.5em; /* Huge stat numbers for TV visibility */
-                font-weight: bold;
-            }}
-            
-            .stat-label {{
-                font-size: 2.2em; /* Much bigger stat labels for TV */
-                margin-top: 12px;
-            }}
-            
-            .lightning-message {{
-                margin: 35px 0;
-                padding: 25px;
-                border-radius: 15px;
-                font-size: 2.0em; /* Much bigger message text for TV */
-            }}
-            
-            .lightning-map h4 {{
-                font-size: 3.2em; /* Much bigger map heading for TV */
-                margin: 0 0 25px 0;
-                padding-bottom: 15px;
-            }}
-            
-            .strike-list {{
-                max-height: 400px;
-                border-radius: 15px;
-                padding: 25px;
-            }}
-            
-            .strike-item {{
-                padding: 20px 25px;
-                margin: 15px 0;
-                border-radius: 12px;
-                border-left-width: 6px;
-            }}
-            
-            .strike-icon {{
-                font-size: 2.4em; /* Much bigger strike icons for TV */
-                margin-right: 20px;
-            }}
-            
-            .strike-info {{
-                font-size: 2.2em; /* Much bigger strike info text for TV */
-            }}
-            
-            .strike-intensity {{
-                font-size: 1.8em; /* Much bigger intensity text for TV */
-                padding: 8px 15px;
-                border-radius: 10px;
-            }}
-            
-            .no-strikes {{
-                padding: 50px;
-                font-size: 2.4em; /* Much bigger no-strikes message for TV */
-                border-radius: 15px;
-            }}
-            
-            .lightning-footer small {{
-                font-size: 1.8em; /* Much bigger footer text for TV */
-            }}
-            
-            /* Enhanced 4K Weather Dashboard - Full Height Utilization */
-            .header h1 {{
-                font-size: 3.8em; /* Bigger weather title for 4K */
-            }}
-            
-            .current-temp {{
-                font-size: 6.2em; /* Larger temperature for 4K visibility */
-            }}
-            
-            .current-desc {{
-                font-size: 2.8em; /* Better weather description */
-            }}
-            
-            .current-location {{
-                font-size: 2.2em; /* Good location text */
-            }}
-            
-            .feels-like {{
-                font-size: 3.4em; /* Bigger feels-like for 4K */
-            }}
-            
-            .conditions {{
-                font-size: 2.2em; /* Good conditions text */
-            }}
-            
-            .detail-card h3 {{
-                font-size: 2.4em; /* Bigger detail headings */
-            }}
-            
-            .detail-card .value {{
-                font-size: 3.2em; /* Bigger detail values for 4K */
-            }}
-            
-            .forecast-day {{
-                font-size: 2.4em; /* Bigger forecast labels */
-            }}
-            
-            .forecast-icon {{
-                font-size: 2.8em; /* Bigger forecast icons */
-                padding: 15px;
-                border-radius: 10px;
-            }}
-            
-            .forecast-temp {{
-                font-size: 2.6em; /* Bigger forecast temperatures */
-            }}
-            
-            .forecast-desc {{
-                font-size: 2.0em; /* Bigger forecast descriptions */
-            }}
-            
-            .news-header h2 {{
-                font-size: 3.8em; /* Bigger news header for 4K */
-            }}
-            
-            .news-subtitle {{
-                font-size: 2.2em; /* Bigger news subtitle */
-            }}
-            
-            .news-content h4 {{
-                font-size: 2.8em; /* Bigger news headlines */
-            }}
-            
-            .news-content p {{
-                font-size: 2.2em; /* Bigger news content */
-            }}
-            
-            .news-icon {{
-                font-size: 2.8em; /* Bigger news icons */
-                margin-right: 25px;
-            }}
-            
-            .news-ticker {{
-                font-size: 2.2em; /* Bigger ticker text for 4K */
-                height: 120px;
-                padding: 20px;
-            }}
-            
-            .embed-placeholder h3 {{
-                font-size: 3.8em; /* Bigger embed text */
-            }}
-            
-            .embed-placeholder p {{
-                font-size: 3.0em; /* Bigger embed description */
-            }}
-            
-            /* Lightning area fonts stay large for TV visibility */
-            /* The lightning fonts above are perfect for TV readability */
-        }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>🌤️ Temple Weather & News</h1>
-    </div>
+    # Rotating ticker and live news lines (rendered into the page's script as JSON)
+    news_tickers = [
+        f"🚨 WEATHER: Temple TX - Current {weather['temperature']}°F, {weather['description']} conditions expected to continue",
+        "📰 BREAKING: Bell County approves $2.5M infrastructure package for downtown Temple revitalization project",
+        "⚠️ TRAFFIC: I-35 Phase 3 construction begins Monday - expect delays 7-9 AM and 4-6 PM, use Loop 363 alternate",
+        "🏢 BUSINESS: Major manufacturing facility breaks ground in Temple - 150 new jobs with $40,000+ average salary",
+        "� EDUCATION: Temple ISD achieves 95% summer program participation - fall enrollment opens August 10th",
+        "🏥 HEALTH: Bell County health officials stress summer safety - hydration and heat precautions essential",
+        f"🌡️ CONDITIONS: Temple area {weather['description']} with humidity at {weather['humidity']}% - UV index moderate",
+        "🚧 DEVELOPMENT: Fiber optic Phase 1 complete - gigabit internet now available in downtown Temple core",
+        "📅 EVENTS: Temple Farmers Market every Saturday, Summer Concert Series Aug 15, Back-to-School Drive Aug 20",
+        "💼 ECONOMY: Local business growth up 15% - tech sector expansion bringing high-paying jobs to region"
+    ]
+    live_news = [
+        "Temple Economic Development announces major manufacturing expansion bringing 150+ high-paying jobs to local sector",
+        "Bell County commissioners approve $2.5 million downtown revitalization - new businesses and infrastructure improvements planned",
+        "Temple ISD reports record summer program success with 95% participation rate - preparing for strong fall semester start",
+        "I-35 construction Phase 3 begins next week - commuters advised to use Loop 363 during peak hours for faster travel",
+        "Temple Farmers Market celebrates successful season - local vendors report increased community support and sales growth",
+        f"Bell County health officials remind residents about heat safety - current temperature {weather['temperature']}°F requires precautions",
+        "Fiber optic expansion Phase 1 completed - downtown Temple now enjoys high-speed gigabit internet access for businesses",
+        "Temple Chamber of Commerce reports 15% business growth this quarter - technology companies leading the expansion",
+        "Community Calendar Update: Summer Concert Series August 15th, Back-to-School Drive August 20th - volunteers needed",
+        f"Weather Advisory: {weather['description']} conditions with {weather['humidity']}% humidity - outdoor activities should plan accordingly"
+    ]
     
-    <div class="main-container">
-        <div class="weather-section">
-            <div class="weather-animation" id="weatherAnimation"></div>
-            <div class="current-weather">
-                <div class="current-left">
-                    <div class="weather-icon" style="font-size: 2.5em; font-weight: bold; color: #3498db; background: rgba(52, 152, 219, 0.2); padding: 20px; border-radius: 10px; min-width: 140px; text-align: center;">{get_weather_emoji(weather.get('icon', '02d'))}</div>
-                    <div class="current-info">
-                        <div class="current-temp">{weather['temperature']}°F</div>
-                        <div class="current-desc">{weather['description']}</div>
-                        <div class="current-location">Temple, Texas</div>
-                    </div>
-                </div>
-                <div class="current-right">
-                    <div class="feels-like">Feels {weather['feels_like']}°F</div>
-                    <div class="conditions">Real Feel</div>
-                </div>
-            </div>
-            
-            <div class="weather-details">
-                <div class="detail-card">
-                    <h3>Humidity</h3>
-                    <div class="value">{weather['humidity']}%</div>
-                </div>
-                <div class="detail-card">
-                    <h3>Wind</h3>
-                    <div class="value">{weather['wind_speed']} mph</div>
-                </div>
-                <div class="detail-card">
-                    <h3>UV Index</h3>
-                    <div class="value">{weather['uv_index']}</div>
-                </div>
-                <div class="detail-card">
-                    <h3>Pressure</h3>
-                    <div class="value">{weather.get('pressure', 1013)} mb</div>
-                </div>
-            </div>
-            
-            <div class="forecast-grid">
-                {forecast_html}
-            </div>
-            
-            {lightning_html}
-            
-            <div class="live-embed">
-                <!-- Current Weather Summary -->
-                <div style="background: rgba(52, 152, 219, 0.15); border-radius: 12px; padding: 20px; text-align: center;">
-                    <div style="display: flex; align-items: center; justify-content: center; margin-bottom: 12px;">
-                        <div style="font-size: 2.4em; margin-right: 12px; font-weight: bold; color: #3498db; background: rgba(52, 152, 219, 0.2); padding: 12px; border-radius: 8px; min-width: 80px; text-align: center;">{get_weather_emoji(weather.get('icon', '02d'))}</div>
-                        <div>
-                            <h3 style="color: #3498db; margin: 0; font-size: 1.8em;">Current Conditions</h3>
-                            <p style="color: #74b9ff; margin: 5px 0; font-size: 1.4em;">Temple, Texas</p>
-                        </div>
-                    </div>
-                    <div style="display: flex; justify-content: space-around; text-align: center;">
-                        <div>
-                            <strong style="color: #3498db; font-size: 1.6em;">{weather['temperature']}°F</strong>
-                            <br><span style="color: #74b9ff; font-size: 1.2em;">Temperature</span>
-                        </div>
-                        <div>
-                            <strong style="color: #3498db; font-size: 1.6em;">{weather['feels_like']}°F</strong>
-                            <br><span style="color: #74b9ff; font-size: 1.2em;">Feels Like</span>
-                        </div>
-                        <div>
-                            <strong style="color: #3498db; font-size: 1.6em;">{weather['humidity']}%</strong>
-                            <br><span style="color: #74b9ff; font-size: 1.2em;">Humidity</span>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </div>
-        
-        <div class="news-section">
-            <div class="news-header">
-                <h2>📺 Local News</h2>
-                <div class="news-subtitle">Temple & Bell County Updates</div>
-            </div>
-            
-            {news_html}
-            
-            <div class="news-ticker" id="newsTicker">
-                <div class="ticker-content" id="tickerContent">
-                    🚨 WEATHER: Temple TX - Partly cloudy skies with mild temperatures this week
-                </div>
-            </div>
-            
-            <div class="live-embed" style="margin-top: 12px;">
-                <div style="background: rgba(231, 76, 60, 0.15); border-radius: 12px; padding: 20px;">
-                    <div style="display: flex; align-items: center; margin-bottom: 12px;">
-                        <div style="font-size: 2.4em; margin-right: 12px; color: #e74c3c;">�</div>
-                        <div>
-                            <h3 style="color: #e74c3c; margin: 0; font-size: 3.5em;">Breaking News</h3>
-                            <p style="color: #f39c12; margin: 5px 0; font-size: 2.8em;">Temple & Bell County Live</p>
-                        </div>
-                    </div>
-                    <div style="background: rgba(231, 76, 60, 0.2); padding: 20px; border-radius: 8px;">
-                        <div id="liveNewsUpdate" style="color: #e74c3c; margin: 0; font-size: 3.2em; line-height: 1.4; min-height: 120px; display: flex; align-items: center;">
-                            <div id="rotatingNewsContent">
-                                Temple Economic Development announces major expansion bringing 150+ jobs to local manufacturing sector
-                            </div>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </div>
-    </div>
+    return {
+        'updated': published_label('weather', '%Y-%m-%d %H:%M:%S'),
+        'current': dict(weather, emoji=get_weather_emoji(weather.get('icon', '02d')),
+                        pressure=weather.get('pressure', 1013)),
+        'forecast': [dict(day, emoji=get_weather_emoji(day.get('icon', '02d'))) for day in forecast],
+        'lightning': lightning_view_model(lightning, now) if lightning else None,
+        'news': news_stories[:3],  # Show 3 stories
+        'news_tickers': news_tickers,
+        'live_news': live_news
+    }
+
+def weather_snapshot(model, version):
+    """The parts of the weather page that change with the data, for patching it in place"""
+    current = model['current']
+    return {
+        'version': version,
+        'current': {key: current.get(key) for key in (
+            'emoji', 'temperature', 'feels_like', 'description', 'humidity', 'wind_speed', 'uv_index', 'pressure')},
+        'forecast': [{key: day.get(key) for key in ('date', 'emoji', 'high', 'low', 'description')}
+                     for day in model['forecast']],
+        'lightning': model['lightning'],
+        'news': model['news'],
+        'news_tickers': model['news_tickers'],
+        'live_news': model['live_news']
+    }
+
+@app.route('/weather')
+@versioned('weather', 'lightning', clock=weather_clock_key, cache_seconds=60)
+def weather_dashboard():
+    if not signage.weather_data:
+        signage.update_weather_data()
     
+    return stream_template('weather.html', version=weather_version(), **weather_view_model(
+        signage.weather_data, signage.forecast_data, signage.lightning_data, datetime.now()))
+
+@app.route('/api/weather/snapshot')
+@versioned('weather', 'lightning', clock=weather_clock_key)
+def api_weather_snapshot():
+    """Weather page data as JSON - the page polls this instead of reloading itself"""
+    if not signage.weather_data:
+        signage.update_weather_data()
     
-    <script>
-        // Create animated weather particles
-        function createWeatherParticles() {{
-            const animation = document.getElementById('weatherAnimation');
-            const particleCount = 20;
-            
-            for (let i = 0; i < particleCount; i++) {{
-                const particle = document.createElement('div');
-                particle.className = 'weather-particle';
-                particle.style.left = Math.random() * 100 + '%';
-                particle.style.animationDelay = Math.random() * 8 + 's';
-                particle.style.animationDuration = (Math.random() * 4 + 6) + 's';
-                animation.appendChild(particle);
-            }}
-        }}
-        
-        // Auto-refresh weather data every 10 minutes
-        setTimeout(() => {{
-            location.reload();
-        }}, 600000);
-        
-        // Rotate news stories automatically
-        const newsItems = document.querySelectorAll('.news-item');
-        let currentNews = 0;
-        
-        function rotateNews() {{
-            newsItems.forEach((item, index) => {{
-                item.style.opacity = index === currentNews ? '1' : '0.5';
-                item.style.transform = index === currentNews ? 'scale(1.02)' : 'scale(1)';
-            }});
-            currentNews = (currentNews + 1) % newsItems.length;
-        }}
-        
-        // Rotate news ticker content with enhanced stories
-        const newsTickers = [
-            '🚨 WEATHER: Temple TX - Current {weather['temperature']}°F, {weather['description']} conditions expected to continue',
-            '📰 BREAKING: Bell County approves $2.5M infrastructure package for downtown Temple revitalization project',
-            '⚠️ TRAFFIC: I-35 Phase 3 construction begins Monday - expect delays 7-9 AM and 4-6 PM, use Loop 363 alternate',
-            '🏢 BUSINESS: Major manufacturing facility breaks ground in Temple - 150 new jobs with $40,000+ average salary',
-            '� EDUCATION: Temple ISD achieves 95% summer program participation - fall enrollment opens August 10th',
-            '🏥 HEALTH: Bell County health officials stress summer safety - hydration and heat precautions essential',
-            '🌡️ CONDITIONS: Temple area {weather['description']} with humidity at {weather['humidity']}% - UV index moderate',
-            '🚧 DEVELOPMENT: Fiber optic Phase 1 complete - gigabit internet now available in downtown Temple core',
-            '📅 EVENTS: Temple Farmers Market every Saturday, Summer Concert Series Aug 15, Back-to-School Drive Aug 20',
-            '💼 ECONOMY: Local business growth up 15% - tech sector expansion bringing high-paying jobs to region'
-        ];
-        
-        const liveNewsUpdates = [
-            'Temple Economic Development announces major manufacturing expansion bringing 150+ high-paying jobs to local sector',
-            'Bell County commissioners approve $2.5 million downtown revitalization - new businesses and infrastructure improvements planned',
-            'Temple ISD reports record summer program success with 95% participation rate - preparing for strong fall semester start',
-            'I-35 construction Phase 3 begins next week - commuters advised to use Loop 363 during peak hours for faster travel',
-            'Temple Farmers Market celebrates successful season - local vendors report increased community support and sales growth',
-            'Bell County health officials remind residents about heat safety - current temperature {weather['temperature']}°F requires precautions',
-            'Fiber optic expansion Phase 1 completed - downtown Temple now enjoys high-speed gigabit internet access for businesses',
-            'Temple Chamber of Commerce reports 15% business growth this quarter - technology companies leading the expansion',
-            'Community Calendar Update: Summer Concert Series August 15th, Back-to-School Drive August 20th - volunteers needed',
-            'Weather Advisory: {weather['description']} conditions with {weather['humidity']}% humidity - outdoor activities should plan accordingly'
-        ];
-        
-        let tickerIndex = 0;
-        let liveNewsIndex = 0;
-        const ticker = document.getElementById('newsTicker');
-        const rotatingNews = document.getElementById('rotatingNewsContent');
-        
-        function updateTicker() {{
-            const tickerContent = document.getElementById('tickerContent');
-            if (tickerContent) {{
-                tickerContent.textContent = newsTickers[tickerIndex];
-                tickerIndex = (tickerIndex + 1) % newsTickers.length;
-            }}
-        }}
-        
-        function updateRotatingNews() {{
-            if (rotatingNews) {{
-                // Fade out
-                rotatingNews.style.opacity = '0';
-                rotatingNews.style.transform = 'translateX(20px)';
-                
-                setTimeout(() => {{
-                    rotatingNews.textContent = liveNewsUpdates[liveNewsIndex];
-                    liveNewsIndex = (liveNewsIndex + 1) % liveNewsUpdates.length;
-                    
-                    // Fade in
-                    rotatingNews.style.opacity = '1';
-                    rotatingNews.style.transform = 'translateX(0)';
-                }}, 300);
-            }}
-        }}
-        
-        // Add smooth transition styles to rotating news
-        if (rotatingNews) {{
-            rotatingNews.style.transition = 'opacity 0.3s ease, transform 0.3s ease';
-        }}
-        
-        // Initialize
-        createWeatherParticles();
-        rotateNews();
-        
-        // Set intervals for news rotation - optimized timing for readability
-        setInterval(rotateNews, 4000);                    // Rotate top news items every 4 seconds
-        setInterval(updateTicker, 18000);                 // Change ticker every 18 seconds (longer for readability)
-        setInterval(updateRotatingNews, 7000);            // Change bottom news every 7 seconds
-    </script>
-</body>
-</html>'''
+    model = weather_view_model(signage.weather_data, signage.forecast_data, signage.lightning_data, datetime.now())
+    return jsonify(weather_snapshot(model, weather_version()))
 
 @app.route("/api/calendar/update")
 def api_calendar_update():
@@ -3576,18 +1812,15 @@ def api_calendar_debug():
         signage.update_calendar_data()
     
     events = signage.calendar_events if signage.calendar_events else []
-    debug_info = []
-    for event in events:
-        debug_info.append({
-            "title": event.get("title"),
-            "date": event.get("date"), 
-            "start_datetime": event.get("start_datetime"),
-            "calendar_name": event.get("calendar_name"),
-            "calendar_bg_color": event.get("calendar_bg_color"),
-            "calendar_fg_color": event.get("calendar_fg_color")
-        })
+    if signage.calendar:
+        # One clock reading for every event's Today/Tomorrow label
+        day_labels = signage.calendar.formatter.day_labels(events)
+    else:
+        day_labels = [None] * len(events)
+    debug_info = [event.to_dict(label) for event, label in zip(events, day_labels)]
     
-    return jsonify({"events": debug_info, "count": len(events)})
+    refresh_stats = signage.calendar.last_refresh_stats if signage.calendar else None
+    return jsonify({"events": debug_info, "count": len(events), "refresh_stats": refresh_stats})
 
 @app.route("/api/calendar/list")
 def api_calendar_list():
@@ -3596,8 +1829,7 @@ def api_calendar_list():
         return jsonify({"error": "Calendar service not available"})
     
     try:
-        calendars_result = signage.calendar.service.calendarList().list().execute()
-        calendars = calendars_result.get("items", [])
+        calendars = signage.calendar.list_calendars()
         
         calendar_info = []
         for cal in calendars:
@@ -3614,6 +1846,43 @@ def api_calendar_list():
     except Exception as e:
         return jsonify({"error": f"Failed to list calendars: {str(e)}"})
 
+@app.route("/api/calendar/status")
+def api_calendar_status():
+    """Calendar subsystem startup timings, token state and last refresh statistics"""
+    credential_manager = signage.calendar.credential_manager if signage.calendar else None
+    return jsonify({
+        "authenticated": bool(signage.calendar and signage.calendar.service),
+        "credentials": credential_manager.get_status() if credential_manager else None,
+        "startup": signage.calendar_startup,
+        "client_startup": signage.calendar.startup_timings if signage.calendar else None,
+        "last_refresh": signage.calendar.last_refresh_stats if signage.calendar else None,
+        "fetch_windows": signage.calendar_planner.get_status(),
+        "ics_feeds": signage.ics_calendar.get_status() if signage.ics_calendar else None
+    })
+
+@app.route("/api/calendar/notify", methods=["POST"])
+def api_calendar_notify():
+    """Webhook for Google Calendar push notifications"""
+    if not signage.calendar_watch:
+        return jsonify({"error": "Calendar push notifications not enabled"}), 404
+    
+    status_code, message = signage.calendar_watch.handle_notification(request.headers)
+    return jsonify({"status": message}), status_code
+
+@app.route("/api/calendar/channels", methods=["GET", "POST"])
+def api_calendar_channels():
+    """List active push-notification channels (POST opens a local test channel)"""
+    if not signage.calendar_watch:
+        return jsonify({"error": "Calendar push notifications not enabled", "channels": []})
+    
+    if request.method == "POST":
+        if not signage.calendar_watch.is_local:
+            return jsonify({"error": "Channels can only be opened manually in local mode"}), 400
+        calendar_id = (request.get_json(silent=True) or {}).get("calendar_id", "primary")
+        signage.calendar_watch.open_channel(calendar_id)
+    
+    return jsonify(signage.calendar_watch.get_status())
+
 @app.route("/api/lightning/check")
 def api_lightning_check():
     """Check current lightning activity"""
@@ -3631,10 +1900,14 @@ def api_lightning_status():
     else:
         return jsonify({"status": "no_data", "message": "Lightning data not available"})
 
+# The data was loaded before the dashboard routes registered their pages - render them now
+signage.page_cache.refresh()
+
 if __name__ == "__main__":
     print("🚀 Temple Office Digital Signage Starting...")
     print("📅 Calendar available at: http://localhost:8080/sharepoint")
     print("🌤️ Weather available at: http://localhost:8080/weather") 
     print("📊 CFSS Dashboard at: http://localhost:8080/cfss")
-    app.run(host="0.0.0.0", port=8080, debug=False)
+    # Renders share no global calendar state, so requests can be served in parallel
+    app.run(host="0.0.0.0", port=8080, debug=False, threaded=True)
 
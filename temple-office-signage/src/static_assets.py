@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+
+# Fingerprinted static files
+# Pages link to /assets/<name>.<hash>.<ext>. The hash comes from the file's
+# contents, so a URL always means the same bytes and the browser can keep the
+# file (and Chromium its parsed stylesheet / compiled script) indefinitely.
+# Editing a file changes its URL, and the next page render links the new one.
+
+import hashlib
+import os
+import threading
+
+from werkzeug.security import safe_join
+
+
+class StaticAssets:
+    """Content-hashed URLs for the files in a static folder"""
+
+    def __init__(self, folder, url_prefix='/assets'):
+        self.folder = folder
+        self.url_prefix = url_prefix
+        self._digests = {}  # filename -> (mtime_ns, digest)
+        self._lock = threading.Lock()
+
+    def _digest(self, filename):
+        path = safe_join(self.folder, filename)
+        if path is None:
+            raise FileNotFoundError(filename)
+        mtime = os.stat(path).st_mtime_ns
+        with self._lock:
+            cached = self._digests.get(filename)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        with open(path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()[:12]
+        with self._lock:
+            self._digests[filename] = (mtime, digest)
+        return digest
+
+    def url(self, filename):
+        """URL of the file's current contents, e.g. /assets/css/weather.1a2b3c4d5e6f.css"""
+        root, ext = os.path.splitext(filename)
+        return f"{self.url_prefix}/{root}.{self._digest(filename)}{ext}"
+
+    def resolve(self, hashed_name):
+        """The file behind a fingerprinted name, or None if the name isn't current"""
+        root, ext = os.path.splitext(hashed_name)
+        root, _, digest = root.rpartition('.')
+        if not root or not digest:
+            return None
+        filename = root + ext
+        try:
+            return filename if self._digest(filename) == digest else None
+        except OSError:
+            return None
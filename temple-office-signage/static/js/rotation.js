@@ -0,0 +1,153 @@
+// Double-buffered dashboard rotation
+// The next dashboard loads in a hidden iframe a few seconds before its turn,
+// then fades in over the current one with a single opacity transition. The
+// old layer is blanked and removed once it's covered, so at most two pages
+// are alive. Each dashboard runs in its own frame, so its scripts work.
+//
+// The order, durations and enabled flags come from the server's rotation
+// manifest. A 'config' event re-reads it and the rotation adjusts in place.
+// Each slot start is reported back so the server can time its data refreshes.
+const PREFETCH_MS = 8000;
+const LOAD_TIMEOUT_MS = 15000;
+const FADE_MS = 1000;
+
+const container = document.getElementById('dashboard-container');
+const status = document.getElementById('status');
+let manifestVersion = rotationManifest.version;
+let dashboards = enabledDashboards(rotationManifest);
+let currentLayer = null;
+let nextLayer = null;
+let onScreen = null;     // Dashboard whose slot is running
+let slotStarted = 0;
+let switchCount = 0;
+let prefetchTimer = null;
+let switchTimer = null;
+
+function enabledDashboards(manifest) {
+    return manifest.dashboards.filter(dashboard => dashboard.enabled);
+}
+
+function sameDashboard(a, b) {
+    return a && b && a.id === b.id && a.path === b.path;
+}
+
+function nextAfter(dashboard) {
+    // A dashboard that left the rotation is followed by the first one (-1 + 1)
+    const position = dashboards.findIndex(candidate => dashboard && candidate.id === dashboard.id);
+    return dashboards[(position + 1) % dashboards.length];
+}
+
+function createLayer(dashboard) {
+    const frame = document.createElement('iframe');
+    frame.className = 'dashboard-layer';
+    frame.setAttribute('scrolling', 'no');
+    const ready = new Promise(resolve => {
+        frame.addEventListener('load', resolve, { once: true });
+        // A slow page is shown as-is rather than stalling the rotation
+        setTimeout(resolve, LOAD_TIMEOUT_MS);
+    });
+    frame.src = dashboard.path;
+    container.appendChild(frame);
+    return { dashboard: dashboard, frame: frame, ready: ready };
+}
+
+function destroyLayer(layer) {
+    // Unload the page first so its timers, event stream and memory go right away
+    layer.frame.src = 'about:blank';
+    layer.frame.remove();
+}
+
+function prefetch(dashboard) {
+    if (nextLayer && !sameDashboard(nextLayer.dashboard, dashboard)) {
+        destroyLayer(nextLayer);
+        nextLayer = null;
+    }
+    if (!nextLayer) {
+        nextLayer = createLayer(dashboard);
+    }
+}
+
+function showStatus(name) {
+    status.textContent = name;
+    status.style.display = 'block';
+    setTimeout(() => {
+        status.style.display = 'none';
+    }, 3000);
+}
+
+function planNext(dashboard, remaining) {
+    clearTimeout(prefetchTimer);
+    clearTimeout(switchTimer);
+    prefetchTimer = setTimeout(() => prefetch(nextAfter(dashboard)), Math.max(0, remaining - PREFETCH_MS));
+    switchTimer = setTimeout(() => switchTo(nextAfter(dashboard)), remaining);
+}
+
+function switchTo(dashboard) {
+    prefetch(dashboard);
+    const incoming = nextLayer;
+    const token = ++switchCount;
+    nextLayer = null;
+
+    incoming.ready.then(() => {
+        if (token !== switchCount) {
+            destroyLayer(incoming);  // Superseded by a later switch while loading
+            return;
+        }
+        const outgoing = currentLayer;
+        if (outgoing) {
+            outgoing.frame.classList.remove('active');
+            outgoing.frame.classList.add('leaving');
+            setTimeout(() => destroyLayer(outgoing), FADE_MS + 100);
+        }
+        incoming.frame.classList.add('active');
+        currentLayer = incoming;
+        showStatus(dashboard.name);
+    });
+
+    onScreen = dashboard;
+    slotStarted = Date.now();
+    planNext(dashboard, dashboard.duration * 1000);
+    reportShowing(dashboard);
+}
+
+function reportShowing(dashboard) {
+    // Lets the server refresh each dashboard's data just before its next slot
+    fetch('/api/rotation/showing', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ id: dashboard.id })
+    }).catch(error => console.error('Rotation report failed:', error));
+}
+
+function applyManifest(manifest) {
+    if (manifest.version === manifestVersion) {
+        return;
+    }
+    manifestVersion = manifest.version;
+    dashboards = enabledDashboards(manifest);
+    console.log('Rotation updated:', dashboards.map(dashboard => dashboard.id).join(', '));
+
+    const current = dashboards.find(dashboard => sameDashboard(dashboard, onScreen));
+    if (!current) {
+        switchTo(nextAfter(onScreen));  // The current view was disabled or moved - go on now
+        return;
+    }
+    // Keep the current view; finish its slot with the new duration, then follow the new order
+    onScreen = current;
+    planNext(current, current.duration * 1000 - (Date.now() - slotStarted));
+}
+
+function refreshManifest() {
+    fetch('/api/rotation', { cache: 'no-store' })
+        .then(response => response.json())
+        .then(applyManifest)
+        .catch(error => console.error('Rotation manifest refresh failed:', error));
+}
+
+SignageEvents.on('config', refreshManifest);
+
+// Start immediately
+switchTo(dashboards[0]);
+
+// Debug: Show rotation in console
+console.log('Dashboard rotation started');
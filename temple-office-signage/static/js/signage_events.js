@@ -0,0 +1,65 @@
+// Live change messages from /events (Server-Sent Events)
+// SignageEvents.on('weather', handler) runs the handler on every weather
+// change. A 'reset' message (we missed messages, or the server restarted)
+// runs every handler once. EventSource reconnects by itself and resumes
+// from the last message id it saw.
+// (A window property, not a const, so frames can find it on window.parent.)
+window.SignageEvents = (() => {
+    // Dashboards inside the rotation page share its connection, and drop
+    // their handlers when their frame is torn down
+    try {
+        const shared = window.parent !== window && window.parent.SignageEvents;
+        if (shared) {
+            const mine = [];
+            window.addEventListener('pagehide', () => {
+                mine.forEach(([type, handler]) => shared.off(type, handler));
+            });
+            return {
+                get connected() { return shared.connected; },
+                on: (type, handler) => {
+                    mine.push([type, handler]);
+                    shared.on(type, handler);
+                },
+                off: (type, handler) => shared.off(type, handler)
+            };
+        }
+    } catch (error) {
+        // Parent from another origin - open our own stream
+    }
+
+    const handlers = {};
+    const source = new EventSource('/events');
+    const api = { connected: false };
+
+    function dispatch(type, data) {
+        (handlers[type] || []).slice().forEach(handler => handler(data, type));
+    }
+
+    source.onopen = () => { api.connected = true; };
+    source.onerror = () => { api.connected = false; };
+    source.addEventListener('reset', () => {
+        const called = new Set();
+        Object.keys(handlers).forEach(type => handlers[type].slice().forEach(handler => {
+            if (!called.has(handler)) {
+                called.add(handler);
+                handler({}, 'reset');
+            }
+        }));
+    });
+
+    api.on = (type, handler) => {
+        if (!handlers[type]) {
+            handlers[type] = [];
+            source.addEventListener(type, event => dispatch(type, JSON.parse(event.data)));
+        }
+        handlers[type].push(handler);
+    };
+    api.off = (type, handler) => {
+        const list = handlers[type] || [];
+        const position = list.indexOf(handler);
+        if (position !== -1) {
+            list.splice(position, 1);
+        }
+    };
+    return api;
+})();
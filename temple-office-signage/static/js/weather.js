@@ -0,0 +1,202 @@
+// Create animated weather particles
+function createWeatherParticles() {
+    const animation = document.getElementById('weatherAnimation');
+    const particleCount = 20;
+
+    for (let i = 0; i < particleCount; i++) {
+        const particle = document.createElement('div');
+        particle.className = 'weather-particle';
+        particle.style.left = Math.random() * 100 + '%';
+        particle.style.animationDelay = Math.random() * 8 + 's';
+        particle.style.animationDuration = (Math.random() * 4 + 6) + 's';
+        animation.appendChild(particle);
+    }
+}
+
+// Keep the page current from /api/weather/snapshot. Only nodes whose text
+// actually changed are written; an unchanged version costs an empty 304.
+// Data changes arrive over /events; the timer only catches clock-driven
+// changes (strike ages) and covers for a dropped event stream.
+const SNAPSHOT_URL = '/api/weather/snapshot';
+const SNAPSHOT_INTERVAL = 60000;
+const SNAPSHOT_INTERVAL_LIVE = 600000;
+let lastRefresh = Date.now();
+let snapshotEtag = null;
+let shownVersion = weatherVersion;
+let shownStrikes = null;
+
+function lookup(data, path) {
+    return path.split('.').reduce((value, key) => (value == null ? value : value[key]), data);
+}
+
+function setText(element, value) {
+    const text = value == null ? '' : String(value);
+    if (element.textContent !== text) {
+        element.textContent = text;
+    }
+}
+
+function patchList(name, items) {
+    const elements = document.querySelectorAll(`[data-list-item="${name}"]`);
+    if (elements.length !== items.length) {
+        return false;
+    }
+    elements.forEach((element, index) => {
+        element.querySelectorAll('[data-item-field]').forEach(field => {
+            setText(field, items[index][field.dataset.itemField]);
+        });
+    });
+    return true;
+}
+
+function renderStrikes(strikes) {
+    const map = document.getElementById('strikeMap');
+    const key = JSON.stringify(strikes);
+    if (!map || key === shownStrikes) {
+        return;
+    }
+    shownStrikes = key;
+    const old = map.querySelector('.strike-list, .no-strikes');
+    let replacement;
+    if (strikes.length) {
+        replacement = document.createElement('div');
+        replacement.className = 'strike-list';
+        strikes.forEach(strike => {
+            const item = document.createElement('div');
+            item.className = 'strike-item';
+            [['strike-icon', '⚡'],
+             ['strike-info', `${strike.distance_miles.toFixed(1)}mi ${strike.direction} - ${strike.minutes_ago}min ago`],
+             ['strike-intensity', strike.intensity]].forEach(([className, text]) => {
+                const span = document.createElement('span');
+                span.className = className;
+                span.textContent = text;
+                item.appendChild(span);
+            });
+            replacement.appendChild(item);
+        });
+    } else {
+        replacement = document.createElement('div');
+        replacement.className = 'no-strikes';
+        replacement.textContent = 'No lightning strikes detected in the last hour';
+    }
+    if (old) {
+        map.replaceChild(replacement, old);
+    } else {
+        map.appendChild(replacement);
+    }
+}
+
+function applySnapshot(snapshot) {
+    const panel = document.getElementById('lightningPanel');
+    // Layout changes (panel shown/hidden, different forecast length) need the full page
+    if (Boolean(panel) !== Boolean(snapshot.lightning) ||
+        !patchList('forecast', snapshot.forecast) || !patchList('news', snapshot.news)) {
+        location.reload();
+        return;
+    }
+    document.querySelectorAll('[data-field]').forEach(element => {
+        setText(element, lookup(snapshot, element.dataset.field));
+    });
+    document.querySelectorAll('[data-color-field]').forEach(element => {
+        // style.color reads back as rgb(...), so remember the value we set
+        const color = lookup(snapshot, element.dataset.colorField);
+        if (element.dataset.color !== color) {
+            element.style.color = color;
+            element.dataset.color = color;
+        }
+    });
+    if (panel) {
+        if (panel.className !== snapshot.lightning.alert_class) {
+            panel.className = snapshot.lightning.alert_class;
+        }
+        renderStrikes(snapshot.lightning.strikes);
+    }
+    // The rotation timers read these arrays, so update them in place
+    newsTickers.splice(0, newsTickers.length, ...snapshot.news_tickers);
+    liveNewsUpdates.splice(0, liveNewsUpdates.length, ...snapshot.live_news);
+    shownVersion = snapshot.version;
+}
+
+function refreshSnapshot() {
+    lastRefresh = Date.now();
+    const headers = snapshotEtag ? { 'If-None-Match': snapshotEtag } : {};
+    fetch(SNAPSHOT_URL, { headers: headers, cache: 'no-store' })
+        .then(response => {
+            if (response.status === 304 || !response.ok) {
+                return null;
+            }
+            snapshotEtag = response.headers.get('ETag');
+            return response.json();
+        })
+        .then(snapshot => {
+            if (snapshot && snapshot.version !== shownVersion) {
+                applySnapshot(snapshot);
+            }
+        })
+        .catch(error => console.error('Weather refresh failed:', error));
+}
+
+SignageEvents.on('weather', refreshSnapshot);
+SignageEvents.on('lightning', refreshSnapshot);
+setInterval(() => {
+    const interval = SignageEvents.connected ? SNAPSHOT_INTERVAL_LIVE : SNAPSHOT_INTERVAL;
+    if (Date.now() - lastRefresh >= interval - 1000) {
+        refreshSnapshot();
+    }
+}, SNAPSHOT_INTERVAL);
+
+// Rotate news stories automatically
+const newsItems = document.querySelectorAll('.news-item');
+let currentNews = 0;
+
+function rotateNews() {
+    newsItems.forEach((item, index) => {
+        item.style.opacity = index === currentNews ? '1' : '0.5';
+        item.style.transform = index === currentNews ? 'scale(1.02)' : 'scale(1)';
+    });
+    currentNews = (currentNews + 1) % newsItems.length;
+}
+
+let tickerIndex = 0;
+let liveNewsIndex = 0;
+const ticker = document.getElementById('newsTicker');
+const rotatingNews = document.getElementById('rotatingNewsContent');
+
+function updateTicker() {
+    const tickerContent = document.getElementById('tickerContent');
+    if (tickerContent) {
+        tickerContent.textContent = newsTickers[tickerIndex];
+        tickerIndex = (tickerIndex + 1) % newsTickers.length;
+    }
+}
+
+function updateRotatingNews() {
+    if (rotatingNews) {
+        // Fade out
+        rotatingNews.style.opacity = '0';
+        rotatingNews.style.transform = 'translateX(20px)';
+
+        setTimeout(() => {
+            rotatingNews.textContent = liveNewsUpdates[liveNewsIndex];
+            liveNewsIndex = (liveNewsIndex + 1) % liveNewsUpdates.length;
+
+            // Fade in
+            rotatingNews.style.opacity = '1';
+            rotatingNews.style.transform = 'translateX(0)';
+        }, 300);
+    }
+}
+
+// Add smooth transition styles to rotating news
+if (rotatingNews) {
+    rotatingNews.style.transition = 'opacity 0.3s ease, transform 0.3s ease';
+}
+
+// Initialize
+createWeatherParticles();
+rotateNews();
+
+// Set intervals for news rotation - optimized timing for readability
+setInterval(rotateNews, 4000);                    // Rotate top news items every 4 seconds
+setInterval(updateTicker, 18000);                 // Change ticker every 18 seconds (longer for readability)
+setInterval(updateRotatingNews, 7000);            // Change bottom news every 7 seconds